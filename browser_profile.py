@@ -0,0 +1,78 @@
+"""
+Chrome option profiles for the Selenium test suites.
+
+Profiles:
+    default   headless (unless VA_HEADLESS=0) at 1920x1080
+    lean      reduced-resource headless browser for shared or parallel
+              runners: fixed viewport, no GPU, extensions or background
+              networking, and cosmetic third-party hosts blocked
+
+Select a profile with VA_BROWSER_PROFILE or run_all_tests.py --profile.
+"""
+import os
+
+from selenium import webdriver
+
+PROFILES = ["default", "lean"]
+
+# Fonts, icon sets and stock images the pages pull in. None of them are
+# needed for the tests; script CDNs (jsdelivr, esm.sh) and Supabase stay reachable.
+BLOCKED_HOSTS = [
+    "cdnjs.cloudflare.com",
+    "fonts.googleapis.com",
+    "fonts.gstatic.com",
+    "images.unsplash.com",
+    "img.icons8.com",
+    "via.placeholder.com",
+    "randomuser.me",
+]
+
+LEAN_VIEWPORT = (1366, 900)
+
+LEAN_ARGUMENTS = [
+    "--headless=new",
+    "--disable-gpu",
+    "--disable-extensions",
+    "--disable-background-networking",
+    "--disable-component-update",
+    "--disable-default-apps",
+    "--disable-sync",
+    "--no-first-run",
+    "--mute-audio",
+]
+
+
+def get_profile_name():
+    """Return the profile selected through the environment"""
+    name = os.environ.get("VA_BROWSER_PROFILE", "default")
+    if name not in PROFILES:
+        raise ValueError(f"Unknown browser profile '{name}', expected one of: {', '.join(PROFILES)}")
+    return name
+
+
+def host_resolver_rules(hosts=None):
+    """Build a --host-resolver-rules value that makes the given hosts unreachable"""
+    hosts = BLOCKED_HOSTS if hosts is None else hosts
+    return ", ".join(f"MAP {host} ~NOTFOUND" for host in hosts)
+
+
+def build_chrome_options(profile=None):
+    """Return ChromeOptions for the given (or selected) profile"""
+    profile = profile or get_profile_name()
+
+    options = webdriver.ChromeOptions()
+    options.add_argument("--no-sandbox")
+    options.add_argument("--disable-dev-shm-usage")
+    options.add_experimental_option("excludeSwitches", ["enable-logging"])
+
+    if profile == "lean":
+        for argument in LEAN_ARGUMENTS:
+            options.add_argument(argument)
+        options.add_argument(f"--window-size={LEAN_VIEWPORT[0]},{LEAN_VIEWPORT[1]}")
+        options.add_argument(f"--host-resolver-rules={host_resolver_rules()}")
+    else:
+        if os.environ.get("VA_HEADLESS", "1") != "0":
+            options.add_argument("--headless=new")
+        options.add_argument("--window-size=1920,1080")
+
+    return options
@@ -0,0 +1,211 @@
+"""
+Incremental build cache for the site-generation scripts.
+
+A build step is identified by a name and described by its inputs (text,
+sizes, colors, fonts, hashes of source files) and the files it writes.
+When a step's inputs are unchanged and its outputs still hold the bytes
+it produced, the step is skipped. If an output was deleted or
+overwritten (for example by another script writing the same image), it
+is restored from the content-addressed store instead of being rebuilt.
+
+    cache = BuildCache(force=args.force)
+    cache.run("social:images/blog-preview.jpg",
+              {"text": text, "size": size, "source": cache.file_hash(__file__)},
+              ["images/blog-preview.jpg"],
+              create_social_image, text, "images/blog-preview.jpg")
+    cache.save()
+    cache.print_stats()
+
+Scripts that render bytes in memory can publish() them instead of
+writing the file: identical renders are stored once, every output name
+gets its own copy of the stored blob, and a file that already holds the
+bytes is not rewritten. Outputs are copies rather than hardlinks so that
+a script saving over an output in place cannot change the stored blob.
+Blobs are only ever replaced, never written in place, and are checked
+against their hash before being copied out again.
+
+Everything lives under .build-cache/ (or VA_BUILD_CACHE): objects/ holds
+output blobs by SHA-256 and steps.json the recorded steps.
+"""
+import os
+import json
+import shutil
+import hashlib
+import threading
+
+SITE_ROOT = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_CACHE_DIR = os.path.join(SITE_ROOT, ".build-cache")
+
+
+def add_cache_arguments(parser):
+    """Add the shared --force option to a parser"""
+    parser.add_argument("--force", action="store_true",
+                        help="rebuild every step even if its inputs are unchanged")
+
+
+def font_fingerprint(font):
+    """Identify a font for a step's inputs: its content hash if it is a local file, else its name"""
+    if os.path.isfile(font):
+        with open(font, "rb") as f:
+            return hashlib.sha256(f.read()).hexdigest()
+    return font
+
+
+class BuildCache:
+    """Content-addressed store of build step outputs, keyed by step inputs"""
+
+    def __init__(self, root=None, force=False):
+        self.root = root or os.environ.get("VA_BUILD_CACHE", DEFAULT_CACHE_DIR)
+        self.force = force
+        self.hits = 0
+        self.misses = 0
+        self.restored = 0
+        self.unchanged = 0
+        self._lock = threading.Lock()
+        self._steps_path = os.path.join(self.root, "steps.json")
+        try:
+            with open(self._steps_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            data = {}
+        self.steps = data.get("steps", {})
+        self.files = data.get("files", {})
+
+    def file_hash(self, path):
+        """SHA-256 of a file, reused while its mtime and size are unchanged; None if missing"""
+        full_path = os.path.abspath(path)
+        try:
+            stat = os.stat(full_path)
+        except OSError:
+            return None
+        known = self.files.get(full_path)
+        if known and known[0] == stat.st_mtime_ns and known[1] == stat.st_size:
+            return known[2]
+
+        digest = hashlib.sha256()
+        with open(full_path, "rb") as f:
+            for chunk in iter(lambda: f.read(65536), b""):
+                digest.update(chunk)
+        with self._lock:
+            self.files[full_path] = [stat.st_mtime_ns, stat.st_size, digest.hexdigest()]
+        return digest.hexdigest()
+
+    @staticmethod
+    def inputs_digest(inputs):
+        canonical = json.dumps(inputs, sort_keys=True, default=str)
+        return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+    def _object_path(self, digest):
+        return os.path.join(self.root, "objects", digest[:2], digest)
+
+    def _store(self, path, digest):
+        object_path = self._object_path(digest)
+        if self.file_hash(object_path) != digest:
+            os.makedirs(os.path.dirname(object_path), exist_ok=True)
+            tmp_path = f"{object_path}.{os.getpid()}.tmp"
+            shutil.copyfile(path, tmp_path)
+            os.replace(tmp_path, object_path)
+
+    def _write_object(self, digest, data):
+        object_path = self._object_path(digest)
+        if self.file_hash(object_path) != digest:
+            os.makedirs(os.path.dirname(object_path), exist_ok=True)
+            tmp_path = f"{object_path}.{os.getpid()}.tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, object_path)
+        return object_path
+
+    def _copy_out(self, object_path, path):
+        """Replace path atomically with a copy of a blob"""
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        tmp_path = os.path.join(directory, f".{os.path.basename(path)}.{os.getpid()}.tmp")
+        shutil.copyfile(object_path, tmp_path)
+        os.replace(tmp_path, path)
+
+    def _restore(self, path, digest):
+        object_path = self._object_path(digest)
+        if self.file_hash(object_path) != digest:
+            return False
+        self._copy_out(object_path, path)
+        return True
+
+    def publish(self, path, data):
+        """Write generated bytes to path through the store; return False if path already held them"""
+        digest = hashlib.sha256(data).hexdigest()
+        if self.file_hash(path) == digest:
+            with self._lock:
+                self.unchanged += 1
+            return False
+        self._copy_out(self._write_object(digest, data), path)
+        return True
+
+    def is_fresh(self, name, inputs, outputs):
+        """True if the step can be skipped, restoring changed outputs from the store"""
+        if self.force:
+            return False
+        step = self.steps.get(name)
+        if not step or step["inputs"] != self.inputs_digest(inputs):
+            return False
+        if sorted(step["outputs"]) != sorted(outputs):
+            return False
+
+        to_restore = [path for path in outputs if self.file_hash(path) != step["outputs"][path]]
+        for path in to_restore:
+            if not self._restore(path, step["outputs"][path]):
+                return False
+        with self._lock:
+            self.restored += len(to_restore)
+        return True
+
+    def record(self, name, inputs, outputs):
+        """Store a finished step's outputs and remember its inputs"""
+        hashes = {}
+        for path in outputs:
+            digest = self.file_hash(path)
+            if digest is None:
+                raise FileNotFoundError(f"Build step '{name}' did not write {path}")
+            self._store(path, digest)
+            hashes[path] = digest
+        with self._lock:
+            self.steps[name] = {"inputs": self.inputs_digest(inputs), "outputs": hashes}
+
+    def run(self, name, inputs, outputs, func, *args, **kwargs):
+        """Run func unless the step is fresh; return True if it ran.
+
+        inputs may be a callable returning the inputs, for steps whose
+        inputs are their own outputs (in-place edits): it is evaluated
+        before the check and again after func has run.
+        """
+        current = inputs() if callable(inputs) else inputs
+        if self.is_fresh(name, current, outputs):
+            self.count(hit=True)
+            return False
+
+        func(*args, **kwargs)
+        self.record(name, inputs() if callable(inputs) else inputs, outputs)
+        self.count(hit=False)
+        return True
+
+    def count(self, hit):
+        """Count a step as a hit or a miss, for scripts that call is_fresh() and record() themselves"""
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def save(self):
+        os.makedirs(self.root, exist_ok=True)
+        tmp_path = f"{self._steps_path}.{os.getpid()}.tmp"
+        with self._lock:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"steps": self.steps, "files": self.files}, f, indent=1, sort_keys=True)
+            os.replace(tmp_path, self._steps_path)
+
+    def print_stats(self):
+        total = self.hits + self.misses
+        restored = f", {self.restored} output(s) restored from cache" if self.restored else ""
+        unchanged = f", {self.unchanged} identical output(s) not rewritten" if self.unchanged else ""
+        print(f"Build cache: {self.hits} hit(s), {self.misses} miss(es) of {total} step(s){restored}{unchanged}")
@@ -4,6 +4,8 @@ import socket
 from urllib.parse import urlparse
 from dotenv import load_dotenv
 
+from supabase_http import SupabaseSession
+
 def check_network():
     # Load environment variables
     load_dotenv()
@@ -43,9 +45,14 @@ def check_network():
     # Test HTTP connection
     try:
         print(f"\nTesting HTTP connection to: {supabase_url}")
-        response = requests.get(supabase_url, timeout=10, allow_redirects=True)
+        with SupabaseSession(timeout=(5, 10)) as session:
+            response = session.get(supabase_url, allow_redirects=True)
         print(f"✅ HTTP Status Code: {response.status_code}")
         print(f"✅ Final URL: {response.url}")
+        connect = sum(t['connect'] for t in session.timings)
+        server = sum(t['server'] for t in session.timings)
+        print(f"ℹ️ Connect (DNS+TCP+TLS): {connect * 1000:.1f}ms, server: {server * 1000:.1f}ms "
+              f"over {len(session.timings)} request(s)")
         
         # Check if this is a Supabase project
         if 'supabase' in response.text.lower():
@@ -1,44 +1,121 @@
-from PIL import Image, ImageDraw, ImageFont, ImageFilter
-import random
+from PIL import Image, ImageDraw, ImageFont, ImageColor
 import os
+import argparse
 
-def create_office_image(output_path, width=1200, height=630):
-    """Create a professional office meeting image with a team and clients."""
-    # Create a new image with a light blue background (office-like color)
-    img = Image.new('RGB', (width, height), color=(240, 245, 255))
+try:
+    import numpy as np
+except ImportError:
+    np = None  # falls back to drawing the background line by line
+
+from build_cache import BuildCache, add_cache_arguments, font_fingerprint
+from image_variants import build_variants, encode_image
+
+FONTS = ["arialbd.ttf", "arial.ttf"]
+BACKGROUND_COLOR = (240, 245, 255)  # light blue, office-like
+GRID_COLOR = (230, 235, 245)
+GRID_SPACING = 30
+PATTERNS = ["grid", "dots", "none"]
+TINT_COLOR = (26, 35, 126)  # dark blue behind the title
+TINT_ALPHA = 180
+OUTPUTS = [
+    "images/softaidev-social.jpg",
+    # Variation for the blog
+    "images/blog-preview.jpg",
+    # Variation for services
+    "images/services-preview.jpg",
+]
+
+def render_background(width, height, color=BACKGROUND_COLOR, gradient=None, pattern="grid",
+                      pattern_color=GRID_COLOR, spacing=GRID_SPACING, line_width=1):
+    """Build the background (solid or vertical gradient, plus grid or dots) as one array."""
+    if gradient:
+        # Interpolate every row between the top and bottom colors at once
+        top, bottom = (np.array(c, dtype=np.float32) for c in gradient)
+        t = np.linspace(0.0, 1.0, height, dtype=np.float32)[:, None]
+        rows = np.rint(top + (bottom - top) * t).astype(np.uint8)
+        pixels = np.repeat(rows[:, None, :], width, axis=1)
+    else:
+        pixels = np.empty((height, width, 3), dtype=np.uint8)
+        pixels[:] = color
+
+    if pattern != "none":
+        on_column = (np.arange(width) % spacing) < line_width
+        on_row = (np.arange(height) % spacing) < line_width
+        if pattern == "grid":
+            mask = on_row[:, None] | on_column[None, :]
+        else:
+            mask = on_row[:, None] & on_column[None, :]
+        pixels[mask] = pattern_color
+    return Image.fromarray(pixels, 'RGB')
+
+def draw_background(width, height, color=BACKGROUND_COLOR, pattern="grid",
+                    pattern_color=GRID_COLOR, spacing=GRID_SPACING, line_width=1):
+    """Draw the background line by line with PIL (used when NumPy is not installed)."""
+    img = Image.new('RGB', (width, height), color=color)
+    draw = ImageDraw.Draw(img)
+    if pattern == "grid":
+        for i in range(0, width, spacing):
+            draw.rectangle([(i, 0), (i + line_width - 1, height)], fill=pattern_color)
+        for i in range(0, height, spacing):
+            draw.rectangle([(0, i), (width, i + line_width - 1)], fill=pattern_color)
+    elif pattern == "dots":
+        for x in range(0, width, spacing):
+            for y in range(0, height, spacing):
+                draw.rectangle([(x, y), (x + line_width - 1, y + line_width - 1)], fill=pattern_color)
+    return img
+
+def tint_band(img, box, color=TINT_COLOR, alpha=TINT_ALPHA):
+    """Blend a color over one band of the image, without a full-size overlay."""
+    band = img.crop(box)
+    if np is not None:
+        pixels = np.asarray(band, dtype=np.uint16)
+        blended = (pixels * (255 - alpha) + np.array(color, dtype=np.uint16) * alpha + 127) // 255
+        img.paste(Image.fromarray(blended.astype(np.uint8), 'RGB'), box[:2])
+    else:
+        img.paste(Image.blend(band, Image.new('RGB', band.size, color), alpha / 255), box[:2])
+
+def create_office_image(output_path, width=1200, height=630, scale=1, gradient=None, pattern="grid", cache=None):
+    """Create a professional office meeting image with a team and clients.
+
+    output_path may be a list of paths: the image is rendered once and
+    published to each of them through the build cache's object store.
+    """
+    s = scale
+    width, height = width * s, height * s
+
+    # Light blue background with a subtle grid pattern for the floor
+    if gradient and np is None:
+        print("⚠ NumPy is not installed, drawing a solid background instead of the gradient")
+    background = render_background if np is not None else draw_background
+    options = {"gradient": gradient} if np is not None else {}
+    img = background(width, height, pattern=pattern, spacing=GRID_SPACING * s, line_width=s, **options)
     draw = ImageDraw.Draw(img)
-    
-    # Draw a subtle grid pattern for the floor
-    for i in range(0, width, 30):
-        draw.line([(i, 0), (i, height)], fill=(230, 235, 245), width=1)
-    for i in range(0, height, 30):
-        draw.line([(0, i), (width, i)], fill=(230, 235, 245), width=1)
     
     # Draw a large conference table (ellipse)
     table_color = (139, 69, 19)  # Brown
     table = (width//4, height//3, 3*width//4, 2*height//3)
-    draw.ellipse(table, fill=table_color, outline=(89, 39, 0), width=3)
+    draw.ellipse(table, fill=table_color, outline=(89, 39, 0), width=3*s)
     
     # Draw chairs around the table (simple circles)
     chair_color = (160, 82, 45)  # Sienna
     for angle in range(0, 360, 45):
-        rad = angle * 3.14159 / 180
-        x = width//2 + int(200 * 1.5 * (1 if angle % 90 == 0 else 0.7) * (1 if angle < 180 else -1) * (1 if angle % 180 < 90 else -1))
-        y = height//2 + int(100 * 1.5 * (1 if angle % 90 == 0 else 0.7) * (1 if angle > 90 and angle < 270 else -1) * (1 if (angle+90) % 180 < 90 else -1))
-        draw.ellipse((x-20, y-20, x+20, y+20), fill=chair_color, outline=(100, 50, 20), width=2)
+        x = width//2 + int(200 * s * 1.5 * (1 if angle % 90 == 0 else 0.7) * (1 if angle < 180 else -1) * (1 if angle % 180 < 90 else -1))
+        y = height//2 + int(100 * s * 1.5 * (1 if angle % 90 == 0 else 0.7) * (1 if angle > 90 and angle < 270 else -1) * (1 if (angle+90) % 180 < 90 else -1))
+        draw.ellipse((x-20*s, y-20*s, x+20*s, y+20*s), fill=chair_color, outline=(100, 50, 20), width=2*s)
     
     # Draw simple stick figures for people
     def draw_person(x, y, color, facing='right'):
+        arm = 15*s if facing == 'right' else -15*s
         # Head
-        draw.ellipse((x-10, y-20, x+10, y), fill=(255, 218, 185), outline=(139, 69, 19), width=1)
+        draw.ellipse((x-10*s, y-20*s, x+10*s, y), fill=(255, 218, 185), outline=(139, 69, 19), width=s)
         # Body
-        draw.line([(x, y), (x, y+40)], fill=color, width=3)
+        draw.line([(x, y), (x, y+40*s)], fill=color, width=3*s)
         # Arms
-        draw.line([(x, y+15), (x+15 if facing == 'right' else x-15, y+25)], fill=color, width=3)
-        draw.line([(x, y+15), (x-15 if facing == 'right' else x+15, y+25)], fill=color, width=3)
+        draw.line([(x, y+15*s), (x+arm, y+25*s)], fill=color, width=3*s)
+        draw.line([(x, y+15*s), (x-arm, y+25*s)], fill=color, width=3*s)
         # Legs
-        draw.line([(x, y+40), (x+10, y+70)], fill=color, width=3)
-        draw.line([(x, y+40), (x-10, y+70)], fill=color, width=3)
+        draw.line([(x, y+40*s), (x+10*s, y+70*s)], fill=color, width=3*s)
+        draw.line([(x, y+40*s), (x-10*s, y+70*s)], fill=color, width=3*s)
     
     # Draw team members and clients around the table
     team_colors = [(70, 130, 180), (72, 61, 139), (65, 105, 225)]  # Team member colors
@@ -46,46 +123,86 @@ def create_office_image(output_path, width=1200, height=630):
     
     # Team members (left side)
     draw_person(width//3, height//2, team_colors[0], 'right')
-    draw_person(width//3, height//2 - 60, team_colors[1], 'right')
+    draw_person(width//3, height//2 - 60*s, team_colors[1], 'right')
     
     # Clients (right side)
     draw_person(2*width//3, height//2, client_colors[0], 'left')
-    draw_person(2*width//3, height//2 - 60, client_colors[1], 'left')
+    draw_person(2*width//3, height//2 - 60*s, client_colors[1], 'left')
     
-    # Add a white semi-transparent overlay for text
-    overlay = Image.new('RGBA', (width, height), (255, 255, 255, 0))
-    overlay_draw = ImageDraw.Draw(overlay)
-    overlay_draw.rectangle([(0, 0), (width, height//3)], fill=(26, 35, 126, 180))  # Dark blue with transparency
+    # Tint the top third dark blue behind the text
+    tint_band(img, (0, 0, width, height//3 + 1))
     
-    # Add text
+    # Add text (the default font is only scaled for retina sizes, keeping 1x unchanged)
+    def fallback_font(size):
+        return ImageFont.load_default(size * s) if s > 1 else ImageFont.load_default()
+
     try:
-        font = ImageFont.truetype("arialbd.ttf", 42)
+        font = ImageFont.truetype("arialbd.ttf", 42*s)
     except IOError:
-        font = ImageFont.load_default()
+        font = fallback_font(42)
     
-    overlay_draw.text((width//2, 70), "SoftAIDev", fill=(255, 255, 255), font=font, anchor="mm")
+    draw.text((width//2, 70*s), "SoftAIDev", fill=(255, 255, 255), font=font, anchor="mm")
     try:
-        font_small = ImageFont.truetype("arial.ttf", 24)
+        font_small = ImageFont.truetype("arial.ttf", 24*s)
     except IOError:
-        font_small = ImageFont.load_default()
-    overlay_draw.text((width//2, 120), "Professional Software Solutions & Consulting", fill=(200, 200, 255), font=font_small, anchor="mm")
-    
-    # Composite the overlay
-    img = Image.alpha_composite(img.convert('RGBA'), overlay).convert('RGB')
+        font_small = fallback_font(24)
+    draw.text((width//2, 120*s), "Professional Software Solutions & Consulting", fill=(200, 200, 255), font=font_small, anchor="mm")
     
-    # Save the image
-    img.save(output_path, quality=95)
-    print(f"Created office meeting image at: {output_path}")
+    # Save the image once, linking every name to the same stored bytes
+    cache = cache or BuildCache()
+    paths = [output_path] if isinstance(output_path, str) else output_path
+    data = encode_image(img, paths[0], quality=95)
+    for path in paths:
+        if cache.publish(path, data):
+            print(f"Created office meeting image at: {path}")
+        else:
+            print(f"Office meeting image unchanged: {path}")
+
+def scaled_path(output_path, scale):
+    """images/x.jpg at scale 2 is images/x@2x.jpg"""
+    if scale == 1:
+        return output_path
+    root, ext = os.path.splitext(output_path)
+    return f"{root}@{scale}x{ext}"
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate the office meeting images")
+    parser.add_argument("--scale", type=int, action="append", choices=[1, 2, 3],
+                        help="render at this multiple of 1200x630, repeat for several (default: 1); "
+                             "2x and 3x images are saved as name@2x.jpg and name@3x.jpg")
+    parser.add_argument("--gradient", nargs=2, metavar=("TOP", "BOTTOM"),
+                        help="vertical background gradient between two colors, e.g. '#f8faff' '#d8e0f0'")
+    parser.add_argument("--pattern", choices=PATTERNS, default="grid",
+                        help="floor pattern (default: grid)")
+    parser.add_argument("--variants", action="store_true",
+                        help="also build the responsive variants of the images (image_variants.py)")
+    add_cache_arguments(parser)
+    args = parser.parse_args(argv)
+    gradient = tuple(ImageColor.getrgb(color) for color in args.gradient) if args.gradient else None
 
-if __name__ == "__main__":
     # Create images directory if it doesn't exist
     os.makedirs("images", exist_ok=True)
     
-    # Generate the office meeting image
-    create_office_image("images/softaidev-social.jpg")
-    
-    # Create a variation for the blog
-    create_office_image("images/blog-preview.jpg")
-    
-    # Create a variation for services
-    create_office_image("images/services-preview.jpg")
+    # Generate the office meeting image once per scale for all its names, skipping unchanged ones
+    cache = BuildCache(force=args.force)
+    for scale in args.scale or [1]:
+        output_paths = [scaled_path(path, scale) for path in OUTPUTS]
+        inputs = {
+            "size": (1200, 630),
+            "scale": scale,
+            "gradient": gradient,
+            "pattern": args.pattern,
+            "numpy": np is not None,
+            "fonts": [font_fingerprint(font) for font in FONTS],
+            "source": cache.file_hash(__file__),
+        }
+        if not cache.run(f"office@{scale}x", inputs, output_paths, create_office_image, output_paths,
+                         scale=scale, gradient=gradient, pattern=args.pattern, cache=cache):
+            print(f"Office images up to date: {', '.join(output_paths)}")
+    if args.variants:
+        build_variants([scaled_path(path, scale) for scale in args.scale or [1] for path in OUTPUTS], cache=cache)
+    cache.save()
+    cache.print_stats()
+
+if __name__ == "__main__":
+    main()
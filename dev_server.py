@@ -0,0 +1,528 @@
+#!/usr/bin/env python3
+"""
+Local development server for the SoftAIDev site.
+
+Serves the site from a thread per connection with HTTP/1.1 keep-alive.
+Every file response carries an ETag and Last-Modified, and conditional
+requests (If-None-Match, If-Modified-Since) get 304 Not Modified. HTML,
+JS, CSS and other text files are compressed with brotli (if the brotli
+module is installed) or gzip, and the compressed bodies are kept in
+memory until the file changes.
+
+The [[redirects]] of netlify.toml are applied, so /api/auth/callback
+reaches a local port of netlify/functions/api-auth-callback.js.
+
+With preload (--preload, and always for the test suites) the whole site
+tree is read into memory at startup. Compressed variants are computed
+up front, and every file gets a strong ETag from its SHA-256. Binaries too
+large to keep in memory are sent with sendfile. A watcher thread (inotify,
+or polling elsewhere) reloads files as they change.
+
+The test suites call ensure_server(), which reuses VA_TEST_BASE_URL if
+it is set and otherwise starts a preloaded server on a free port.
+
+Usage:
+    python dev_server.py                # http://localhost:8000
+    python dev_server.py 8080
+    python dev_server.py --preload      # serve from memory
+"""
+import io
+import os
+import sys
+import gzip
+import json
+import hashlib
+import argparse
+import mimetypes
+import threading
+import functools
+import email.utils
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+from urllib.parse import urlsplit, parse_qsl
+from http.server import ThreadingHTTPServer, SimpleHTTPRequestHandler
+
+from file_watch import InotifyWatcher, PollingWatcher
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+try:
+    import tomllib
+except ImportError:  # Python < 3.11
+    tomllib = None
+
+SITE_ROOT = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_PORT = 8000
+COMPRESSIBLE_TYPES = ("text/", "application/javascript", "application/json", "application/xml", "image/svg+xml")
+MIN_COMPRESS_SIZE = 512
+COMPRESSED_CACHE_BYTES = 32 * 1024 * 1024
+FUNCTIONS_PREFIX = "/.netlify/functions/"
+INLINE_LIMIT = 64 * 1024  # larger binaries stay on disk and go out with sendfile
+SKIPPED_DIRS = {"__pycache__", "node_modules"}
+
+
+def api_auth_callback(method, query, body):
+    """Local port of netlify/functions/api-auth-callback.js"""
+    return 200, {"message": "Auth callback received", "method": method, "query": query, "body": body}
+
+
+# Netlify functions that can run locally: name -> func(method, query, body) -> (status, json body)
+LOCAL_FUNCTIONS = {
+    "api-auth-callback": api_auth_callback,
+}
+
+
+def load_redirects(root=SITE_ROOT):
+    """Return the [[redirects]] of netlify.toml as (from, to, status) tuples"""
+    path = os.path.join(root, "netlify.toml")
+    if tomllib is None or not os.path.exists(path):
+        return []
+    with open(path, "rb") as f:
+        config = tomllib.load(f)
+    return [(rule["from"], rule["to"], int(rule.get("status", 301))) for rule in config.get("redirects", [])]
+
+
+def match_redirect(redirects, path):
+    """Return (target, status) of the first rule matching path, or None.
+
+    Rules match exactly, or by prefix when `from` ends in /* (the rest of
+    the path replaces :splat in `to`).
+    """
+    for source, target, status in redirects:
+        if source.endswith("/*"):
+            prefix = source[:-1]
+            if path.startswith(prefix):
+                return target.replace(":splat", path[len(prefix):]), status
+        elif path == source:
+            return target, status
+    return None
+
+
+class CompressedCache:
+    """Compressed file bodies by (path, encoding), valid while mtime and size are unchanged"""
+
+    def __init__(self, max_bytes=COMPRESSED_CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, path, stat, encoding):
+        key = (path, encoding)
+        with self._lock:
+            entry = self.entries.get(key)
+            if entry and entry[0] == stat.st_mtime_ns and entry[1] == stat.st_size:
+                self.entries.move_to_end(key)
+                return entry[2]
+
+        with open(path, "rb") as f:
+            data = f.read()
+        body = compress(data, encoding)
+
+        with self._lock:
+            old = self.entries.pop(key, None)
+            if old:
+                self.size -= len(old[2])
+            self.entries[key] = (stat.st_mtime_ns, stat.st_size, body)
+            self.size += len(body)
+            while self.size > self.max_bytes and len(self.entries) > 1:
+                _, evicted = self.entries.popitem(last=False)
+                self.size -= len(evicted[2])
+        return body
+
+
+_compressed = CompressedCache()
+
+
+def is_servable(root, path):
+    """False for dotfiles such as .env, anything in a hidden directory, and caches"""
+    parts = os.path.relpath(path, root).split(os.sep)
+    return not any(part.startswith(".") and part not in (".", "..") or part in SKIPPED_DIRS for part in parts)
+
+
+def compress(data, encoding):
+    return brotli.compress(data) if encoding == "br" else gzip.compress(data, compresslevel=6, mtime=0)
+
+
+def is_compressible(content_type):
+    return content_type.startswith(COMPRESSIBLE_TYPES)
+
+
+def guess_type(path):
+    return mimetypes.guess_type(path)[0] or "application/octet-stream"
+
+
+class Asset:
+    """What the handler needs to answer for one file"""
+
+    def __init__(self, path, mtime, size, etag, content_type, data=None, variants=None):
+        self.path = path
+        self.mtime = mtime
+        self.size = size
+        self.etag = etag  # quoted, without encoding suffix
+        self.content_type = content_type
+        self.data = data  # None: read from disk
+        self.variants = variants or {}  # encoding -> compressed body
+
+    @classmethod
+    def from_stat(cls, path, stat, content_type):
+        """Describe a file from its stat only, with an ETag built from its mtime and size"""
+        return cls(path, stat.st_mtime, stat.st_size, f'"{stat.st_mtime_ns:x}-{stat.st_size:x}"', content_type)
+
+
+class AssetCache:
+    """The site tree in memory, with precompressed variants and content-hash ETags"""
+
+    def __init__(self, root=SITE_ROOT, inline_limit=INLINE_LIMIT):
+        self.root = root
+        self.inline_limit = inline_limit
+        self.assets = {}  # absolute path -> Asset
+        self.encodings = ["br", "gzip"] if brotli is not None else ["gzip"]
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+
+    def site_files(self):
+        for directory, dirs, files in os.walk(self.root):
+            dirs[:] = [d for d in dirs if not d.startswith(".") and d not in SKIPPED_DIRS]
+            for name in files:
+                if not name.startswith("."):
+                    yield os.path.join(directory, name)
+
+    def load(self, path):
+        """Read one file into the cache; return its Asset, or None if it is gone"""
+        try:
+            with open(path, "rb") as f:
+                stat = os.fstat(f.fileno())
+                digest = hashlib.sha256()
+                data = b""
+                if stat.st_size <= self.inline_limit:
+                    data = f.read()
+                    digest.update(data)
+                else:
+                    for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                        digest.update(chunk)
+        except OSError:
+            with self._lock:
+                self.assets.pop(path, None)
+            return None
+
+        content_type = guess_type(path)
+        variants = {}
+        if is_compressible(content_type) and MIN_COMPRESS_SIZE <= stat.st_size <= self.inline_limit:
+            variants = {encoding: compress(data, encoding) for encoding in self.encodings}
+        asset = Asset(path, stat.st_mtime, stat.st_size, f'"{digest.hexdigest()[:32]}"', content_type,
+                      data if stat.st_size <= self.inline_limit else None, variants)
+        with self._lock:
+            self.assets[path] = asset
+        return asset
+
+    def preload(self, workers=8):
+        """Load every site file in a thread pool"""
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            list(executor.map(self.load, list(self.site_files())))
+
+    def memory_bytes(self):
+        with self._lock:
+            return sum(len(a.data or b"") + sum(map(len, a.variants.values())) for a in self.assets.values())
+
+    def get(self, path):
+        """Return the Asset for a path, loading files created since the preload"""
+        asset = self.assets.get(path)
+        if asset is None and is_servable(self.root, path) and os.path.isfile(path):
+            asset = self.load(path)
+        return asset
+
+    def invalidate(self, paths):
+        """Reload changed files and drop deleted ones"""
+        for path in paths:
+            if not is_servable(self.root, path):
+                continue
+            if os.path.isfile(path):
+                self.load(path)
+            else:
+                with self._lock:
+                    self.assets.pop(path, None)
+
+    def watch(self, poll_interval=None):
+        """Reload files as they change, from a daemon thread; return the thread"""
+        options = {"recursive": [""], "root": self.root, "skip_dirs": SKIPPED_DIRS}
+        if poll_interval is None:
+            try:
+                watcher = InotifyWatcher([""], **options)
+            except OSError:
+                watcher = PollingWatcher([""], interval=1.0, **options)
+        else:
+            watcher = PollingWatcher([""], interval=poll_interval, **options)
+
+        def run():
+            try:
+                while not self._stop.is_set():
+                    changed = watcher.wait(timeout=0.5)
+                    self.invalidate(os.path.normpath(os.path.join(self.root, path)) for path in changed)
+            finally:
+                watcher.close()
+
+        thread = threading.Thread(target=run, daemon=True)
+        thread.start()
+        return thread
+
+    def stop(self):
+        self._stop.set()
+
+
+class QuietRequestHandler(SimpleHTTPRequestHandler):
+    """Static file handler that does not log every request to stderr"""
+
+    def log_message(self, format, *args):
+        pass
+
+
+class SiteRequestHandler(QuietRequestHandler):
+    """Static files with validators, compression and the netlify.toml redirects"""
+
+    protocol_version = "HTTP/1.1"
+    # Headers and body are written separately; without this, keep-alive
+    # responses stall on Nagle's algorithm and delayed ACKs (~40ms each)
+    disable_nagle_algorithm = True
+
+    def __init__(self, *args, redirects=(), assets=None, **kwargs):
+        self.redirects = redirects
+        self.assets = assets
+        super().__init__(*args, **kwargs)
+
+    def do_GET(self):
+        if not self.handle_redirect():
+            super().do_GET()
+
+    def do_HEAD(self):
+        if not self.handle_redirect():
+            super().do_HEAD()
+
+    def do_POST(self):
+        if not self.handle_redirect():
+            # Drain the body so the kept-alive connection stays in sync
+            self.rfile.read(int(self.headers.get("Content-Length") or 0))
+            self.send_error(HTTPStatus.METHOD_NOT_ALLOWED, "Only functions accept POST")
+
+    def handle_redirect(self):
+        """Apply a redirect or run a function for the request path; return True if handled"""
+        url = urlsplit(self.path)
+        match = match_redirect(self.redirects, url.path)
+        target, status = match if match else (url.path, 200)
+
+        if status in (301, 302, 303, 307, 308):
+            location = target + (f"?{url.query}" if url.query and "?" not in target else "")
+            self.send_response(status)
+            self.send_header("Location", location)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return True
+
+        if target.startswith(FUNCTIONS_PREFIX):
+            self.run_function(target[len(FUNCTIONS_PREFIX):].strip("/"), url.query)
+            return True
+
+        if match:
+            # Rewrite (status 200) to another file of the site
+            self.path = target + (f"?{url.query}" if url.query else "")
+        return False
+
+    def run_function(self, name, query):
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length).decode("utf-8", errors="replace") if length else None
+        func = LOCAL_FUNCTIONS.get(name)
+        if func is None:
+            self.send_error(HTTPStatus.NOT_FOUND, f"No local port of function '{name}'")
+            return
+        status, payload = func(self.command, dict(parse_qsl(query)), body)
+        data = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.send_header("Cache-Control", "no-store")
+        self.end_headers()
+        if self.command != "HEAD":
+            self.wfile.write(data)
+
+    def choose_encoding(self, content_type, size):
+        if size < MIN_COMPRESS_SIZE or not content_type.startswith(COMPRESSIBLE_TYPES):
+            return None
+        accepted = {part.split(";")[0].strip() for part in self.headers.get("Accept-Encoding", "").split(",")}
+        if brotli is not None and "br" in accepted:
+            return "br"
+        if "gzip" in accepted:
+            return "gzip"
+        return None
+
+    def not_modified(self, etag, mtime):
+        if_none_match = self.headers.get("If-None-Match")
+        if if_none_match is not None:
+            tags = [tag.strip() for tag in if_none_match.split(",")]
+            return "*" in tags or etag in tags or f"W/{etag}" in tags
+        if_modified_since = self.headers.get("If-Modified-Since")
+        if if_modified_since:
+            try:
+                since = email.utils.parsedate_to_datetime(if_modified_since)
+            except (TypeError, ValueError, IndexError, OverflowError):
+                return False
+            return since is not None and int(mtime) <= since.timestamp()
+        return False
+
+    def send_head(self):
+        path = self.translate_path(self.path)
+        if os.path.isdir(path):
+            index = next((os.path.join(path, name) for name in ("index.html", "index.htm")
+                          if os.path.isfile(os.path.join(path, name))), None)
+            if index is None or not urlsplit(self.path).path.endswith("/"):
+                # Directory listing, or the redirect that adds the trailing slash
+                return super().send_head()
+            path = index
+        asset = self.describe(path)
+        if asset is None:
+            self.send_error(HTTPStatus.NOT_FOUND, "File not found")
+            return None
+
+        encoding = self.choose_encoding(asset.content_type, asset.size)
+        if self.assets is not None and encoding not in asset.variants:
+            encoding = None  # preloaded files are only served compressed from their variants
+        etag = asset.etag[:-1] + f'-{encoding}"' if encoding else asset.etag
+
+        if self.not_modified(etag, asset.mtime):
+            self.send_response(HTTPStatus.NOT_MODIFIED)
+            self.send_validators(etag, asset.mtime)
+            self.end_headers()
+            return None
+
+        try:
+            if encoding:
+                body = asset.variants.get(encoding) or _compressed.get(path, os.stat(path), encoding)
+                source, length = io.BytesIO(body), len(body)
+            elif asset.data is not None:
+                source, length = io.BytesIO(asset.data), asset.size
+            else:
+                source, length = open(path, "rb"), asset.size
+        except OSError:
+            self.send_error(HTTPStatus.NOT_FOUND, "File not found")
+            return None
+        self.send_response(HTTPStatus.OK)
+        self.send_header("Content-Type", asset.content_type)
+        self.send_header("Content-Length", str(length))
+        if encoding:
+            self.send_header("Content-Encoding", encoding)
+        self.send_validators(etag, asset.mtime)
+        self.end_headers()
+        return source
+
+    def describe(self, path):
+        """Return the Asset for a file path, from the preloaded cache or from a stat"""
+        if path.endswith("/") or not is_servable(self.directory, path):
+            return None
+        if self.assets is not None:
+            return self.assets.get(path)
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        if not os.path.isfile(path):
+            return None
+        return Asset.from_stat(path, stat, self.guess_type(path))
+
+    def copyfile(self, source, outputfile):
+        # Files on disk go straight from the page cache to the socket
+        if hasattr(source, "fileno") and not isinstance(source, io.BytesIO):
+            self.wfile.flush()
+            self.connection.sendfile(source)
+        else:
+            super().copyfile(source, outputfile)
+
+    def send_validators(self, etag, mtime):
+        self.send_header("ETag", etag)
+        self.send_header("Last-Modified", self.date_time_string(int(mtime)))
+        # Always revalidate, so edits show up on the next load
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Vary", "Accept-Encoding")
+
+
+class SiteServer(ThreadingHTTPServer):
+    """Threaded server that ignores clients hanging up mid-response"""
+
+    daemon_threads = True
+
+    def handle_error(self, request, client_address):
+        if isinstance(sys.exc_info()[1], (ConnectionResetError, BrokenPipeError)):
+            return
+        super().handle_error(request, client_address)
+
+
+def start_server(port=0, root=SITE_ROOT, host="127.0.0.1", preload=False):
+    """Start the server on a background thread and return (server, base_url).
+
+    Passing port=0 lets the OS pick a free port, which keeps parallel
+    test workers from colliding with each other. With preload, files
+    are served from an AssetCache kept current by a watcher thread.
+    """
+    assets = None
+    if preload:
+        assets = AssetCache(root)
+        assets.preload()
+        assets.watch()
+    handler = functools.partial(SiteRequestHandler, directory=root, redirects=load_redirects(root), assets=assets)
+    server = SiteServer((host, port), handler)
+    server.assets = assets
+
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+
+    base_url = f"http://localhost:{server.server_address[1]}"
+    return server, base_url
+
+
+def stop_server(server):
+    """Shut down a server started with start_server"""
+    server.shutdown()
+    server.server_close()
+    if server.assets is not None:
+        server.assets.stop()
+
+
+_server = None
+
+
+def ensure_server():
+    """Return the base URL the tests should use, starting a server on a free port if VA_TEST_BASE_URL is not set"""
+    global _server
+    base_url = os.environ.get("VA_TEST_BASE_URL")
+    if base_url:
+        return base_url.rstrip("/")
+    _server, base_url = start_server(port=0, preload=True)
+    # Inherited by subprocesses and by later suites in this process
+    os.environ["VA_TEST_BASE_URL"] = base_url
+    return base_url
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Serve the site locally")
+    parser.add_argument("port", type=int, nargs="?", default=DEFAULT_PORT,
+                        help=f"port to listen on (default: {DEFAULT_PORT})")
+    parser.add_argument("--preload", action="store_true",
+                        help="serve from memory, reloading files as they change")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    server, base_url = start_server(args.port, host="", preload=args.preload)
+    print(f"Serving {SITE_ROOT} at {base_url}")
+    print(f"Compression: {'brotli, gzip' if brotli else 'gzip'}; redirects: {len(load_redirects())} from netlify.toml")
+    if server.assets is not None:
+        print(f"Preloaded {len(server.assets.assets)} files "
+              f"({server.assets.memory_bytes() / 1024 / 1024:.1f} MB in memory)")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        print("\nStopping server...")
+        stop_server(server)
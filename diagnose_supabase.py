@@ -0,0 +1,249 @@
+#!/usr/bin/env python3
+"""
+Concurrent connectivity diagnostics for the Supabase project.
+
+Checks SUPABASE_URL the way check_network.py, http_test.py and
+test_connection.py do between them, but with asyncio, so the checks run
+at the same time instead of one after another:
+
+    DNS        resolve the project host
+    TCP        open a TCP connection
+    TLS        TCP plus the TLS handshake (https only)
+    REST root  GET /rest/v1/
+    Table      GET /rest/v1/<table>?select=*&limit=1
+    Function   OPTIONS /functions/v1/<function> (the CORS preflight, so
+               nothing is sent or written)
+
+The host is resolved once. All the other checks start as soon as the
+address is known and each opens its own connection, so the whole run
+takes about one DNS lookup plus one connect and request. Each request
+check reports its own connect, TLS and server time. A 401/403 from the
+table counts as reachable, like http_test.py.
+
+Usage:
+    python diagnose_supabase.py
+    python diagnose_supabase.py --table customers --function receive-email
+    python diagnose_supabase.py --json        # machine-readable report
+"""
+import os
+import ssl
+import sys
+import json
+import time
+import socket
+import asyncio
+import argparse
+from urllib.parse import urlsplit
+
+try:
+    from dotenv import load_dotenv
+except ImportError:
+    load_dotenv = None
+
+DEFAULT_URL = "https://glplnybcdgbyajdgzjrr.supabase.co"
+DEFAULT_TABLE = "purchases"
+DEFAULT_FUNCTION = "send-email"
+DEFAULT_TIMEOUT = 10.0
+USER_AGENT = "softaidev-diagnostics"
+
+
+class NotRun(Exception):
+    """A check could not start because a check it depends on failed"""
+
+
+class Check:
+    """Outcome of one check: ok is True, False, or None for reachable-but-refused"""
+
+    def __init__(self, name):
+        self.name = name
+        self.ok = False
+        self.detail = ""
+        self.phases = {}  # phase -> seconds
+        self.start = None
+        self.seconds = 0.0
+
+    def as_dict(self):
+        return {"name": self.name, "ok": self.ok, "detail": self.detail, "seconds": round(self.seconds, 4),
+                "phases": {phase: round(seconds, 4) for phase, seconds in self.phases.items()}}
+
+
+async def resolve(host, port):
+    """Return the getaddrinfo entries of a host"""
+    loop = asyncio.get_running_loop()
+    return await loop.getaddrinfo(host, port, type=socket.SOCK_STREAM)
+
+
+async def connect(address, host, tls, check):
+    """Open a stream to a resolved address, timing TCP and TLS separately; return (reader, writer)"""
+    family, type_, proto, _, sockaddr = address
+    loop = asyncio.get_running_loop()
+    sock = socket.socket(family, type_, proto)
+    sock.setblocking(False)
+    start = time.perf_counter()
+    try:
+        await loop.sock_connect(sock, sockaddr)
+    except BaseException:
+        sock.close()
+        raise
+    check.phases["tcp"] = time.perf_counter() - start
+    if not tls:
+        return await asyncio.open_connection(sock=sock)
+    start = time.perf_counter()
+    streams = await asyncio.open_connection(sock=sock, ssl=ssl.create_default_context(), server_hostname=host)
+    check.phases["tls"] = time.perf_counter() - start
+    return streams
+
+
+async def close(writer):
+    writer.close()
+    try:
+        await writer.wait_closed()
+    except (OSError, ssl.SSLError):
+        pass
+
+
+async def request(address, url, method, path, headers, check):
+    """Send one HTTP/1.1 request on a new connection; return the status code"""
+    reader, writer = await connect(address, url.hostname, url.scheme == "https", check)
+    try:
+        lines = [f"{method} {path} HTTP/1.1", f"Host: {url.netloc}", f"User-Agent: {USER_AGENT}",
+                 "Accept: application/json", "Connection: close"]
+        lines += [f"{name}: {value}" for name, value in headers.items()]
+        start = time.perf_counter()
+        writer.write(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1"))
+        await writer.drain()
+        status_line = await reader.readline()
+        check.phases["server"] = time.perf_counter() - start
+        parts = status_line.decode("latin-1").split()
+        if len(parts) < 2 or not parts[1].isdigit():
+            raise ConnectionError(f"unexpected response: {status_line[:80]!r}")
+        return int(parts[1])
+    finally:
+        await close(writer)
+
+
+async def timed(check, coroutine, timeout):
+    """Run a check's coroutine with a timeout, recording its duration and any failure"""
+    check.start = time.perf_counter()
+    try:
+        await asyncio.wait_for(coroutine, timeout)
+    except asyncio.TimeoutError:
+        check.ok, check.detail = False, f"timed out after {timeout:g}s"
+    except NotRun as e:
+        check.ok, check.detail = False, str(e)
+    except Exception as e:
+        check.ok, check.detail = False, f"{type(e).__name__}: {e}"
+    check.seconds = time.perf_counter() - check.start
+    return check
+
+
+def api_headers(key):
+    return {"apikey": key, "Authorization": f"Bearer {key}"} if key else {}
+
+
+async def diagnose(supabase_url, key=None, table=DEFAULT_TABLE, function=DEFAULT_FUNCTION, timeout=DEFAULT_TIMEOUT):
+    """Run every check concurrently; return (checks, wall seconds)"""
+    url = urlsplit(supabase_url.rstrip("/"))
+    port = url.port or (443 if url.scheme == "https" else 80)
+    start = time.perf_counter()
+    addresses = asyncio.get_running_loop().create_future()
+
+    async def dns(check):
+        try:
+            infos = await resolve(url.hostname, port)
+        except BaseException:
+            addresses.set_exception(NotRun("not run: DNS failed"))
+            raise
+        addresses.set_result(infos)
+        unique = sorted({info[4][0] for info in infos})
+        check.phases["dns"] = time.perf_counter() - check.start
+        check.ok, check.detail = True, f"{url.hostname} -> {', '.join(unique)}"
+
+    async def tcp(check):
+        address = (await addresses)[0]
+        reader, writer = await connect(address, url.hostname, False, check)
+        await close(writer)
+        check.ok, check.detail = True, f"connected to {address[4][0]}:{port}"
+
+    async def tls(check):
+        if url.scheme != "https":
+            check.ok, check.detail = None, "skipped: not an https URL"
+            return
+        reader, writer = await connect((await addresses)[0], url.hostname, True, check)
+        ssl_object = writer.get_extra_info("ssl_object")
+        check.ok, check.detail = True, f"{ssl_object.version()}, {ssl_object.cipher()[0]}, certificate verified"
+        await close(writer)
+
+    async def http(check, method, path, reachable=()):
+        status = await request((await addresses)[0], url, method, path, api_headers(key), check)
+        if 200 <= status < 300:
+            check.ok, check.detail = True, f"HTTP {status}"
+        elif status in reachable:
+            check.ok, check.detail = None, f"HTTP {status} (reachable, authentication required)"
+        else:
+            check.ok, check.detail = False, f"HTTP {status}"
+
+    checks = [Check("DNS"), Check("TCP"), Check("TLS"), Check("REST root"),
+              Check(f"Table {table}"), Check(f"Function {function}")]
+    coroutines = [
+        dns(checks[0]),
+        tcp(checks[1]),
+        tls(checks[2]),
+        http(checks[3], "GET", "/rest/v1/"),
+        http(checks[4], "GET", f"/rest/v1/{table}?select=*&limit=1", reachable=(401, 403)),
+        http(checks[5], "OPTIONS", f"/functions/v1/{function}"),
+    ]
+    await asyncio.gather(*(timed(check, coroutine, timeout) for check, coroutine in zip(checks, coroutines)))
+    return checks, time.perf_counter() - start
+
+
+def format_phases(check):
+    return ", ".join(f"{phase} {seconds * 1000:.1f}ms" for phase, seconds in check.phases.items())
+
+
+def print_report(supabase_url, checks, wall):
+    """Print one line per check and a summary"""
+    print(f"Supabase diagnostics for {supabase_url}\n")
+    width = max(len(check.name) for check in checks)
+    for check in checks:
+        icon = "✅" if check.ok else "ℹ️ " if check.ok is None else "❌"
+        phases = f"  ({format_phases(check)})" if len(check.phases) > 1 else ""
+        print(f"{icon} {check.name:<{width}}  {check.seconds * 1000:7.1f}ms  {check.detail}{phases}")
+    serial = sum(sum(check.phases.values()) for check in checks)
+    failed = [check.name for check in checks if check.ok is False]
+    comparison = f" (the checks one after another would take about {serial * 1000:.1f}ms)" if serial else ""
+    print(f"\nFinished in {wall * 1000:.1f}ms{comparison}")
+    print(f"❌ {len(failed)} check(s) failed: {', '.join(failed)}" if failed else "✅ Supabase is reachable")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Check DNS, TCP, TLS, REST and function reachability of SUPABASE_URL concurrently")
+    parser.add_argument("--url", help="project URL (default: SUPABASE_URL)")
+    parser.add_argument("--table", default=DEFAULT_TABLE,
+                        help=f"table to query (default: {DEFAULT_TABLE})")
+    parser.add_argument("--function", default=DEFAULT_FUNCTION,
+                        help=f"Edge Function to ping with a CORS preflight (default: {DEFAULT_FUNCTION})")
+    parser.add_argument("--timeout", type=float, default=DEFAULT_TIMEOUT, metavar="SECONDS",
+                        help=f"per-check timeout (default: {DEFAULT_TIMEOUT:g})")
+    parser.add_argument("--json", action="store_true",
+                        help="print the report as JSON")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if load_dotenv:
+        load_dotenv()
+    supabase_url = args.url or os.getenv("SUPABASE_URL") or DEFAULT_URL
+    key = os.getenv("SUPABASE_ANON_KEY") or os.getenv("SUPABASE_KEY")
+    checks, wall = asyncio.run(diagnose(supabase_url, key, args.table, args.function, args.timeout))
+    if args.json:
+        print(json.dumps({"url": supabase_url, "seconds": round(wall, 4),
+                          "checks": [check.as_dict() for check in checks]}, indent=2))
+    else:
+        print_report(supabase_url, checks, wall)
+    return 1 if any(check.ok is False for check in checks) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,156 @@
+"""
+Shared WebDriver pool for the Selenium test suites.
+
+Browsers are expensive to start, so instead of every test class launching
+its own Chrome, classes lease a warm browser from this pool and hand it back
+when they are done. Cookies and web storage are cleared between leases and a
+browser is recycled after a configurable number of uses.
+
+Configuration (environment variables):
+    VA_DRIVER_POOL_SIZE   number of idle browsers kept warm (default: 2)
+    VA_DRIVER_MAX_USES    leases before a browser is recycled (default: 10)
+
+Browser options come from browser_profile.py (VA_BROWSER_PROFILE).
+"""
+import os
+import atexit
+import threading
+from contextlib import contextmanager
+
+from selenium import webdriver
+from selenium.common.exceptions import WebDriverException
+
+from browser_profile import build_chrome_options
+from driver_resolver import chrome_service
+
+DEFAULT_POOL_SIZE = 2
+DEFAULT_MAX_USES = 10
+
+
+def create_chrome_driver():
+    """Start a new Chrome browser for the pool"""
+    return webdriver.Chrome(service=chrome_service(), options=build_chrome_options())
+
+
+class DriverPool:
+    """Thread-safe pool of reusable WebDriver instances"""
+
+    def __init__(self, size=None, max_uses=None, factory=None):
+        self.size = size or int(os.environ.get("VA_DRIVER_POOL_SIZE", DEFAULT_POOL_SIZE))
+        self.max_uses = max_uses or int(os.environ.get("VA_DRIVER_MAX_USES", DEFAULT_MAX_USES))
+        self.factory = factory or create_chrome_driver
+        self._idle = []
+        self._uses = {}
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def warm(self, count=1):
+        """Start browsers ahead of time so the first lease is instant"""
+        while True:
+            with self._lock:
+                if self._closed or len(self._idle) >= min(count, self.size):
+                    return
+            driver = self.factory()
+            with self._lock:
+                self._uses[id(driver)] = 0
+                self._idle.append(driver)
+
+    def acquire(self):
+        """Lease a browser, starting a new one if none are idle"""
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("Driver pool has been closed")
+            if self._idle:
+                return self._idle.pop()
+
+        driver = self.factory()
+        with self._lock:
+            self._uses[id(driver)] = 0
+        return driver
+
+    def release(self, driver):
+        """Return a leased browser to the pool"""
+        with self._lock:
+            uses = self._uses.get(id(driver), 0) + 1
+            self._uses[id(driver)] = uses
+            keep = not self._closed and uses < self.max_uses and len(self._idle) < self.size
+
+        if keep and self._reset(driver):
+            with self._lock:
+                if not self._closed:
+                    self._idle.append(driver)
+                    return
+
+        self._quit(driver)
+
+    @contextmanager
+    def lease(self):
+        """Context manager form of acquire/release"""
+        driver = self.acquire()
+        try:
+            yield driver
+        finally:
+            self.release(driver)
+
+    def close(self):
+        """Quit every idle browser and refuse further leases"""
+        with self._lock:
+            self._closed = True
+            idle, self._idle = self._idle, []
+
+        for driver in idle:
+            self._quit(driver)
+
+    def _reset(self, driver):
+        """Clear browser state so the next lease starts clean"""
+        try:
+            # Close any extra windows or tabs the previous user opened
+            handles = driver.window_handles
+            for handle in handles[1:]:
+                driver.switch_to.window(handle)
+                driver.close()
+            driver.switch_to.window(handles[0])
+
+            # Web storage is per origin, so clear it before leaving the page
+            if driver.current_url.startswith("http"):
+                driver.execute_script(
+                    "window.localStorage.clear(); window.sessionStorage.clear();"
+                )
+            driver.delete_all_cookies()
+            driver.get("about:blank")
+            return True
+        except WebDriverException as e:
+            print(f"Discarding browser that could not be reset: {e}")
+            return False
+
+    def _quit(self, driver):
+        with self._lock:
+            self._uses.pop(id(driver), None)
+        try:
+            driver.quit()
+        except WebDriverException:
+            pass
+
+
+_shared_pool = None
+_shared_pool_lock = threading.Lock()
+
+
+def get_pool():
+    """Return the process-wide pool, creating it on first use"""
+    global _shared_pool
+    with _shared_pool_lock:
+        if _shared_pool is None:
+            _shared_pool = DriverPool()
+            atexit.register(_shared_pool.close)
+        return _shared_pool
+
+
+def acquire_driver():
+    """Lease a browser from the shared pool"""
+    return get_pool().acquire()
+
+
+def release_driver(driver):
+    """Return a browser to the shared pool"""
+    get_pool().release(driver)
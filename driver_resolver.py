@@ -0,0 +1,178 @@
+"""
+Shared chromedriver resolution for the Selenium test suites.
+
+The driver path is resolved once per process and remembered in a small
+on-disk cache keyed by the installed Chrome version, so later runs skip the
+webdriver_manager version check entirely. In offline mode the network is
+never touched: the driver is taken from CHROMEDRIVER_PATH, the cache, the
+PATH or a previous webdriver_manager download.
+
+Configuration (environment variables):
+    CHROMEDRIVER_PATH   explicit chromedriver binary to use
+    VA_OFFLINE          set to 1 to never download a driver
+    VA_DRIVER_CACHE     location of the cache file
+                        (default: ~/.cache/softaidev/chromedriver.json)
+"""
+import os
+import re
+import sys
+import glob
+import json
+import shutil
+import subprocess
+import threading
+import time
+
+DEFAULT_CACHE_FILE = os.path.join(
+    os.path.expanduser("~"), ".cache", "softaidev", "chromedriver.json"
+)
+
+CHROME_COMMANDS = [
+    "google-chrome",
+    "google-chrome-stable",
+    "chromium",
+    "chromium-browser",
+    "/Applications/Google Chrome.app/Contents/MacOS/Google Chrome",
+]
+
+WINDOWS_VERSION_QUERY = [
+    "reg", "query", r"HKEY_CURRENT_USER\Software\Google\Chrome\BLBeacon", "/v", "version"
+]
+
+VERSION_PATTERN = re.compile(r"(\d+)\.\d+\.\d+\.\d+")
+
+_resolved_path = None
+_resolve_lock = threading.Lock()
+
+
+def is_offline():
+    """Return True when driver downloads are disabled"""
+    return os.environ.get("VA_OFFLINE", "0") == "1"
+
+
+def get_chrome_version():
+    """Return the installed Chrome version string, or None if unknown"""
+    commands = [WINDOWS_VERSION_QUERY] if sys.platform == "win32" else [
+        [command, "--version"] for command in CHROME_COMMANDS
+    ]
+
+    for command in commands:
+        try:
+            output = subprocess.run(
+                command, capture_output=True, text=True, timeout=5
+            ).stdout
+        except (OSError, subprocess.SubprocessError):
+            continue
+
+        match = VERSION_PATTERN.search(output)
+        if match:
+            return match.group(0)
+    return None
+
+
+def _cache_file():
+    return os.environ.get("VA_DRIVER_CACHE", DEFAULT_CACHE_FILE)
+
+
+def load_cache():
+    """Load the version -> driver path cache"""
+    try:
+        with open(_cache_file(), "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_cache(cache):
+    """Write the cache atomically so parallel workers never see half a file"""
+    path = _cache_file()
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(cache, f, indent=2)
+    os.replace(tmp_path, path)
+
+
+def find_local_driver(version=None):
+    """Find an already installed chromedriver without using the network"""
+    binary = "chromedriver.exe" if sys.platform == "win32" else "chromedriver"
+    candidates = glob.glob(
+        os.path.join(os.path.expanduser("~"), ".wdm", "drivers", "chromedriver", "**", binary),
+        recursive=True
+    )
+
+    # Prefer a webdriver_manager download matching the browser's major version
+    if version:
+        major = version.split(".")[0]
+        matching = [c for c in candidates if f"{os.sep}{major}." in c]
+        if matching:
+            return max(matching, key=os.path.getmtime)
+
+    on_path = shutil.which(binary)
+    if on_path:
+        return on_path
+
+    if candidates:
+        return max(candidates, key=os.path.getmtime)
+    return None
+
+
+def download_driver():
+    """Resolve the driver through webdriver_manager (needs network)"""
+    from webdriver_manager.chrome import ChromeDriverManager
+    return ChromeDriverManager().install()
+
+
+def resolve_chromedriver(offline=None):
+    """Return the chromedriver path, resolving it at most once per process"""
+    global _resolved_path
+
+    with _resolve_lock:
+        if _resolved_path:
+            return _resolved_path
+
+        explicit = os.environ.get("CHROMEDRIVER_PATH")
+        if explicit:
+            _resolved_path = explicit
+            return _resolved_path
+
+        offline = is_offline() if offline is None else offline
+        version = get_chrome_version()
+        cache_key = version or "unknown"
+
+        cache = load_cache()
+        entry = cache.get(cache_key)
+        if entry and os.path.exists(entry["path"]):
+            _resolved_path = entry["path"]
+            return _resolved_path
+
+        path = find_local_driver(version) if offline else download_driver()
+        if not path:
+            raise RuntimeError(
+                "No chromedriver found for offline mode. Set CHROMEDRIVER_PATH "
+                "or run once with network access to populate the cache."
+            )
+
+        cache[cache_key] = {
+            "path": path,
+            "resolved_at": time.strftime("%Y-%m-%d %H:%M:%S"),
+        }
+        try:
+            save_cache(cache)
+        except OSError as e:
+            print(f"Could not write driver cache: {e}")
+
+        _resolved_path = path
+        return _resolved_path
+
+
+def chrome_service():
+    """Return a Selenium Service for the resolved chromedriver"""
+    from selenium.webdriver.chrome.service import Service
+    return Service(resolve_chromedriver())
+
+
+if __name__ == "__main__":
+    print(f"Chrome version: {get_chrome_version() or 'unknown'}")
+    print(f"Offline mode: {is_offline()}")
+    print(f"Chromedriver: {resolve_chromedriver()}")
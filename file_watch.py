@@ -0,0 +1,177 @@
+"""
+File watchers shared by watch_checks.py and dev_server.py.
+
+InotifyWatcher blocks on inotify events (Linux only); PollingWatcher
+compares mtimes and sizes on an interval. Both report changed files as
+'/'-separated paths relative to their root, can be limited to some
+extensions, and watch the directories listed in `recursive` together
+with every directory below them, including ones created later. Hidden
+directories and `skip_dirs` are never watched.
+
+    watcher = InotifyWatcher(["", "js"], extensions=(".html", ".js"), recursive=["js"])
+    changed = watcher.wait(timeout=0.5)   # set() after the timeout
+"""
+import os
+import sys
+import time
+import struct
+import select
+from stat import S_ISREG
+import ctypes
+import ctypes.util
+
+SITE_ROOT = os.path.dirname(os.path.abspath(__file__))
+DEBOUNCE_SECONDS = 0.1
+
+# inotify constants from <sys/inotify.h>
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_IGNORED = 0x00008000
+IN_ISDIR = 0x40000000
+EVENT_HEADER = struct.Struct("iIII")
+
+
+def walk(top, skip_dirs=()):
+    """Yield (directory, file names) for top and every directory below it that is not hidden or skipped"""
+    for path, dirs, files in os.walk(top):
+        dirs[:] = [d for d in dirs if not d.startswith(".") and d not in skip_dirs]
+        yield path, files
+
+
+class InotifyWatcher:
+    """Block on inotify events for the watched directories"""
+
+    MASK = IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE | IN_DELETE | IN_MODIFY
+
+    def __init__(self, dirs, extensions=None, recursive=(), root=SITE_ROOT, skip_dirs=()):
+        self.extensions = extensions
+        self.root = root
+        self.skip_dirs = skip_dirs
+        if not sys.platform.startswith("linux"):
+            raise OSError("inotify is only available on Linux")
+        self.libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self.fd = self.libc.inotify_init1(os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+
+        self.dirs = {}  # wd -> directory
+        self.recursive = set()  # directories whose new subdirectories get watched
+        for directory in dirs:
+            self._add(os.path.join(root, directory), directory in recursive)
+
+    def _relpath(self, path):
+        return os.path.relpath(path, self.root).replace(os.sep, "/")
+
+    def _add(self, full_path, recursive):
+        """Watch a directory, and with recursive every directory below it; return the files found below it"""
+        files = []
+        for path, names in walk(full_path, self.skip_dirs) if recursive else [(full_path, [])]:
+            wd = self.libc.inotify_add_watch(self.fd, path.encode(), self.MASK)
+            if wd < 0:
+                raise OSError(ctypes.get_errno(), f"inotify_add_watch failed for {path}")
+            self.dirs[wd] = path
+            if recursive:
+                self.recursive.add(path)
+            files += [os.path.join(path, name) for name in names]
+        return files
+
+    def _read_events(self):
+        changed = set()
+        data = os.read(self.fd, 65536)
+        offset = 0
+        while offset < len(data):
+            wd, mask, cookie, length = EVENT_HEADER.unpack_from(data, offset)
+            offset += EVENT_HEADER.size
+            name = data[offset:offset + length].rstrip(b"\0").decode(errors="replace")
+            offset += length
+            if mask & IN_IGNORED:
+                self.dirs.pop(wd, None)
+                continue
+            if wd not in self.dirs:
+                continue
+            path = os.path.join(self.dirs[wd], name)
+            if mask & IN_ISDIR:
+                # A directory created or moved in below a recursive one: watch it and report its files
+                if (mask & (IN_CREATE | IN_MOVED_TO) and self.dirs[wd] in self.recursive
+                        and not name.startswith(".") and name not in self.skip_dirs):
+                    try:
+                        paths = self._add(path, True)
+                    except OSError:
+                        continue
+                    changed |= {self._relpath(p) for p in paths
+                                if self.extensions is None or p.endswith(self.extensions)}
+                continue
+            if self.extensions is None or name.endswith(self.extensions):
+                changed.add(self._relpath(path))
+        return changed
+
+    def wait(self, timeout=None):
+        """Block until something changes; return the changed paths (empty after timeout seconds)"""
+        while True:
+            if not select.select([self.fd], [], [], timeout)[0]:
+                return set()
+            changed = self._read_events()
+            # Editors write in several steps, collect the whole save
+            while select.select([self.fd], [], [], DEBOUNCE_SECONDS)[0]:
+                changed |= self._read_events()
+            if changed:
+                return changed
+
+    def close(self):
+        os.close(self.fd)
+
+
+class PollingWatcher:
+    """Compare mtimes and sizes of the watched files on an interval"""
+
+    def __init__(self, dirs, interval=1.0, extensions=None, recursive=(), root=SITE_ROOT, skip_dirs=()):
+        self.dirs = dirs
+        self.interval = interval
+        self.extensions = extensions
+        self.recursive = recursive
+        self.root = root
+        self.skip_dirs = skip_dirs
+        self.state = self._snapshot()
+
+    def _snapshot(self):
+        state = {}
+        for directory in self.dirs:
+            full_dir = os.path.join(self.root, directory)
+            if directory in self.recursive:
+                listing = [os.path.join(path, name) for path, names in walk(full_dir, self.skip_dirs)
+                           for name in names]
+            else:
+                try:
+                    listing = [os.path.join(full_dir, name) for name in os.listdir(full_dir)]
+                except OSError:
+                    continue
+            for path in listing:
+                if self.extensions is None or path.endswith(self.extensions):
+                    try:
+                        stat = os.stat(path)
+                    except OSError:
+                        continue
+                    if not S_ISREG(stat.st_mode):
+                        continue
+                    state[os.path.relpath(path, self.root).replace(os.sep, "/")] = (stat.st_mtime_ns, stat.st_size)
+        return state
+
+    def wait(self, timeout=None):
+        """Sleep until something changes; return the changed paths (empty after timeout seconds)"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            if deadline is not None and time.monotonic() >= deadline:
+                return set()
+            time.sleep(self.interval if deadline is None else min(self.interval, max(0, deadline - time.monotonic())))
+            state = self._snapshot()
+            changed = {path for path in state.keys() | self.state.keys()
+                       if state.get(path) != self.state.get(path)}
+            self.state = state
+            if changed:
+                return changed
+
+    def close(self):
+        pass
@@ -1,18 +1,113 @@
+"""
+Render social sharing (Open Graph) cards.
+
+Cards come from a JSON or YAML manifest (--manifest), or default to the
+three site images below. A manifest is either a list of cards or an
+object with "defaults" applied to every card and a "cards" list:
+
+    {"defaults": {"bg_color": "#1a237e", "size": [1200, 630]},
+     "cards": [{"text": "About SoftAIDev", "output": "images/og/about.jpg"}]}
+
+Card keys: text, output, bg_color, text_color, size, font, font_size.
+Fonts are loaded once per (path, size) and blank canvases once per
+(size, color) in each worker process, and cards render in a process pool.
+Cards whose inputs are unchanged are skipped through the build cache.
+Identical cards are rendered once, and every output is published through
+the build cache's object store, so identical images share one blob and
+files that already hold the rendered bytes are not rewritten.
+"""
 from PIL import Image, ImageDraw, ImageFont
 import os
+import json
+import argparse
+from concurrent.futures import ProcessPoolExecutor
 
-def create_social_image(text, output_path, bg_color=(26, 35, 126), text_color=(255, 255, 255), size=(1200, 630)):
-    """Create a social sharing image with the given text and styling."""
-    # Create a new image with the specified background color
-    image = Image.new('RGB', size, color=bg_color)
+from build_cache import BuildCache, add_cache_arguments, font_fingerprint
+from image_variants import build_variants, encode_image
+
+BG_COLOR = (26, 35, 126)
+TEXT_COLOR = (255, 255, 255)
+SIZE = (1200, 630)
+FONT = "Montserrat-Bold.ttf"
+FONT_SIZE = 48
+
+SOCIAL_IMAGES = [
+    # Main social sharing image
+    ("SoftAIDev - AI-Powered Software Solutions", "images/softaidev-social.jpg"),
+    # Blog preview image
+    ("SoftAIDev Blog - Latest in AI & Development", "images/blog-preview.jpg"),
+    # Services preview image
+    ("Our Services - AI Development & Consulting", "images/services-preview.jpg"),
+]
+
+CARD_DEFAULTS = {
+    "bg_color": BG_COLOR,
+    "text_color": TEXT_COLOR,
+    "size": SIZE,
+    "font": FONT,
+    "font_size": FONT_SIZE,
+}
+
+# Per-process caches, filled lazily in each worker
+_fonts = {}
+_canvases = {}
+
+def load_font(path=FONT, size=FONT_SIZE):
+    """Return the font for (path, size), loading it only once per process."""
+    key = (path, size)
+    if key not in _fonts:
+        # Try to use the font, fall back to default if not available
+        try:
+            _fonts[key] = ImageFont.truetype(path, size)
+        except IOError:
+            _fonts[key] = ImageFont.load_default()
+    return _fonts[key]
+
+def blank_canvas(size, bg_color):
+    """Return a fresh copy of a solid canvas, creating it only once per (size, color)."""
+    key = (size, bg_color)
+    if key not in _canvases:
+        _canvases[key] = Image.new('RGB', size, color=bg_color)
+    return _canvases[key].copy()
+
+def _color(value):
+    # JSON and YAML give lists, PIL wants tuples (or color strings such as "#1a237e")
+    return tuple(value) if isinstance(value, list) else value
+
+def normalize_card(card, defaults=None):
+    """Fill in the defaults of a card and convert its values for PIL."""
+    merged = {**CARD_DEFAULTS, **(defaults or {}), **card}
+    missing = [key for key in ("text", "output") if not merged.get(key)]
+    if missing:
+        raise ValueError(f"Card {card!r} is missing {', '.join(missing)}")
+    merged["bg_color"] = _color(merged["bg_color"])
+    merged["text_color"] = _color(merged["text_color"])
+    merged["size"] = tuple(merged["size"])
+    return merged
+
+def load_manifest(path):
+    """Read the cards of a JSON or YAML manifest."""
+    with open(path, "r", encoding="utf-8") as f:
+        if path.endswith((".yml", ".yaml")):
+            try:
+                import yaml
+            except ImportError:
+                raise SystemExit("❌ PyYAML is required for YAML manifests (pip install pyyaml)")
+            data = yaml.safe_load(f)
+        else:
+            data = json.load(f)
+    if isinstance(data, list):
+        data = {"cards": data}
+    defaults = data.get("defaults", {})
+    return [normalize_card(card, defaults) for card in data.get("cards", [])]
+
+def render_card(card):
+    """Render one normalized card; return the encoded bytes for its output format."""
+    image = blank_canvas(card["size"], card["bg_color"])
     draw = ImageDraw.Draw(image)
-    
-    # Try to use Montserrat font, fall back to default if not available
-    try:
-        font_size = 48
-        font = ImageFont.truetype("Montserrat-Bold.ttf", font_size)
-    except IOError:
-        font = ImageFont.load_default()
+    font = load_font(card["font"], card["font_size"])
+    text = card["text"]
+    size = card["size"]
     
     # Calculate text position (centered)
     text_bbox = draw.textbbox((0, 0), text, font=font)
@@ -22,36 +117,80 @@ def create_social_image(text, output_path, bg_color=(26, 35, 126), text_color=(2
     y = (size[1] - text_height) / 2
     
     # Draw the text
-    draw.text((x, y), text, font=font, fill=text_color)
-    
-    # Add a subtle pattern or gradient (optional)
-    # For now, we'll keep it simple with a solid color
+    draw.text((x, y), text, font=font, fill=card["text_color"])
     
-    # Save the image
-    image.save(output_path)
+    return encode_image(image, card["output"])
+
+def create_social_image(text, output_path, bg_color=BG_COLOR, text_color=TEXT_COLOR, size=SIZE):
+    """Create a social sharing image with the given text and styling."""
+    data = render_card(normalize_card({"text": text, "output": output_path, "bg_color": bg_color,
+                                       "text_color": text_color, "size": size}))
+    BuildCache().publish(output_path, data)
     print(f"Created social image: {output_path}")
 
-def main():
-    # Create images directory if it doesn't exist
-    os.makedirs("images", exist_ok=True)
-    
-    # Create main social sharing image
-    create_social_image(
-        "SoftAIDev - AI-Powered Software Solutions",
-        "images/softaidev-social.jpg"
-    )
-    
-    # Create blog preview image
-    create_social_image(
-        "SoftAIDev Blog - Latest in AI & Development",
-        "images/blog-preview.jpg"
-    )
+def card_inputs(card, cache):
+    """Build cache inputs of a card: its settings, the font file and this script."""
+    inputs = {key: value for key, value in card.items() if key != "output"}
+    inputs["font"] = font_fingerprint(card["font"])
+    inputs["source"] = cache.file_hash(__file__)
+    return inputs
+
+def render_cards(cards, workers=None, cache=None):
+    """Render cards in a process pool, skipping those the build cache knows; return the written outputs."""
+    cache = cache or BuildCache()
+    pending = {}  # inputs digest -> cards that render to the same bytes
+    for card in cards:
+        inputs = card_inputs(card, cache)
+        if cache.is_fresh(f"social:{card['output']}", inputs, [card["output"]]):
+            cache.count(hit=True)
+            print(f"Social image up to date: {card['output']}")
+        else:
+            # The output format is part of the bytes, so it is part of the key
+            extension = os.path.splitext(card["output"])[1].lower()
+            pending.setdefault(cache.inputs_digest([inputs, extension]), []).append(card)
+
+    unique = [group[0] for group in pending.values()]
+    if workers == 1 or len(unique) < 2:
+        rendered = list(map(render_card, unique))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            rendered = list(executor.map(render_card, unique))
+
+    written = []
+    for group, data in zip(pending.values(), rendered):
+        for card in group:
+            if cache.publish(card["output"], data):
+                written.append(card["output"])
+                print(f"Created social image: {card['output']}")
+            else:
+                print(f"Social image unchanged: {card['output']}")
+            cache.record(f"social:{card['output']}", card_inputs(card, cache), [card["output"]])
+            cache.count(hit=False)
+    return written
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate the social sharing images")
+    parser.add_argument("--manifest", metavar="PATH",
+                        help="JSON or YAML manifest of cards (default: the three site images)")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="worker processes (default: one per CPU)")
+    parser.add_argument("--variants", action="store_true",
+                        help="also build the responsive variants of the images (image_variants.py)")
+    add_cache_arguments(parser)
+    args = parser.parse_args(argv)
+
+    if args.manifest:
+        cards = load_manifest(args.manifest)
+    else:
+        cards = [normalize_card({"text": text, "output": output_path}) for text, output_path in SOCIAL_IMAGES]
     
-    # Create services preview image
-    create_social_image(
-        "Our Services - AI Development & Consulting",
-        "images/services-preview.jpg"
-    )
+    # Skip images whose text, styling, font and generator code are unchanged
+    cache = BuildCache(force=args.force)
+    render_cards(cards, args.workers, cache)
+    if args.variants:
+        build_variants([card["output"] for card in cards], cache=cache)
+    cache.save()
+    cache.print_stats()
 
 if __name__ == "__main__":
     main()
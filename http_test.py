@@ -1,7 +1,8 @@
 import os
-import requests
 from dotenv import load_dotenv
 
+from supabase_http import supabase_session
+
 def test_supabase_http():
     # Load environment variables
     load_dotenv()
@@ -13,25 +14,21 @@ def test_supabase_http():
         print("❌ Missing Supabase URL or API key in .env file")
         return
         
-    # Test REST API endpoint
+    # Test REST API endpoint; the session sends the API key headers and reuses one connection
     endpoint = f"{url}/rest/v1/"
-    headers = {
-        'apikey': key,
-        'Authorization': f'Bearer {key}'
-    }
+    session = supabase_session(url, key)
     
     print(f"Testing connection to: {endpoint}")
     
     try:
-        response = requests.get(endpoint, headers=headers)
+        response = session.get("/rest/v1/")
         print(f"Status Code: {response.status_code}")
         
         if response.status_code == 200:
             print("✅ Successfully connected to Supabase")
             
             # Test a simple query
-            table_endpoint = f"{url}/rest/v1/purchases?select=*&limit=1"
-            response = requests.get(table_endpoint, headers=headers)
+            response = session.get("/rest/v1/purchases", params={"select": "*", "limit": 1})
             
             if response.status_code == 200:
                 data = response.json()
@@ -48,6 +45,9 @@ def test_supabase_http():
             
     except Exception as e:
         print(f"❌ Connection error: {str(e)}")
+    finally:
+        session.print_timings()
+        session.close()
 
 if __name__ == "__main__":
     test_supabase_http()
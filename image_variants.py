@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+"""
+Responsive image variants for the generated images.
+
+Every source image is resized to each width in WIDTHS that is not wider
+than the source, plus the source width itself, and saved as a progressive,
+optimized JPEG, as WebP and, when Pillow was built with it, as AVIF:
+
+    images/variants/blog-preview-800.webp
+
+images/variants/manifest.json lists the variants of every source with a
+ready-made srcset per MIME type, for example:
+
+    "images/blog-preview.jpg": {
+        "width": 1200, "height": 630,
+        "srcset": {"image/webp": "images/variants/blog-preview-400.webp 400w, ...", ...},
+        "variants": [{"path": ..., "type": "image/webp", "width": 400, "bytes": 9120}, ...]}
+
+Sources render in a process pool, and byte-identical sources render
+once. Variants are published through the build cache (build_cache.py),
+so identical variants are stored once, and a variant file that already
+holds its bytes is not rewritten. A source whose bytes, the settings
+and this script are unchanged is skipped, and deleted variants are
+restored from the store.
+
+Usage:
+    python image_variants.py                       # every image in images/
+    python image_variants.py images/blog-preview.jpg
+    python image_variants.py --widths 480 960 --force
+"""
+import io
+import os
+import sys
+import glob
+import json
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+
+from PIL import Image, features
+
+from build_cache import BuildCache, add_cache_arguments
+
+SITE_ROOT = os.path.dirname(os.path.abspath(__file__))
+SOURCE_DIR = "images"
+OUTPUT_DIR = os.path.join("images", "variants")
+MANIFEST_NAME = "manifest.json"
+SOURCE_EXTENSIONS = (".jpg", ".jpeg", ".png")
+WIDTHS = [400, 800, 1200]
+
+# format: (extension, MIME type, save options)
+FORMATS = {
+    "jpeg": (".jpg", "image/jpeg", {"quality": 82, "optimize": True, "progressive": True}),
+    "webp": (".webp", "image/webp", {"quality": 80, "method": 6}),
+    "avif": (".avif", "image/avif", {"quality": 60}),
+}
+
+
+def available_formats():
+    """Return the formats this Pillow build can write"""
+    return [name for name in FORMATS if name != "avif" or features.check("avif")]
+
+
+def encode_image(image, path, **options):
+    """Encode an image in the format its path's extension names; return the bytes"""
+    extension = os.path.splitext(path)[1].lower()
+    buffer = io.BytesIO()
+    image.save(buffer, format=Image.registered_extensions()[extension], **options)
+    return buffer.getvalue()
+
+
+def _relpath(path):
+    return os.path.relpath(path, SITE_ROOT).replace(os.sep, "/")
+
+
+def default_sources():
+    paths = glob.glob(os.path.join(SITE_ROOT, SOURCE_DIR, "*"))
+    return sorted(_relpath(p) for p in paths if p.lower().endswith(SOURCE_EXTENSIONS))
+
+
+def target_widths(source_width, widths):
+    """Widths to render: the requested ones narrower than the source, plus the source width"""
+    return sorted({w for w in widths if w < source_width} | {source_width})
+
+
+def plan_variants(source, size, widths, formats, output_dir=OUTPUT_DIR):
+    """Return (path, format, width, height) for every variant of a source"""
+    stem = os.path.splitext(os.path.basename(source))[0]
+    source_width, source_height = size
+    plan = []
+    for width in target_widths(source_width, widths):
+        height = max(1, round(source_height * width / source_width))
+        for name in formats:
+            path = f"{output_dir}/{stem}-{width}{FORMATS[name][0]}".replace(os.sep, "/")
+            plan.append((path, name, width, height))
+    return plan
+
+
+def render_variants(source, plan):
+    """Resize and encode one source; return the encoded bytes of every planned variant"""
+    variants = []
+    with Image.open(os.path.join(SITE_ROOT, source)) as image:
+        image = image.convert("RGB")
+        resized = {}
+        for path, name, width, height in plan:
+            if width not in resized:
+                resized[width] = image if width == image.width else image.resize((width, height), Image.LANCZOS)
+            variants.append(encode_image(resized[width], path, **FORMATS[name][2]))
+    return variants
+
+
+def publish_variants(cache, plan, variants):
+    """Publish rendered variants through the build cache; return their manifest entries"""
+    entries = []
+    for (path, name, width, height), data in zip(plan, variants):
+        cache.publish(os.path.join(SITE_ROOT, path), data)
+        entries.append({"path": path, "type": FORMATS[name][1], "width": width,
+                        "height": height, "bytes": len(data)})
+    return entries
+
+
+def srcsets(entries):
+    """Group variants into one srcset string per MIME type"""
+    grouped = {}
+    for entry in sorted(entries, key=lambda e: e["width"]):
+        grouped.setdefault(entry["type"], []).append(f"{entry['path']} {entry['width']}w")
+    return {mime: ", ".join(candidates) for mime, candidates in grouped.items()}
+
+
+def load_manifest(path):
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_manifest(path, manifest):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    os.replace(tmp_path, path)
+
+
+def build_variants(sources, widths=WIDTHS, formats=None, workers=None, cache=None, output_dir=OUTPUT_DIR):
+    """Render the variants of every changed source and update the manifest; return the manifest"""
+    formats = formats or available_formats()
+    cache = cache or BuildCache()
+    manifest_path = os.path.join(SITE_ROOT, output_dir, MANIFEST_NAME)
+    manifest = load_manifest(manifest_path)
+    script_hash = cache.file_hash(__file__)
+
+    jobs = []
+    for source in sources:
+        with Image.open(os.path.join(SITE_ROOT, source)) as image:
+            size = image.size
+        plan = plan_variants(source, size, widths, formats, output_dir)
+        outputs = [os.path.join(SITE_ROOT, path) for path, _, _, _ in plan]
+        inputs = {"source": cache.file_hash(os.path.join(SITE_ROOT, source)), "widths": widths,
+                  "formats": formats, "settings": {name: FORMATS[name] for name in formats},
+                  "script": script_hash}
+        if source in manifest and cache.is_fresh(f"variants:{source}", inputs, outputs):
+            cache.count(hit=True)
+            print(f"ℹ️  Variants up to date: {source}")
+        else:
+            jobs.append((source, size, plan, inputs, outputs))
+
+    # Byte-identical sources render once; their variants share stored blobs
+    renders = {}
+    for source, _, plan, inputs, _ in jobs:
+        renders.setdefault(inputs["source"], (source, plan))
+    if workers == 1 or len(renders) < 2:
+        rendered = [render_variants(source, plan) for source, plan in renders.values()]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            rendered = list(executor.map(render_variants, *zip(*renders.values())))
+    rendered = dict(zip(renders, rendered))
+
+    for source, size, plan, inputs, outputs in jobs:
+        entries = publish_variants(cache, plan, rendered[inputs["source"]])
+        cache.record(f"variants:{source}", inputs, outputs)
+        cache.count(hit=False)
+        manifest[source] = {"width": size[0], "height": size[1], "bytes": os.path.getsize(os.path.join(SITE_ROOT, source)),
+                            "variants": entries, "srcset": srcsets(entries)}
+        full_size = ", ".join(f"{e['type'].split('/')[1]} {e['bytes'] / 1024:.1f} KB"
+                              for e in entries if e["width"] == size[0])
+        print(f"✅ {source} ({manifest[source]['bytes'] / 1024:.1f} KB): {len(entries)} variants, "
+              f"at {size[0]}w {full_size}")
+
+    save_manifest(manifest_path, manifest)
+    return manifest
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Build resized WebP/AVIF/JPEG variants and a srcset manifest")
+    parser.add_argument("sources", nargs="*", help="images to process (default: every image in images/)")
+    parser.add_argument("--widths", type=int, nargs="+", default=WIDTHS,
+                        help=f"target widths in pixels (default: {' '.join(map(str, WIDTHS))})")
+    parser.add_argument("--formats", nargs="+", choices=list(FORMATS),
+                        help="formats to write (default: every format Pillow supports here)")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="worker processes (default: one per CPU)")
+    add_cache_arguments(parser)
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    formats = args.formats or available_formats()
+    missing = [name for name in formats if name not in available_formats()]
+    if missing:
+        print(f"❌ This Pillow build cannot write {', '.join(missing)}")
+        return 1
+    if "avif" not in formats and not args.formats:
+        print("⚠ AVIF is not supported by this Pillow build, writing JPEG and WebP only")
+
+    sources = [_relpath(os.path.abspath(p)) for p in args.sources] or default_sources()
+    cache = BuildCache(force=args.force)
+    build_variants(sources, sorted(set(args.widths)), formats, args.workers, cache)
+    cache.save()
+    cache.print_stats()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""
+Test impact selection for the Selenium suites.
+
+Each test module is scanned for the HTML pages it drives and the JSON
+config files it reads, each page for the js/ and css/ files it loads,
+and each JS file for the modules it imports. A test class is affected by a change when any file in that
+closure (or the test module itself) changed. Changes to the shared test
+infrastructure affect every class.
+
+Usage:
+    python impact_map.py                 # print the dependency map
+    python impact_map.py FILE [FILE...]  # print the classes affected by FILEs
+"""
+import os
+import re
+import sys
+import inspect
+import subprocess
+from html.parser import HTMLParser
+from urllib.parse import urlparse
+
+SITE_ROOT = os.path.dirname(os.path.abspath(__file__))
+
+# Changing any of these can affect every browser test
+SHARED_FILES = {
+    "run_all_tests.py",
+    "driver_pool.py",
+    "driver_resolver.py",
+    "browser_profile.py",
+    "page_waits.py",
+    "dev_server.py",
+    "timing_report.py",
+    "impact_map.py",
+    "test-requirements.txt",
+}
+
+PAGE_PATTERN = re.compile(r"([\w-]+\.html)")
+CONFIG_PATTERN = re.compile(r"([\w./-]+\.json)")
+JS_IMPORT_PATTERN = re.compile(
+    r"""(?:import\s+(?:[^'"]*?\s+from\s+)?|import\s*\(\s*)['"]([^'"]+)['"]"""
+)
+
+
+class AssetParser(HTMLParser):
+    """Collect the script and stylesheet references of a page"""
+
+    def __init__(self):
+        super().__init__()
+        self.assets = []
+
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+        if tag == "script" and attrs.get("src"):
+            self.assets.append(attrs["src"])
+        elif tag == "link" and attrs.get("href"):
+            self.assets.append(attrs["href"])
+
+
+def _is_local(reference):
+    parsed = urlparse(reference)
+    return not parsed.scheme and not parsed.netloc and parsed.path
+
+
+def _normalize(path, base_dir=""):
+    """Turn a reference into a path relative to the site root"""
+    path = urlparse(path).path
+    if path.startswith("/"):
+        full = os.path.join(SITE_ROOT, path.lstrip("/"))
+    else:
+        full = os.path.join(SITE_ROOT, base_dir, path)
+    return os.path.relpath(os.path.normpath(full), SITE_ROOT).replace(os.sep, "/")
+
+
+def _referenced_files(module_path, pattern):
+    """Return the existing site files a test module names that match pattern"""
+    with open(module_path, "r", encoding="utf-8") as f:
+        source = f.read()
+    files = set()
+    for name in pattern.findall(source):
+        if os.path.isfile(os.path.join(SITE_ROOT, name)):
+            files.add(_normalize(name))
+    return files
+
+
+def pages_for_module(module_path):
+    """Return the site pages a test module refers to"""
+    return _referenced_files(module_path, PAGE_PATTERN)
+
+
+def configs_for_module(module_path):
+    """Return the JSON config files a test module reads, such as email-config.json"""
+    return _referenced_files(module_path, CONFIG_PATTERN)
+
+
+def page_assets(page):
+    """Return the local files a page loads"""
+    parser = AssetParser()
+    with open(os.path.join(SITE_ROOT, page), "r", encoding="utf-8") as f:
+        parser.feed(f.read())
+
+    base_dir = os.path.dirname(page)
+    return {_normalize(ref, base_dir) for ref in parser.assets if _is_local(ref)}
+
+
+def js_imports(js_file, seen=None):
+    """Return js_file plus every local module it imports, transitively"""
+    seen = set() if seen is None else seen
+    if js_file in seen or not os.path.exists(os.path.join(SITE_ROOT, js_file)):
+        return seen
+    seen.add(js_file)
+
+    with open(os.path.join(SITE_ROOT, js_file), "r", encoding="utf-8") as f:
+        source = f.read()
+    for reference in JS_IMPORT_PATTERN.findall(source):
+        if _is_local(reference):
+            js_imports(_normalize(reference, os.path.dirname(js_file)), seen)
+    return seen
+
+
+def dependencies_for_class(test_class):
+    """Return every site file a test class depends on"""
+    module_path = inspect.getsourcefile(test_class)
+    files = {os.path.relpath(module_path, SITE_ROOT).replace(os.sep, "/")}
+    files |= configs_for_module(module_path)
+
+    for page in pages_for_module(module_path):
+        files.add(page)
+        for asset in page_assets(page):
+            if asset.endswith(".js"):
+                files |= js_imports(asset)
+            else:
+                files.add(asset)
+    return files
+
+
+def class_id(test_class):
+    return f"{test_class.__module__}.{test_class.__name__}"
+
+
+def build_map(test_classes):
+    """Return {class id: set of files} for the given test classes"""
+    return {class_id(cls): dependencies_for_class(cls) for cls in test_classes}
+
+
+def select_affected(test_classes, changed_files):
+    """Return the test classes affected by the changed files, in order"""
+    changed = {path.replace(os.sep, "/").removeprefix("./") for path in changed_files}
+    if changed & SHARED_FILES:
+        return list(test_classes)
+
+    dependency_map = build_map(test_classes)
+    return [cls for cls in test_classes if dependency_map[class_id(cls)] & changed]
+
+
+def changed_files_since(ref="HEAD"):
+    """Return files changed relative to a git ref, plus untracked files"""
+    def git(*args):
+        result = subprocess.run(
+            ["git", *args], cwd=SITE_ROOT, capture_output=True, text=True, check=True
+        )
+        return [line for line in result.stdout.splitlines() if line]
+
+    return sorted(set(
+        git("diff", "--name-only", ref) +
+        git("ls-files", "--others", "--exclude-standard")
+    ))
+
+
+if __name__ == "__main__":
+    from run_all_tests import TEST_CLASSES
+
+    if len(sys.argv) > 1:
+        for cls in select_affected(TEST_CLASSES, sys.argv[1:]):
+            print(class_id(cls))
+    else:
+        for name, files in build_map(TEST_CLASSES).items():
+            print(name)
+            for path in sorted(files):
+                print(f"  {path}")
@@ -0,0 +1,331 @@
+#!/usr/bin/env python3
+"""
+Site-wide link and asset checker.
+
+Parses every *.html page in a thread pool and resolves each href, src,
+srcset and social image meta tag, plus every sitemap.xml <loc>, against
+the tree. Fragments on links to other pages (page.html#id) are checked
+against the ids in the site index; same-page "#x" links are left alone
+because the dashboards route them in JS. URLs on the published site
+(CNAME and the GitHub Pages URL) count as internal. Files under css/,
+js/ and images/ and root pages that nothing links to, and that no script
+mentions, are reported as orphans.
+
+External URLs are only checked with --external. Each unique URL gets
+one HEAD request (falling back to GET when HEAD is refused), and HTTP
+responses are cached in .test-cache/link-cache.json for --ttl seconds.
+Network errors are reported but not cached.
+
+Usage:
+    python link_checker.py                 # local links only
+    python link_checker.py --external      # also check external URLs
+    python link_checker.py --no-orphans    # skip the orphan report
+"""
+import os
+import re
+import sys
+import json
+import glob
+import time
+import argparse
+import urllib.error
+import urllib.request
+import xml.etree.ElementTree as ET
+from html.parser import HTMLParser
+from urllib.parse import urlparse, unquote
+from concurrent.futures import ThreadPoolExecutor
+
+from impact_map import js_imports
+from site_index import get_index
+
+SITE_ROOT = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_CACHE_FILE = os.path.join(SITE_ROOT, ".test-cache", "link-cache.json")
+DEFAULT_TTL = 24 * 60 * 60
+SITE_PREFIXES = ["https://hotwodi.github.io/softaidev/"]
+SKIPPED_SCHEMES = ("mailto:", "tel:", "javascript:", "data:", "sms:")
+ASSET_DIRS = ["css", "js", "images"]
+LINK_ATTRIBUTES = {"href", "src", "srcset", "poster", "data-src"}
+META_LINKS = {"og:image", "og:url", "twitter:image"}
+HINT_RELS = {"preconnect", "dns-prefetch"}
+PAGE_MENTION_PATTERN = re.compile(r"([\w-]+\.html)\b")
+USER_AGENT = "softaidev-link-checker"
+
+
+class LinkParser(HTMLParser):
+    """Collect (line, attribute, value) for every link-like attribute"""
+
+    def __init__(self):
+        super().__init__()
+        self.links = []
+
+    def handle_starttag(self, tag, attrs):
+        line = self.getpos()[0]
+        if tag == "meta":
+            attributes = dict(attrs)
+            if (attributes.get("property") or attributes.get("name")) in META_LINKS and attributes.get("content"):
+                self.links.append((line, "content", attributes["content"].strip()))
+            return
+        if tag == "link" and HINT_RELS & set((dict(attrs).get("rel") or "").split()):
+            return
+        for name, value in attrs:
+            if name not in LINK_ATTRIBUTES or not value:
+                continue
+            if name == "srcset":
+                for candidate in value.split(","):
+                    if candidate.strip():
+                        self.links.append((line, name, candidate.split()[0]))
+            else:
+                self.links.append((line, name, value.strip()))
+
+
+def site_prefixes():
+    """Return the URL prefixes that point back into this site"""
+    prefixes = list(SITE_PREFIXES)
+    cname = os.path.join(SITE_ROOT, "CNAME")
+    if os.path.exists(cname):
+        with open(cname, "r", encoding="utf-8") as f:
+            domain = f.read().strip()
+        if domain:
+            prefixes += [f"https://{domain}/", f"http://{domain}/", f"https://www.{domain}/"]
+    return prefixes
+
+
+def parse_links(page):
+    """Return the links of one page and the page names its text mentions"""
+    parser = LinkParser()
+    with open(os.path.join(SITE_ROOT, page), "r", encoding="utf-8", errors="replace") as f:
+        text = f.read()
+    parser.feed(text)
+    return page, parser.links, set(PAGE_MENTION_PATTERN.findall(text))
+
+
+def sitemap_links():
+    """Return the <loc> entries of sitemap.xml as (line, attribute, url) tuples"""
+    path = os.path.join(SITE_ROOT, "sitemap.xml")
+    if not os.path.exists(path):
+        return []
+    links = []
+    for element in ET.parse(path).iter():
+        if element.tag.endswith("loc") and element.text:
+            links.append((0, "loc", element.text.strip()))
+    return links
+
+
+def classify(url, base_dir, prefixes):
+    """Return ("skip", None), ("external", url) or ("internal", (path, fragment))"""
+    if not url or url.startswith(SKIPPED_SCHEMES) or "${" in url or "{{" in url:
+        return "skip", None
+
+    for prefix in prefixes:
+        if url.startswith(prefix):
+            url = "/" + url[len(prefix):]
+            break
+    else:
+        parsed = urlparse(url)
+        if parsed.scheme or url.startswith("//"):
+            return ("external", url) if parsed.scheme in ("http", "https", "") else ("skip", None)
+
+    parsed = urlparse(url)
+    path = unquote(parsed.path)
+    if not path:
+        target = None  # same-page fragment
+    elif path.startswith("/"):
+        target = os.path.normpath(path.lstrip("/") or ".")
+    else:
+        target = os.path.normpath(os.path.join(base_dir, path))
+    if target is not None:
+        target = target.replace(os.sep, "/")
+        if os.path.isdir(os.path.join(SITE_ROOT, target)):
+            target = "index.html" if target == "." else f"{target}/index.html"
+    return "internal", (target, parsed.fragment)
+
+
+class LinkCache:
+    """External URL results with a time-to-live"""
+
+    def __init__(self, path=DEFAULT_CACHE_FILE, ttl=DEFAULT_TTL):
+        self.path = path
+        self.ttl = ttl
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                self.entries = json.load(f)
+        except (OSError, ValueError):
+            self.entries = {}
+
+    def get(self, url):
+        entry = self.entries.get(url)
+        if entry and time.time() - entry["checked"] < self.ttl:
+            return entry
+        return None
+
+    def put(self, url, ok, status):
+        self.entries[url] = {"ok": ok, "status": status, "checked": time.time()}
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.entries, f, indent=1)
+        os.replace(tmp_path, self.path)
+
+
+def check_external(url, timeout=10):
+    """Return (ok, status) for an external URL; status is an HTTP code or an error string"""
+    if url.startswith("//"):
+        url = "https:" + url
+    for method in ("HEAD", "GET"):
+        request = urllib.request.Request(url, method=method, headers={"User-Agent": USER_AGENT})
+        try:
+            with urllib.request.urlopen(request, timeout=timeout) as response:
+                return response.status < 400, response.status
+        except urllib.error.HTTPError as e:
+            if method == "HEAD" and e.code in (403, 405, 501):
+                continue
+            return e.code < 400, e.code
+        except (urllib.error.URLError, OSError) as e:
+            return False, str(getattr(e, "reason", e))
+    return False, "unreachable"
+
+
+def check_site(external=False, workers=8, ttl=DEFAULT_TTL, orphans=True):
+    """Check every link; return (broken, orphan files, stats)"""
+    start = time.perf_counter()
+    pages = sorted(os.path.relpath(p, SITE_ROOT).replace(os.sep, "/")
+                   for p in glob.glob(os.path.join(SITE_ROOT, "*.html")))
+    prefixes = site_prefixes()
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        parsed = list(executor.map(parse_links, pages))
+    parsed.append(("sitemap.xml", sitemap_links(), set()))
+
+    index = get_index()
+    broken = []
+    referenced = set()
+    external_urls = {}  # url -> [(source, line)]
+    internal_results = {}
+    link_count = 0
+
+    mentioned = set()
+    for source, links, mentions in parsed:
+        mentioned |= mentions
+        base_dir = os.path.dirname(source)
+        for line, attribute, url in links:
+            link_count += 1
+            kind, target = classify(url, base_dir, prefixes)
+            if kind == "external":
+                external_urls.setdefault(url, []).append((source, line))
+                continue
+            if kind == "skip":
+                continue
+
+            path, fragment = target
+            if path is None:
+                continue  # same-page fragment
+            key = (path, fragment)
+            if key not in internal_results:
+                if not os.path.isfile(os.path.join(SITE_ROOT, path)):
+                    internal_results[key] = "missing file"
+                elif fragment and path.endswith(".html") and not index.has_id(path, fragment):
+                    internal_results[key] = f"no element with id '{fragment}'"
+                else:
+                    internal_results[key] = None
+            referenced.add(path)
+            if internal_results[key]:
+                broken.append((source, line, url, internal_results[key]))
+
+    external_checked = 0
+    if external and external_urls:
+        cache = LinkCache(ttl=ttl)
+        results = {url: cache.get(url) for url in external_urls}
+        pending = [url for url, entry in results.items() if not entry]
+        with ThreadPoolExecutor(max_workers=workers * 2) as executor:
+            for url, (ok, status) in zip(pending, executor.map(check_external, pending)):
+                results[url] = {"ok": ok, "status": status}
+                if isinstance(status, int):
+                    cache.put(url, ok, status)
+        cache.save()
+        external_checked = len(pending)
+        for url, sources in external_urls.items():
+            entry = results[url]
+            if not entry["ok"]:
+                status = entry["status"]
+                reason = f"HTTP {status}" if isinstance(status, int) else status
+                for source, line in sources:
+                    broken.append((source, line, url, reason))
+
+    orphan_files = find_orphans(referenced | mentioned, pages) if orphans else []
+    stats = {
+        "pages": len(pages),
+        "links": link_count,
+        "internal": len(internal_results),
+        "external": len(external_urls),
+        "external_checked": external_checked,
+        "seconds": time.perf_counter() - start,
+    }
+    return broken, orphan_files, stats
+
+
+def find_orphans(referenced, pages):
+    """Return site files nothing links to (JS imported by linked JS counts as linked)"""
+    reachable = set(referenced)
+    for path in referenced:
+        if path.endswith(".js"):
+            reachable |= js_imports(path)
+
+    # Pages that scripts redirect to are reachable too
+    for path in glob.glob(os.path.join(SITE_ROOT, "js", "**", "*.js"), recursive=True):
+        with open(path, "r", encoding="utf-8", errors="replace") as f:
+            reachable |= set(PAGE_MENTION_PATTERN.findall(f.read()))
+
+    candidates = set(pages)
+    for directory in ASSET_DIRS:
+        for path in glob.glob(os.path.join(SITE_ROOT, directory, "**", "*"), recursive=True):
+            if os.path.isfile(path):
+                candidates.add(os.path.relpath(path, SITE_ROOT).replace(os.sep, "/"))
+    candidates.discard("index.html")
+    return sorted(candidates - reachable)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Check every link, asset and sitemap entry of the site")
+    parser.add_argument("--external", action="store_true",
+                        help="also check external URLs with HEAD requests")
+    parser.add_argument("--ttl", type=int, default=DEFAULT_TTL, metavar="SECONDS",
+                        help=f"how long external results stay cached (default: {DEFAULT_TTL})")
+    parser.add_argument("--workers", type=int, default=8,
+                        help="threads for parsing pages and checking URLs (default: 8)")
+    parser.add_argument("--no-orphans", action="store_true",
+                        help="do not report files that nothing links to")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    broken, orphan_files, stats = check_site(args.external, args.workers, args.ttl, not args.no_orphans)
+
+    print(f"Checked {stats['links']} links on {stats['pages']} pages and sitemap.xml "
+          f"({stats['internal']} unique internal, {stats['external']} unique external) "
+          f"in {stats['seconds']:.2f}s")
+    if args.external:
+        print(f"External URLs requested: {stats['external_checked']} (others from cache)")
+    else:
+        print("External URLs not checked (use --external)")
+
+    if broken:
+        print(f"\n✗ {len(broken)} broken link(s):")
+        for source, line, url, reason in sorted(broken):
+            location = f"{source}:{line}" if line else source
+            print(f"  {location}  {url}  ({reason})")
+    else:
+        print("\n✓ No broken links")
+
+    if orphan_files:
+        print(f"\n⚠ {len(orphan_files)} file(s) nothing links to:")
+        for path in orphan_files:
+            print(f"  {path}")
+
+    return 1 if broken else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
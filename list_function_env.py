@@ -2,6 +2,8 @@ import os
 import requests
 from dotenv import load_dotenv
 
+from supabase_http import management_session
+
 # Load environment variables
 load_dotenv()
 
@@ -16,15 +18,11 @@ def list_function_env():
         return False
     
     # API endpoint
-    url = f"https://api.supabase.com/v1/projects/{project_ref}/functions/send-phone-call/env"
-    
-    headers = {
-        'Authorization': f'Bearer {access_token}',
-        'Content-Type': 'application/json'
-    }
+    url = f"/v1/projects/{project_ref}/functions/send-phone-call/env"
     
     try:
-        response = requests.get(url, headers=headers)
+        with management_session(access_token) as session:
+            response = session.get(url)
         response.raise_for_status()
         
         env_vars = response.json()
@@ -32,6 +30,7 @@ def list_function_env():
         for var in env_vars:
             value = var['value'] if not var.get('is_secret') else '[HIDDEN]'
             print(f"{var['name']} = {value}")
+        session.print_timings()
             
     except requests.exceptions.RequestException as e:
         print(f"Error: {str(e)}")
@@ -0,0 +1,884 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for the Supabase project, for offline and fast testing.
+
+Serves the subset of the Supabase APIs that the site and the Supabase
+test suites use, backed by SQLite:
+
+    /rest/v1/<table>     PostgREST: select (columns, eq/neq/gt/gte/lt/lte/
+                         like/ilike/is/in filters, order, limit, offset),
+                         insert, upsert (on_conflict, merge or ignore
+                         duplicates), update and delete
+    /auth/v1/...         GoTrue: signup, token (password and refresh_token),
+                         logout, user, recover and the admin users API
+    /functions/v1/<name> local ports of the Edge Functions
+
+The tables are created from the CREATE TABLE and CREATE INDEX statements
+in supabase/database-schema.md, plus EXTRA_SCHEMA for the tables the
+site uses but the document does not define. Users live in the same
+database. Recovery and function emails are written to email_queue and
+email_history instead of being sent.
+
+Signed-in users only see their own rows of OWNED_TABLES, and anonymous
+requests for them are refused. The API keys are the well-known keys of
+the Supabase CLI (ANON_KEY, SERVICE_KEY). An apikey's role claim is read
+without checking its signature, so the keys in .env work too; user
+access tokens must be signed by this server. Storage is not emulated.
+Because anyone can mint a service_role apikey, it only listens on
+127.0.0.1 unless --host says otherwise.
+
+Point the suites at it by exporting the variables it prints:
+
+    python local_supabase.py             # http://localhost:54321, in-memory
+    python local_supabase.py --db .test-cache/supabase.sqlite3
+    python local_supabase.py --host 0.0.0.0   # reachable from the LAN, see below
+    SUPABASE_URL=http://localhost:54321 python test_auth_protection.py
+
+The TEST_EMAIL / TEST_PASSWORD user (test@example.com / TestPass123! by
+default) is created at startup unless --no-seed is given.
+"""
+import os
+import re
+import hmac
+import json
+import time
+import uuid
+import base64
+import sqlite3
+import hashlib
+import argparse
+import threading
+import functools
+from datetime import datetime, timezone, timedelta
+from http import HTTPStatus
+from urllib.parse import urlsplit, parse_qsl, urlencode
+from http.server import BaseHTTPRequestHandler
+
+from dev_server import SiteServer
+
+try:
+    from dotenv import load_dotenv
+except ImportError:
+    load_dotenv = None
+
+SITE_ROOT = os.path.dirname(os.path.abspath(__file__))
+SCHEMA_DOC = os.path.join(SITE_ROOT, "supabase", "database-schema.md")
+DEFAULT_PORT = 54321
+TOKEN_LIFETIME = 3600
+PASSWORD_ITERATIONS = 1000  # test passwords only; keeps sign-in in the microseconds
+MIN_PASSWORD_LENGTH = 6
+LOCAL_FROM_EMAIL = "noreply@localhost"
+
+# Secret and API keys of the Supabase CLI's local stack
+JWT_SECRET = "super-secret-jwt-token-with-at-least-32-characters-long"
+ANON_KEY = ("eyJhbGciOiJIUzI1NiIsInR5cCI6IkpXVCJ9.eyJpc3MiOiJzdXBhYmFzZS1kZW1vIiwicm9sZSI6ImFub24iLCJleHAiOjE5ODM4MTI5OTZ9"
+            ".CRXP1A7WOeoJeXxjNni43kdQwgnWNReilDMblYTn_I0")
+SERVICE_KEY = ("eyJhbGciOiJIUzI1NiIsInR5cCI6IkpXVCJ9.eyJpc3MiOiJzdXBhYmFzZS1kZW1vIiwicm9sZSI6InNlcnZpY2Vfcm9sZSIsImV4cCI6MTk4MzgxMjk5Nn0"
+               ".EGIM96RAZx35lJzdJsyH-qQwv8Hdp7fsn3W0YpN81IU")
+
+# Tables the site uses that supabase/database-schema.md does not define
+EXTRA_SCHEMA = """
+CREATE TABLE purchases (
+    id UUID DEFAULT gen_random_uuid() PRIMARY KEY,
+    user_id UUID NOT NULL,
+    app_id TEXT,
+    product_id TEXT,
+    order_id TEXT,
+    purchase_date TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+    expiry_date TIMESTAMP WITH TIME ZONE,
+    status TEXT DEFAULT 'completed',
+    amount NUMERIC DEFAULT 0,
+    currency TEXT DEFAULT 'USD',
+    download_url TEXT,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+);
+"""
+
+AUTH_SCHEMA = """
+CREATE TABLE IF NOT EXISTS auth_users (
+    id TEXT PRIMARY KEY,
+    email TEXT UNIQUE NOT NULL,
+    password_hash TEXT,
+    user_metadata TEXT NOT NULL DEFAULT '{}',
+    app_metadata TEXT NOT NULL DEFAULT '{}',
+    email_confirmed_at TEXT,
+    last_sign_in_at TEXT,
+    created_at TEXT NOT NULL,
+    updated_at TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS auth_refresh_tokens (
+    token TEXT PRIMARY KEY,
+    user_id TEXT NOT NULL,
+    session_id TEXT NOT NULL
+);
+"""
+
+# Tables only signed-in users may use, and the column holding the owner's user id
+OWNED_TABLES = {"purchases": "user_id"}
+
+SQL_TRANSLATIONS = [
+    (re.compile(r"\bCREATE (TABLE|INDEX) (?!IF NOT EXISTS)", re.I), r"CREATE \1 IF NOT EXISTS "),
+    (re.compile(r"\bDEFAULT (\w+\(\))", re.I), r"DEFAULT (\1)"),
+    (re.compile(r"\bTIMESTAMP WITH TIME ZONE\b", re.I), "TEXT"),
+    (re.compile(r"\b(UUID|JSONB?)\b"), "TEXT"),
+]
+JSON_COLUMN_PATTERN = re.compile(r"^\s*(\w+)\s+JSONB?\b", re.I | re.M)
+FILTER_OPERATORS = {"eq": "=", "neq": "<>", "gt": ">", "gte": ">=", "lt": "<", "lte": "<=",
+                    "like": "LIKE", "ilike": "LIKE"}
+LOGOUT_SCOPES = {
+    "global": "user_id = :user_id",
+    "local": "session_id = :session_id",
+    "others": "user_id = :user_id AND session_id <> :session_id",
+}
+RESERVED_PARAMS = {"select", "order", "limit", "offset", "on_conflict", "columns"}
+CORS_HEADERS = {
+    "Access-Control-Allow-Origin": "*",
+    "Access-Control-Allow-Methods": "GET, POST, PUT, PATCH, DELETE, OPTIONS",
+    "Access-Control-Allow-Headers": "authorization, x-client-info, apikey, content-type, prefer, range, accept-profile, content-profile",
+    "Access-Control-Expose-Headers": "Content-Range",
+}
+
+
+class ApiError(Exception):
+    """An error response: HTTP status and the JSON body Supabase would send"""
+
+    def __init__(self, status, payload):
+        super().__init__(payload)
+        self.status = status
+        self.payload = payload
+
+
+def rest_error(status, code, message, hint=None):
+    return ApiError(status, {"code": code, "message": message, "details": None, "hint": hint})
+
+
+def auth_error(status, code, message):
+    return ApiError(status, {"code": status, "error_code": code, "msg": message})
+
+
+def now_iso():
+    return datetime.now(timezone.utc).isoformat()
+
+
+def _b64encode(data):
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode("ascii")
+
+
+def _b64decode(text):
+    return base64.urlsafe_b64decode(text + "=" * (-len(text) % 4))
+
+
+def encode_jwt(claims, secret=JWT_SECRET):
+    """Sign claims as an HS256 JWT"""
+    header = _b64encode(json.dumps({"alg": "HS256", "typ": "JWT"}, separators=(",", ":")).encode())
+    payload = _b64encode(json.dumps(claims, separators=(",", ":")).encode())
+    signature = hmac.new(secret.encode(), f"{header}.{payload}".encode(), hashlib.sha256).digest()
+    return f"{header}.{payload}.{_b64encode(signature)}"
+
+
+def decode_jwt(token, secret=JWT_SECRET, verify=True):
+    """Return the claims of a JWT, or None if it is malformed, wrongly signed or expired"""
+    try:
+        header, payload, signature = token.split(".")
+        claims = json.loads(_b64decode(payload))
+    except (ValueError, AttributeError):
+        return None
+    if not isinstance(claims, dict):
+        return None
+    if verify:
+        expected = hmac.new(secret.encode(), f"{header}.{payload}".encode(), hashlib.sha256).digest()
+        if not hmac.compare_digest(_b64encode(expected), signature):
+            return None
+        if claims.get("exp") and claims["exp"] < time.time():
+            return None
+    return claims
+
+
+def hash_password(password, salt=None):
+    salt = salt or os.urandom(16).hex()
+    digest = hashlib.pbkdf2_hmac("sha256", password.encode(), bytes.fromhex(salt), PASSWORD_ITERATIONS)
+    return f"{salt}${digest.hex()}"
+
+
+def check_password(password, stored):
+    if not stored or "$" not in stored:
+        return False
+    return hmac.compare_digest(hash_password(password, stored.split("$")[0]), stored)
+
+
+def schema_statements(path=SCHEMA_DOC):
+    """Return the CREATE TABLE and CREATE INDEX statements of the schema document and EXTRA_SCHEMA"""
+    with open(path, "r", encoding="utf-8") as f:
+        blocks = re.findall(r"```sql\n(.*?)```", f.read(), re.S)
+    statements = []
+    for sql in blocks + [EXTRA_SCHEMA]:
+        for statement in sql.split(";"):
+            lines = [line for line in statement.strip().splitlines() if not line.lstrip().startswith("--")]
+            statement = "\n".join(lines).strip()
+            if re.match(r"CREATE (TABLE|INDEX)\b", statement, re.I):
+                statements.append(statement)
+    return statements
+
+
+def to_sqlite(statement):
+    """Translate a Postgres CREATE statement to SQLite"""
+    for pattern, replacement in SQL_TRANSLATIONS:
+        statement = pattern.sub(replacement, statement)
+    return statement
+
+
+def quote(name):
+    return '"' + name.replace('"', '""') + '"'
+
+
+class Database:
+    """SQLite database holding the schema's tables and the auth users, shared by all request threads"""
+
+    def __init__(self, path=":memory:"):
+        self.connection = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self.connection.row_factory = sqlite3.Row
+        self.connection.create_function("gen_random_uuid", 0, lambda: str(uuid.uuid4()))
+        self.connection.create_function("now", 0, now_iso)
+        self.lock = threading.Lock()
+        self.tables = {}  # table -> column names
+        self.json_columns = {}
+        self.primary_keys = {}
+
+        with self.lock:
+            self.connection.executescript(AUTH_SCHEMA)
+            for statement in schema_statements():
+                self.connection.execute(to_sqlite(statement))
+                table = re.match(r"CREATE TABLE (\w+)", statement, re.I)
+                if table:
+                    self.json_columns[table.group(1)] = set(JSON_COLUMN_PATTERN.findall(statement))
+            for table in self.json_columns:
+                info = self.connection.execute(f"PRAGMA table_info({quote(table)})").fetchall()
+                self.tables[table] = [column["name"] for column in info]
+                self.primary_keys[table] = [column["name"] for column in sorted(info, key=lambda c: c["pk"]) if column["pk"]]
+
+    def execute(self, sql, parameters=()):
+        """Run one statement and return its rows as dicts"""
+        with self.lock:
+            return [dict(row) for row in self.connection.execute(sql, parameters).fetchall()]
+
+    def decode(self, table, row):
+        for column in self.json_columns.get(table, ()):
+            if isinstance(row.get(column), str):
+                row[column] = json.loads(row[column])
+        return row
+
+    def encode(self, table, column, value):
+        if column in self.json_columns.get(table, ()) and value is not None:
+            return json.dumps(value)
+        if isinstance(value, (dict, list)):
+            return json.dumps(value)
+        return value
+
+
+class Caller:
+    """Who a request comes from: role is anon, authenticated or service_role"""
+
+    def __init__(self, role, user_id=None, session_id=None):
+        self.role = role
+        self.user_id = user_id
+        self.session_id = session_id
+
+
+class LocalSupabase:
+    """The REST, auth and function endpoints on top of a Database"""
+
+    def __init__(self, database, base_url=""):
+        self.db = database
+        self.base_url = base_url
+        self.functions = {
+            "get-download-url": self.get_download_url,
+            "send-email": self.send_email,
+            "send-order-confirmation": self.send_order_confirmation,
+            "receive-email": self.receive_email,
+        }
+
+    # -- identity --------------------------------------------------------
+
+    def identify(self, headers):
+        """Return the Caller for a request from its apikey and Authorization headers"""
+        apikey = headers.get("apikey") or ""
+        authorization = headers.get("Authorization") or ""
+        token = authorization[7:].strip() if authorization.lower().startswith("bearer ") else ""
+        if token and token != apikey:
+            claims = decode_jwt(token)
+            if claims is None:
+                raise rest_error(401, "PGRST301", "JWT could not be verified, or it has expired")
+            if claims.get("sub"):
+                return Caller("authenticated", claims["sub"], claims.get("session_id"))
+            return Caller(claims.get("role", "anon"))
+        claims = decode_jwt(apikey or token, verify=False) or {}
+        return Caller("service_role" if claims.get("role") == "service_role" else "anon")
+
+    # -- PostgREST -------------------------------------------------------
+
+    def rest(self, method, table, query, headers, caller, body):
+        """Handle /rest/v1/<table>; return (status, payload, extra headers)"""
+        if not table:
+            return 200, self.openapi(), {}
+        if table not in self.db.tables:
+            raise rest_error(404, "42P01", f'relation "public.{table}" does not exist')
+        owner = OWNED_TABLES.get(table)
+        if owner and caller.role == "anon":
+            raise rest_error(401, "42501", f"permission denied for table {table}",
+                             "Not authenticated: sign in to use this table")
+
+        params = parse_qsl(query, keep_blank_values=True)
+        prefer = {}
+        for item in (headers.get("Prefer") or "").split(","):
+            key, _, value = item.strip().partition("=")
+            prefer[key] = value
+        where, values = self.filters(table, params)
+        if owner and caller.role == "authenticated":
+            where.append(f"{quote(owner)} = ?")
+            values.append(caller.user_id)
+
+        if method in ("GET", "HEAD"):
+            rows = self.select(table, dict(params), where, values)
+            total = self.count(table, where, values) if prefer.get("count") else None
+            status = 200
+        elif method == "POST":
+            rows = self.insert(table, dict(params), prefer, caller, body)
+            total, status = None, 201
+        elif method == "PATCH":
+            rows = self.update(table, where, values, body)
+            total, status = None, 200
+        elif method == "DELETE":
+            rows = self.delete(table, where, values)
+            total, status = None, 200
+        else:
+            raise rest_error(405, "PGRST117", f"Unsupported HTTP method: {method}")
+
+        rows = [self.db.decode(table, row) for row in rows]
+        if method == "GET" and "select" in dict(params):
+            rows = [{column: row[column] for column in self.columns(table, dict(params)["select"])} for row in rows]
+        offset = int(dict(params).get("offset") or 0)
+        extra = {"Content-Range": f"{offset}-{offset + len(rows) - 1}/{'*' if total is None else total}"
+                 if rows else f"*/{'*' if total is None else total}"}
+
+        if "vnd.pgrst.object" in (headers.get("Accept") or ""):
+            if len(rows) != 1:
+                raise rest_error(406, "PGRST116", "JSON object requested, multiple (or no) rows returned",
+                                 f"The result contains {len(rows)} rows")
+            return status, rows[0], extra
+        if method != "GET" and prefer.get("return") != "representation":
+            return (201 if method == "POST" else 204), None, extra
+        return status, rows, extra
+
+    def openapi(self):
+        definitions = {table: {"type": "object", "properties": {column: {"type": "string"} for column in columns}}
+                       for table, columns in self.db.tables.items()}
+        return {"swagger": "2.0", "info": {"title": "Local Supabase stand-in", "version": "local"},
+                "paths": {"/": {}, **{f"/{table}": {} for table in self.db.tables}}, "definitions": definitions}
+
+    def check_column(self, table, column):
+        if column not in self.db.tables[table]:
+            raise rest_error(400, "42703", f"column {table}.{column} does not exist")
+        return quote(column)
+
+    def columns(self, table, select):
+        """Column names of a select parameter"""
+        if "(" in select:
+            raise rest_error(400, "PGRST100", "Embedded resources are not supported by the local stand-in")
+        names = [name.strip() for name in select.split(",") if name.strip()]
+        if not names or "*" in names:
+            return self.db.tables[table]
+        for name in names:
+            self.check_column(table, name)
+        return names
+
+    def filters(self, table, params):
+        """Translate column=operator.value parameters into WHERE clauses"""
+        where, values = [], []
+        for column, expression in params:
+            if column in RESERVED_PARAMS:
+                continue
+            if column in ("or", "and"):
+                raise rest_error(400, "PGRST100", f"'{column}' filters are not supported by the local stand-in")
+            name = self.check_column(table, column)
+            negate = expression.startswith("not.")
+            operator, _, value = expression[4 if negate else 0:].partition(".")
+            if operator in FILTER_OPERATORS:
+                clause = f"{name} {FILTER_OPERATORS[operator]} ?"
+                if operator == "ilike":
+                    clause = f"lower({name}) LIKE lower(?)"
+                values.append(value.replace("*", "%") if "like" in operator else value)
+            elif operator == "is":
+                keywords = {"null": "NULL", "true": "1", "false": "0"}
+                if value.lower() not in keywords:
+                    raise rest_error(400, "PGRST100", f"'{value}' is not valid for 'is'")
+                clause = f"{name} IS {keywords[value.lower()]}"
+            elif operator == "in" and value.startswith("(") and value.endswith(")"):
+                items = [item.strip().strip('"') for item in value[1:-1].split(",") if item.strip()]
+                clause = f"{name} IN ({', '.join('?' * len(items))})"
+                values.extend(items)
+            else:
+                raise rest_error(400, "PGRST100", f"unsupported filter '{expression}' on column {column}")
+            where.append(f"NOT ({clause})" if negate else clause)
+        return where, values
+
+    def select(self, table, params, where, values):
+        sql = f"SELECT * FROM {quote(table)}"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        if params.get("order"):
+            terms = []
+            for term in params["order"].split(","):
+                column, *modifiers = term.strip().split(".")
+                direction = "DESC" if "desc" in modifiers else "ASC"
+                nulls = " NULLS FIRST" if "nullsfirst" in modifiers else " NULLS LAST" if "nullslast" in modifiers else ""
+                terms.append(f"{self.check_column(table, column)} {direction}{nulls}")
+            sql += " ORDER BY " + ", ".join(terms)
+        try:
+            limit = int(params.get("limit", -1))
+            offset = int(params.get("offset", 0))
+        except ValueError:
+            raise rest_error(400, "PGRST100", "limit and offset must be integers")
+        sql += f" LIMIT {limit} OFFSET {offset}"
+        return self.db.execute(sql, values)
+
+    def count(self, table, where, values):
+        sql = f"SELECT COUNT(*) AS n FROM {quote(table)}" + (" WHERE " + " AND ".join(where) if where else "")
+        return self.db.execute(sql, values)[0]["n"]
+
+    def insert(self, table, params, prefer, caller, body):
+        rows = body if isinstance(body, list) else [body]
+        if not rows or not all(isinstance(row, dict) for row in rows):
+            raise rest_error(400, "PGRST102", "Expected a JSON object or an array of objects")
+        owner = OWNED_TABLES.get(table)
+        if owner and caller.role == "authenticated":
+            for row in rows:
+                row.setdefault(owner, caller.user_id)
+                if row[owner] != caller.user_id:
+                    raise rest_error(403, "42501", f'new row violates row-level security policy for table "{table}"')
+
+        resolution = prefer.get("resolution")
+        conflict = [c.strip() for c in (params.get("on_conflict") or "").split(",") if c.strip()] \
+            or self.db.primary_keys[table]
+        inserted = []
+        for row in rows:
+            columns = list(row)
+            names = ", ".join(self.check_column(table, column) for column in columns)
+            sql = f"INSERT INTO {quote(table)} ({names}) VALUES ({', '.join('?' * len(columns))})" if columns \
+                else f"INSERT INTO {quote(table)} DEFAULT VALUES"
+            if resolution in ("merge-duplicates", "ignore-duplicates") and columns:
+                target = ", ".join(self.check_column(table, column) for column in conflict)
+                updates = [f"{quote(c)} = excluded.{quote(c)}" for c in columns if c not in conflict]
+                action = "DO UPDATE SET " + ", ".join(updates) if resolution == "merge-duplicates" and updates \
+                    else "DO NOTHING"
+                sql += f" ON CONFLICT ({target}) {action}"
+            inserted += self.write(sql + " RETURNING *", [self.db.encode(table, c, row[c]) for c in columns])
+        return inserted
+
+    def update(self, table, where, values, body):
+        if not isinstance(body, dict) or not body:
+            raise rest_error(400, "PGRST102", "Expected a JSON object with the columns to update")
+        assignments = ", ".join(f"{self.check_column(table, column)} = ?" for column in body)
+        sql = f"UPDATE {quote(table)} SET {assignments}" + (" WHERE " + " AND ".join(where) if where else "")
+        return self.write(sql + " RETURNING *", [self.db.encode(table, c, v) for c, v in body.items()] + values)
+
+    def delete(self, table, where, values):
+        if not where:
+            raise rest_error(400, "21000", "DELETE requires a WHERE clause")
+        return self.write(f"DELETE FROM {quote(table)} WHERE " + " AND ".join(where) + " RETURNING *", values)
+
+    def write(self, sql, values):
+        """Run a write, translating SQLite constraint errors to Postgres error codes"""
+        try:
+            return self.db.execute(sql, values)
+        except sqlite3.IntegrityError as e:
+            message = str(e)
+            code = ("23505" if "UNIQUE" in message else "23514" if "CHECK" in message
+                    else "23502" if "NOT NULL" in message else "23503")
+            raise rest_error(409 if code in ("23505", "23503") else 400, code, message)
+
+    # -- GoTrue ----------------------------------------------------------
+
+    def auth(self, method, path, query, caller, body):
+        """Handle /auth/v1/<path>; return (status, payload, extra headers)"""
+        body = body if isinstance(body, dict) else {}
+        params = dict(parse_qsl(query))
+        if path == "health":
+            return 200, {"name": "GoTrue", "version": "local", "description": "Local Supabase stand-in"}, {}
+        if path == "settings":
+            return 200, {"external": {"email": True}, "disable_signup": False, "mailer_autoconfirm": True}, {}
+        if path == "signup" and method == "POST":
+            user = self.create_user(body.get("email"), body.get("password"), body.get("data"), confirmed=True)
+            return 200, self.new_session(user), {}
+        if path == "token" and method == "POST":
+            return 200, self.grant(params.get("grant_type"), body), {}
+        if path == "logout" and method == "POST":
+            scope = params.get("scope", "global")
+            if caller.user_id and scope in LOGOUT_SCOPES:
+                self.db.execute(f"DELETE FROM auth_refresh_tokens WHERE {LOGOUT_SCOPES[scope]}",
+                                {"user_id": caller.user_id, "session_id": caller.session_id})
+            return 204, None, {}
+        if path == "recover" and method == "POST":
+            self.send_recovery(body.get("email"), body.get("redirect_to") or params.get("redirect_to"))
+            return 200, {}, {}
+        if path == "verify" and method in ("GET", "POST"):
+            # GET follows the emailed link; POST (with an optional new password) is used by the reset suite
+            fields = params if method == "GET" else body
+            claims = decode_jwt(fields.get("token") or "")
+            if not claims or claims.get("purpose") != fields.get("type"):
+                raise auth_error(403, "otp_expired", "Email link is invalid or has expired")
+            if fields.get("password"):
+                self.update_user(claims["sub"], {"password": fields["password"]})
+            session = self.new_session(self.get_user(claims["sub"]))
+            if method == "POST":
+                return 200, session, {}
+            fragment = urlencode({"access_token": session["access_token"], "refresh_token": session["refresh_token"],
+                                  "expires_in": TOKEN_LIFETIME, "token_type": "bearer", "type": fields["type"]})
+            return 303, None, {"Location": f"{fields.get('redirect_to') or self.base_url}#{fragment}"}
+        if path == "user":
+            if not caller.user_id:
+                raise auth_error(401, "no_authorization", "This endpoint requires a Bearer token")
+            if method == "PUT":
+                return 200, self.update_user(caller.user_id, body), {}
+            return 200, self.user_json(self.get_user(caller.user_id)), {}
+        if path.startswith("admin/users"):
+            return self.admin_users(method, path[len("admin/users"):].strip("/"), params, caller, body)
+        raise auth_error(404, "not_found", f"Unsupported auth endpoint: {method} /auth/v1/{path}")
+
+    def grant(self, grant_type, body):
+        if grant_type == "password":
+            rows = self.db.execute("SELECT * FROM auth_users WHERE email = ?", ((body.get("email") or "").lower(),))
+            if not rows or not check_password(body.get("password") or "", rows[0]["password_hash"]):
+                raise auth_error(400, "invalid_credentials", "Invalid login credentials")
+            if not rows[0]["email_confirmed_at"]:
+                raise auth_error(400, "email_not_confirmed", "Email not confirmed")
+            return self.new_session(rows[0])
+        if grant_type == "refresh_token":
+            rows = self.db.execute("DELETE FROM auth_refresh_tokens WHERE token = ? RETURNING *",
+                                   (body.get("refresh_token") or "",))
+            if not rows:
+                raise auth_error(400, "refresh_token_not_found", "Invalid Refresh Token: Refresh Token Not Found")
+            return self.new_session(self.get_user(rows[0]["user_id"]), rows[0]["session_id"])
+        raise auth_error(400, "unsupported_grant_type", f"Unsupported grant type: {grant_type}")
+
+    def new_session(self, user, session_id=None):
+        """Sign a user in: issue an access token and a refresh token"""
+        session_id = session_id or str(uuid.uuid4())
+        issued = int(time.time())
+        claims = {"iss": f"{self.base_url}/auth/v1", "sub": user["id"], "aud": "authenticated", "role": "authenticated",
+                  "email": user["email"], "session_id": session_id, "iat": issued, "exp": issued + TOKEN_LIFETIME,
+                  "app_metadata": json.loads(user["app_metadata"]), "user_metadata": json.loads(user["user_metadata"])}
+        refresh_token = uuid.uuid4().hex
+        signed_in = now_iso()
+        self.db.execute("INSERT INTO auth_refresh_tokens (token, user_id, session_id) VALUES (?, ?, ?)",
+                        (refresh_token, user["id"], session_id))
+        self.db.execute("UPDATE auth_users SET last_sign_in_at = ? WHERE id = ?", (signed_in, user["id"]))
+        user = dict(user, last_sign_in_at=signed_in)
+        return {"access_token": encode_jwt(claims), "token_type": "bearer", "expires_in": TOKEN_LIFETIME,
+                "expires_at": issued + TOKEN_LIFETIME, "refresh_token": refresh_token, "user": self.user_json(user)}
+
+    def create_user(self, email, password, metadata=None, confirmed=False, app_metadata=None):
+        email = (email or "").strip().lower()
+        if not re.match(r"[^@\s]+@[^@\s]+$", email):
+            raise auth_error(400, "validation_failed", "Unable to validate email address: invalid format")
+        if password is not None and len(password) < MIN_PASSWORD_LENGTH:
+            raise auth_error(422, "weak_password", f"Password should be at least {MIN_PASSWORD_LENGTH} characters.")
+        created = now_iso()
+        user_id = str(uuid.uuid4())
+        try:
+            self.db.execute(
+                "INSERT INTO auth_users (id, email, password_hash, user_metadata, app_metadata, email_confirmed_at, "
+                "created_at, updated_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (user_id, email, hash_password(password) if password else None, json.dumps(metadata or {}),
+                 json.dumps({"provider": "email", "providers": ["email"], **(app_metadata or {})}),
+                 created if confirmed else None, created, created))
+        except sqlite3.IntegrityError:
+            raise auth_error(422, "email_exists", "A user with this email address has already been registered")
+        return self.get_user(user_id)
+
+    def get_user(self, user_id):
+        rows = self.db.execute("SELECT * FROM auth_users WHERE id = ?", (user_id,))
+        if not rows:
+            raise auth_error(404, "user_not_found", "User not found")
+        return rows[0]
+
+    def update_user(self, user_id, body, admin=False):
+        user = self.get_user(user_id)
+        changes = {"updated_at": now_iso()}
+        if body.get("email"):
+            changes["email"] = body["email"].strip().lower()
+        if body.get("password"):
+            if len(body["password"]) < MIN_PASSWORD_LENGTH:
+                raise auth_error(422, "weak_password", f"Password should be at least {MIN_PASSWORD_LENGTH} characters.")
+            changes["password_hash"] = hash_password(body["password"])
+        metadata = body.get("user_metadata", body.get("data"))
+        if metadata is not None:
+            changes["user_metadata"] = json.dumps({**json.loads(user["user_metadata"]), **metadata})
+        if admin and body.get("app_metadata") is not None:
+            changes["app_metadata"] = json.dumps({**json.loads(user["app_metadata"]), **body["app_metadata"]})
+        if admin and body.get("email_confirm"):
+            changes["email_confirmed_at"] = user["email_confirmed_at"] or changes["updated_at"]
+        assignments = ", ".join(f"{column} = ?" for column in changes)
+        try:
+            self.db.execute(f"UPDATE auth_users SET {assignments} WHERE id = ?", [*changes.values(), user_id])
+        except sqlite3.IntegrityError:
+            raise auth_error(422, "email_exists", "A user with this email address has already been registered")
+        return self.user_json(self.get_user(user_id))
+
+    def user_json(self, user):
+        return {"id": user["id"], "aud": "authenticated", "role": "authenticated", "email": user["email"], "phone": "",
+                "email_confirmed_at": user["email_confirmed_at"], "confirmed_at": user["email_confirmed_at"],
+                "last_sign_in_at": user["last_sign_in_at"], "app_metadata": json.loads(user["app_metadata"]),
+                "user_metadata": json.loads(user["user_metadata"]), "identities": [],
+                "created_at": user["created_at"], "updated_at": user["updated_at"], "is_anonymous": False}
+
+    def admin_users(self, method, user_id, params, caller, body):
+        if caller.role != "service_role":
+            raise auth_error(403, "not_admin", "User not allowed")
+        if not user_id and method == "POST":
+            user = self.create_user(body.get("email"), body.get("password"), body.get("user_metadata"),
+                                    confirmed=bool(body.get("email_confirm")), app_metadata=body.get("app_metadata"))
+            return 200, self.user_json(user), {}
+        if not user_id and method == "GET":
+            page, per_page = int(params.get("page") or 1), int(params.get("per_page") or 50)
+            users = self.db.execute("SELECT * FROM auth_users ORDER BY created_at LIMIT ? OFFSET ?",
+                                    (per_page, (page - 1) * per_page))
+            total = self.db.execute("SELECT COUNT(*) AS n FROM auth_users")[0]["n"]
+            return 200, {"users": [self.user_json(u) for u in users], "aud": "authenticated"}, {"X-Total-Count": str(total)}
+        if user_id and method == "GET":
+            return 200, self.user_json(self.get_user(user_id)), {}
+        if user_id and method == "PUT":
+            return 200, self.update_user(user_id, body, admin=True), {}
+        if user_id and method == "DELETE":
+            user = self.user_json(self.get_user(user_id))
+            self.db.execute("DELETE FROM auth_refresh_tokens WHERE user_id = ?", (user_id,))
+            self.db.execute("DELETE FROM auth_users WHERE id = ?", (user_id,))
+            return 200, user, {}
+        raise auth_error(405, "method_not_allowed", f"{method} is not supported on admin/users")
+
+    def send_recovery(self, email, redirect_to=None):
+        """Queue the password reset email; unknown addresses are accepted silently, as GoTrue does"""
+        rows = self.db.execute("SELECT * FROM auth_users WHERE email = ?", ((email or "").strip().lower(),))
+        if not rows:
+            return
+        token = encode_jwt({"sub": rows[0]["id"], "purpose": "recovery", "exp": int(time.time()) + TOKEN_LIFETIME})
+        query = urlencode({"token": token, "type": "recovery", "redirect_to": redirect_to or ""})
+        link = f"{self.base_url}/auth/v1/verify?{query}"
+        self.record_email("email_queue", to_email=rows[0]["email"], from_email=LOCAL_FROM_EMAIL,
+                          subject="Reset Your Password", body=f"Follow this link to reset your password: {link}",
+                          status="sent", sent_at=now_iso())
+
+    # -- Edge Functions --------------------------------------------------
+
+    def invoke(self, name, caller, body):
+        """Run a local port of an Edge Function; return (status, payload, extra headers)"""
+        function = self.functions.get(name)
+        if function is None:
+            raise ApiError(404, {"error": f"Function not found: {name}"})
+        body = body if isinstance(body, dict) else {}
+        status, payload = function(caller, body.get("body", body) if isinstance(body.get("body"), dict) else body)
+        return status, payload, {}
+
+    def record_email(self, table, **columns):
+        names = ", ".join(quote(column) for column in columns)
+        return self.write(f"INSERT INTO {quote(table)} ({names}) VALUES ({', '.join('?' * len(columns))}) RETURNING *",
+                          list(columns.values()))[0]
+
+    def get_download_url(self, caller, body):
+        if not caller.user_id:
+            return 401, {"error": "Not authenticated: sign in to download"}
+        if not body.get("app_id"):
+            return 400, {"error": "app_id is required"}
+        expires_in = 600
+        token = encode_jwt({"sub": caller.user_id, "app_id": body["app_id"], "exp": int(time.time()) + expires_in})
+        url = f"{self.base_url}/storage/v1/object/sign/downloads/{body['app_id']}?token={token}"
+        return 200, {"url": url, "expires_in": expires_in}
+
+    def send_email(self, caller, body):
+        if body.get("name") and body.get("email") and body.get("message"):
+            subject = body.get("subject") or f"New Contact from {body['name']}"
+            content = f"{body['name']} <{body['email']}>: {body['message']}"
+        elif body.get("html") or body.get("message"):
+            subject = body.get("subject") or "New Message from Website"
+            content = body.get("html") or body["message"]
+        else:
+            return 400, {"error": "Invalid request format. Must include name/email/message or html content."}
+        email = self.record_email("email_history", from_email=os.getenv("FROM_EMAIL") or LOCAL_FROM_EMAIL,
+                                  to_email=body.get("to") or os.getenv("TO_EMAIL") or "customer.support@softaidev.com",
+                                  subject=subject, body=content, email_type="outgoing", status="sent")
+        return 200, {"id": email["id"]}
+
+    def send_order_confirmation(self, caller, body):
+        if not all(body.get(field) for field in ("email", "order_id", "app_name", "download_url")):
+            return 400, {"error": "Missing required fields"}
+        self.record_email("email_history", from_email=os.getenv("FROM_EMAIL") or LOCAL_FROM_EMAIL,
+                          to_email=body["email"], subject=f"Your Order #{body['order_id']} Confirmation",
+                          body=f"{body['app_name']}: {body['download_url']}", email_type="outgoing", status="sent")
+        return 200, {"success": True, "message": "Order confirmation email sent"}
+
+    def receive_email(self, caller, body):
+        if not body.get("from_email") or not body.get("to_email"):
+            return 400, {"success": False, "error": "from_email and to_email are required"}
+        email = self.record_email("email_history", from_email=body["from_email"], to_email=body["to_email"],
+                                  subject=body.get("subject"), body=body.get("body"),
+                                  email_type="incoming", status="received")
+        name = re.sub(r"\b\w", lambda m: m.group().upper(), re.sub(r"[._]", " ", body["from_email"].split("@")[0]))
+        self.write("INSERT INTO customers (email, name) VALUES (?, ?) ON CONFLICT (email) DO UPDATE SET "
+                   "updated_at = now()", (body["from_email"], name))
+        return 200, {"success": True, "message": "Email received and processed", "email_id": email["id"]}
+
+
+class SupabaseRequestHandler(BaseHTTPRequestHandler):
+    """Route /rest/v1, /auth/v1 and /functions/v1 requests to a LocalSupabase"""
+
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True  # see dev_server.SiteRequestHandler
+
+    def __init__(self, *args, supabase=None, **kwargs):
+        self.supabase = supabase
+        super().__init__(*args, **kwargs)
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_OPTIONS(self):
+        self.send_json(200, None, CORS_HEADERS)
+
+    def do_GET(self):
+        self.route("GET")
+
+    def do_HEAD(self):
+        self.route("HEAD")
+
+    def do_POST(self):
+        self.route("POST")
+
+    def do_PUT(self):
+        self.route("PUT")
+
+    def do_PATCH(self):
+        self.route("PATCH")
+
+    def do_DELETE(self):
+        self.route("DELETE")
+
+    def route(self, method):
+        url = urlsplit(self.path)
+        raw = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+        try:
+            try:
+                body = json.loads(raw) if raw.strip() else None
+            except ValueError:
+                raise ApiError(400, {"code": "PGRST102", "message": "Invalid JSON in request body"})
+            caller = self.supabase.identify(self.headers)
+            service, _, rest = url.path.strip("/").partition("/")
+            version, _, path = rest.partition("/")
+            if version != "v1":
+                raise ApiError(404, {"message": f"no Supabase API at {url.path}"})
+            if service == "rest":
+                status, payload, extra = self.supabase.rest(method, path, url.query, self.headers, caller, body)
+            elif service == "auth":
+                status, payload, extra = self.supabase.auth(method, path, url.query, caller, body)
+            elif service == "functions":
+                status, payload, extra = self.supabase.invoke(path, caller, body)
+            else:
+                raise ApiError(404, {"message": f"no Supabase API at {url.path}"})
+        except ApiError as e:
+            status, payload, extra = e.status, e.payload, {}
+        self.send_json(status, payload, extra, head=method == "HEAD")
+
+    def send_json(self, status, payload, extra=(), head=False):
+        data = b"" if payload is None else json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in {**CORS_HEADERS, **dict(extra)}.items():
+            self.send_header(name, value)
+        self.end_headers()
+        if data and not head and status not in (HTTPStatus.NO_CONTENT, HTTPStatus.NOT_MODIFIED):
+            self.wfile.write(data)
+
+
+def seed(supabase, email=None, password=None):
+    """Create the test suites' user (TEST_EMAIL / TEST_PASSWORD) with one purchase; return the user"""
+    email = email or os.getenv("TEST_EMAIL") or "test@example.com"
+    password = password or os.getenv("TEST_PASSWORD") or "TestPass123!"
+    rows = supabase.db.execute("SELECT * FROM auth_users WHERE email = ?", (email.lower(),))
+    if rows:
+        return rows[0]
+    user = supabase.create_user(email, password, {"full_name": "Test User"}, confirmed=True)
+    expiry = (datetime.now(timezone.utc) + timedelta(days=730)).isoformat()
+    supabase.db.execute("INSERT INTO purchases (user_id, app_id, order_id, expiry_date, amount) VALUES (?, ?, ?, ?, ?)",
+                        (user["id"], "test-app", "LOCAL-0001", expiry, 0))
+    return user
+
+
+def start_supabase(port=0, host="127.0.0.1", db=":memory:", seed_user=True):
+    """Start the stand-in on a background thread and return (server, base_url).
+
+    port=0 picks a free port. server.supabase is the LocalSupabase, so
+    tests can look at server.supabase.db directly.
+    """
+    supabase = LocalSupabase(Database(db))
+    if seed_user:
+        seed(supabase)
+    handler = functools.partial(SupabaseRequestHandler, supabase=supabase)
+    server = SiteServer((host, port), handler)
+    server.supabase = supabase
+
+    public_host = "localhost" if host in ("", "0.0.0.0", "127.0.0.1") else host
+    base_url = f"http://{public_host}:{server.server_address[1]}"
+    supabase.base_url = base_url
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server, base_url
+
+
+def stop_supabase(server):
+    """Shut down a server started with start_supabase"""
+    server.shutdown()
+    server.server_close()
+    server.supabase.db.connection.close()
+
+
+def use_local_supabase(**kwargs):
+    """Start the stand-in and point the SUPABASE_* variables at it; return the server"""
+    if load_dotenv:
+        load_dotenv()  # seed the TEST_EMAIL the suites will read from .env
+    server, base_url = start_supabase(**kwargs)
+    os.environ.update({"SUPABASE_URL": base_url, "SUPABASE_KEY": ANON_KEY, "SUPABASE_ANON_KEY": ANON_KEY,
+                       "SUPABASE_SERVICE_KEY": SERVICE_KEY})
+    return server
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Serve a local stand-in for the Supabase REST, auth and function APIs")
+    parser.add_argument("port", type=int, nargs="?", default=DEFAULT_PORT,
+                        help=f"port to listen on (default: {DEFAULT_PORT})")
+    parser.add_argument("--db", default=":memory:",
+                        help="SQLite file to keep the data in (default: in memory)")
+    parser.add_argument("--no-seed", action="store_true",
+                        help="do not create the TEST_EMAIL user")
+    parser.add_argument("--host", default="127.0.0.1",
+                        help="address to listen on (default: 127.0.0.1; see the warning before using another)")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    if load_dotenv:
+        load_dotenv()
+    if args.host not in ("127.0.0.1", "localhost", "::1"):
+        print(f"⚠ Listening on {args.host}: anyone who can reach it can forge a service_role key "
+              "and read or change every table and user")
+    server, base_url = start_supabase(args.port, host=args.host, db=args.db, seed_user=not args.no_seed)
+    print(f"Local Supabase at {base_url} ({len(server.supabase.db.tables)} tables, database: {args.db})")
+    print("Point the suites at it with:")
+    print(f"  SUPABASE_URL={base_url}")
+    print(f"  SUPABASE_KEY={ANON_KEY}")
+    print(f"  SUPABASE_ANON_KEY={ANON_KEY}")
+    print(f"  SUPABASE_SERVICE_KEY={SERVICE_KEY}")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        print("\nStopping server...")
+        stop_supabase(server)
@@ -0,0 +1,466 @@
+#!/usr/bin/env python3
+"""
+Streaming multi-transform rewriter for the site's HTML pages.
+
+Each page is tokenized once into start tags, end tags, comments, script
+and style bodies and text. The tokens keep the exact source text, so
+untouched parts of a page are written back byte for byte. Then every
+selected transform is applied in a single pass over the tokens. A
+transform can insert markup before or after any token. Pages are
+processed in parallel and written atomically (temp file + rename).
+
+Every run records the SHA-256 of each page before and after in a JSON
+manifest (.build-cache/rewrite-manifest.json by default), keyed by the
+transforms and the rewriter's own source. A page whose content still
+matches the recorded output is skipped without being tokenized again
+(--force processes every page and records the new hashes).
+With --dry-run nothing is written and a unified diff is printed per page.
+
+Transforms (applied in the order given):
+    footer    privacy policy link at the bottom of every <footer>
+    head      Font Awesome and css/home-button.css after </title>
+    scripts   js/image-handler.js before </body>
+
+Usage:
+    python page_rewriter.py                        # footer transform on all pages
+    python page_rewriter.py -t head -t scripts     # what update-pages.js did
+    python page_rewriter.py -t footer about.html   # selected pages only
+    python page_rewriter.py --dry-run              # show the diffs, write nothing
+"""
+import os
+import re
+import sys
+import glob
+import json
+import time
+import difflib
+import hashlib
+import argparse
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+
+from build_cache import add_cache_arguments
+
+SITE_ROOT = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_MANIFEST = os.path.join(SITE_ROOT, ".build-cache", "rewrite-manifest.json")
+RAW_TEXT_TAGS = {"script", "style"}
+
+TOKEN_PATTERN = re.compile(r"""
+    (?P<comment><!--.*?-->)
+  | (?P<decl><![^>]*>|<\?[^>]*>)
+  | (?P<end></(?P<end_name>[a-zA-Z][\w:-]*)\s*>)
+  | (?P<start><(?P<start_name>[a-zA-Z][\w:-]*)
+        (?:\s+[^\s"'>/=]+(?:\s*=\s*(?:"[^"]*"|'[^']*'|[^\s"'>]+))?)*\s*/?>)
+""", re.S | re.X)
+ATTR_PATTERN = re.compile(r"""([^\s"'>/=]+)(?:\s*=\s*(?:"([^"]*)"|'([^']*)'|([^\s"'>]+)))?""")
+
+
+class Token:
+    """One piece of a page: kind is start, end, comment, decl, raw or text"""
+
+    __slots__ = ("kind", "raw", "name", "_attrs")
+
+    def __init__(self, kind, raw, name=None):
+        self.kind = kind
+        self.raw = raw
+        self.name = name.lower() if name else None
+        self._attrs = None
+
+    def is_start(self, name):
+        return self.kind == "start" and self.name == name
+
+    def is_end(self, name):
+        return self.kind == "end" and self.name == name
+
+    @property
+    def attrs(self):
+        """Attributes of a start tag as a dict"""
+        if self._attrs is None:
+            self._attrs = {}
+            if self.kind == "start":
+                body = self.raw[len(self.name) + 1:].rstrip(">").rstrip("/")
+                for match in ATTR_PATTERN.finditer(body):
+                    name, *values = match.groups()
+                    self._attrs[name.lower()] = next((v for v in values if v is not None), "")
+        return self._attrs
+
+
+def tokenize(text):
+    """Split a page into tokens whose raw text joins back into the page"""
+    tokens = []
+    position = 0
+    length = len(text)
+    while position < length:
+        match = TOKEN_PATTERN.search(text, position)
+        if not match:
+            tokens.append(Token("text", text[position:]))
+            break
+        if match.start() > position:
+            tokens.append(Token("text", text[position:match.start()]))
+
+        kind = match.lastgroup if match.lastgroup in ("comment", "decl") else None
+        if match.group("end"):
+            tokens.append(Token("end", match.group(0), match.group("end_name")))
+        elif match.group("start"):
+            token = Token("start", match.group(0), match.group("start_name"))
+            tokens.append(token)
+            if token.name in RAW_TEXT_TAGS and not token.raw.endswith("/>"):
+                # Script and style bodies are opaque up to their end tag
+                close = re.compile(rf"</{token.name}\s*>", re.I).search(text, match.end())
+                body_end = close.start() if close else length
+                if body_end > match.end():
+                    tokens.append(Token("raw", text[match.end():body_end]))
+                position = body_end
+                continue
+        else:
+            tokens.append(Token(kind, match.group(0)))
+        position = match.end()
+    return tokens
+
+
+class Transform:
+    """Base class for page transforms.
+
+    start() decides per page whether the transform applies (it may look at
+    all tokens); before()/after() return markup to insert around a token;
+    finish() returns markup to append at the end of the page.
+    """
+
+    name = "transform"
+    exclude = ()
+
+    def start(self, page, tokens):
+        return os.path.basename(page) not in self.exclude
+
+    def before(self, token):
+        return None
+
+    def after(self, token):
+        return None
+
+    def finish(self):
+        return None
+
+
+def references(tokens, attribute, value):
+    """True if any start tag has attribute == value"""
+    return any(t.kind == "start" and t.attrs.get(attribute) == value for t in tokens)
+
+
+def link_target(href):
+    """The site path an href points to: without query, fragment, leading ./ or /"""
+    path = re.split(r"[?#]", href, maxsplit=1)[0]
+    while path.startswith(("./", "/")):
+        path = path[2:] if path.startswith("./") else path[1:]
+    return path
+
+
+def links_to(tokens, path):
+    """True if any start tag's href points to path, however the href is written"""
+    return any(t.kind == "start" and "href" in t.attrs and link_target(t.attrs["href"]) == path
+               for t in tokens)
+
+
+class FooterLinkTransform(Transform):
+    """Wrap each outermost <footer>'s content and add the privacy policy link"""
+
+    name = "footer"
+    exclude = ("privacy-policy.html",)
+    OPEN = '<div style="text-align: center;">'
+    CLOSE = ('<br><a href="privacy-policy.html" style="color: #1a237e; text-decoration: underline;">'
+             'Privacy Policy</a></div>')
+
+    def start(self, page, tokens):
+        self.depth = 0
+        return (super().start(page, tokens) and
+                not links_to(tokens, "privacy-policy.html") and
+                any(t.is_start("footer") for t in tokens))
+
+    def before(self, token):
+        if token.is_end("footer"):
+            self.depth -= 1
+            if self.depth == 0:
+                return self.CLOSE
+        return None
+
+    def after(self, token):
+        if token.is_start("footer"):
+            self.depth += 1
+            if self.depth == 1:
+                return self.OPEN
+        return None
+
+
+class HeadInjectionTransform(Transform):
+    """Insert stylesheet links after </title>, or before </head> without a title"""
+
+    name = "head"
+    exclude = ("index.html",)
+    MARKER = "css/home-button.css"
+    SNIPPET = (
+        "\n    <style>body { position: relative; }</style>"
+        "\n    <!-- Add Font Awesome for home icon -->"
+        '\n    <link rel="stylesheet" href="https://cdnjs.cloudflare.com/ajax/libs/font-awesome/6.0.0-beta3/css/all.min.css">'
+        "\n    <!-- Add home button and image handling -->"
+        '\n    <link rel="stylesheet" href="css/home-button.css">'
+    )
+
+    def start(self, page, tokens):
+        self.done = False
+        self.anchor = "title" if any(t.is_end("title") for t in tokens) else "head"
+        return (super().start(page, tokens) and
+                not references(tokens, "href", self.MARKER) and
+                any(t.is_end(self.anchor) for t in tokens))
+
+    def before(self, token):
+        if self.anchor == "head" and not self.done and token.is_end("head"):
+            self.done = True
+            return self.SNIPPET.lstrip("\n") + "\n"
+        return None
+
+    def after(self, token):
+        if self.anchor == "title" and not self.done and token.is_end("title"):
+            self.done = True
+            return self.SNIPPET
+        return None
+
+
+class ScriptInjectionTransform(Transform):
+    """Insert a deferred script before </body>, or at the end without a body"""
+
+    name = "scripts"
+    exclude = ("index.html",)
+    SRC = "js/image-handler.js"
+
+    def start(self, page, tokens):
+        self.done = False
+        return super().start(page, tokens) and not references(tokens, "src", self.SRC)
+
+    def snippet(self):
+        return f'    <!-- Add image handler script -->\n    <script src="{self.SRC}" defer></script>\n'
+
+    def before(self, token):
+        if not self.done and token.is_end("body"):
+            self.done = True
+            return self.snippet()
+        return None
+
+    def finish(self):
+        if not self.done:
+            self.done = True
+            return "\n" + self.snippet()
+        return None
+
+
+TRANSFORMS = {
+    "footer": FooterLinkTransform,
+    "head": HeadInjectionTransform,
+    "scripts": ScriptInjectionTransform,
+}
+
+
+def rewrite(text, transforms, page=""):
+    """Apply the transforms to a page in one pass; return (new text, names of transforms applied)"""
+    tokens = tokenize(text)
+    active = [t for t in transforms if t.start(page, tokens)]
+    if not active:
+        return text, []
+
+    out = []
+    for token in tokens:
+        for transform in active:
+            inserted = transform.before(token)
+            if inserted:
+                out.append(inserted)
+        out.append(token.raw)
+        for transform in active:
+            inserted = transform.after(token)
+            if inserted:
+                out.append(inserted)
+    for transform in active:
+        inserted = transform.finish()
+        if inserted:
+            out.append(inserted)
+
+    new_text = "".join(out)
+    return new_text, ([t.name for t in active] if new_text != text else [])
+
+
+def read_page(path):
+    with open(path, "r", encoding="utf-8", newline="") as f:
+        return f.read()
+
+
+def write_atomic(path, text):
+    """Write through a temp file in the same directory and rename it over the target"""
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(prefix=".rewrite-", suffix=".tmp", dir=directory)
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8", newline="") as f:
+            f.write(text)
+        if os.path.exists(path):
+            os.chmod(tmp_path, os.stat(path).st_mode & 0o7777)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def content_hash(text):
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def process_page(path, transform_names, dry_run=False, known_output=None):
+    """Rewrite one page; return a result dict (runs in a worker process).
+
+    known_output is the hash recorded as this page's output by an earlier
+    run; if the page still has it, the page is skipped without tokenizing.
+    """
+    page = os.path.relpath(path, SITE_ROOT).replace(os.sep, "/")
+    result = {"page": page, "path": path, "applied": [], "skipped": False,
+              "before": None, "after": None, "diff": "", "error": None}
+    try:
+        text = read_page(path)
+        result["before"] = result["after"] = content_hash(text)
+        if known_output and result["before"] == known_output:
+            result["skipped"] = True
+            return result
+
+        transforms = [TRANSFORMS[name]() for name in transform_names]
+        new_text, applied = rewrite(text, transforms, page)
+        result["applied"] = applied
+        if applied:
+            result["after"] = content_hash(new_text)
+            if dry_run:
+                result["diff"] = "".join(difflib.unified_diff(
+                    text.splitlines(keepends=True), new_text.splitlines(keepends=True),
+                    fromfile=f"a/{page}", tofile=f"b/{page}"
+                ))
+            else:
+                write_atomic(path, new_text)
+    except Exception as e:
+        result["error"] = str(e)
+    return result
+
+
+def manifest_key(transform_names):
+    """Manifest section for a transform list and the current rewriter code"""
+    with open(os.path.abspath(__file__), "rb") as f:
+        code_hash = hashlib.sha256(f.read()).hexdigest()[:16]
+    return f"{','.join(transform_names)}@{code_hash}"
+
+
+def load_manifest(path):
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_manifest(path, manifest):
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    os.replace(tmp_path, path)
+
+
+def update_manifest(manifest, key, results, dry_run):
+    # A dry run wrote nothing, so it only gets a runs entry
+    if not dry_run:
+        section = manifest.setdefault(key, {})
+        for result in results:
+            if result["error"] or result["skipped"]:
+                continue
+            section[result["page"]] = {"before": result["before"], "after": result["after"]}
+    manifest.setdefault("runs", []).append({
+        "at": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "transforms": key,
+        "dry_run": dry_run,
+        "changed": [r["page"] for r in results if r["applied"]],
+    })
+    manifest["runs"] = manifest["runs"][-20:]
+
+
+def default_pages():
+    return sorted(glob.glob(os.path.join(SITE_ROOT, "*.html")))
+
+
+def rewrite_pages(paths, transform_names, workers=None, dry_run=False, manifest_path=DEFAULT_MANIFEST,
+                  force=False):
+    """Rewrite pages in parallel; return the result dicts in page order.
+
+    Pages whose content matches the output recorded in the manifest are
+    skipped unless force is set. Pass manifest_path=None to process every
+    page and record nothing.
+    """
+    manifest = load_manifest(manifest_path) if manifest_path else {}
+    key = manifest_key(transform_names)
+    section = {} if force else manifest.get(key, {})
+    known = [section.get(os.path.relpath(p, SITE_ROOT).replace(os.sep, "/"), {}).get("after") for p in paths]
+    arguments = (paths, [transform_names] * len(paths), [dry_run] * len(paths), known)
+
+    if workers == 1 or len(paths) < 2:
+        results = list(map(process_page, *arguments))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(process_page, *arguments))
+
+    if manifest_path:
+        update_manifest(manifest, key, results, dry_run)
+        save_manifest(manifest_path, manifest)
+    return results
+
+
+def print_results(results, dry_run=False):
+    updated = 0
+    for result in results:
+        if result["error"]:
+            print(f"❌ Error processing {result['page']}: {result['error']}")
+        elif result["applied"]:
+            updated += 1
+            if dry_run:
+                print(result["diff"], end="" if result["diff"].endswith("\n") else "\n")
+            else:
+                print(f"✅ Updated {result['page']} ({', '.join(result['applied'])})")
+        elif result["skipped"]:
+            print(f"ℹ️  No changes needed for {result['page']} (unchanged since last rewrite)")
+        else:
+            print(f"ℹ️  No changes needed for {result['page']}")
+    verb = "would be updated" if dry_run else "updated"
+    print(f"\n{updated} of {len(results)} pages {verb}")
+    hits = sum(1 for r in results if r["skipped"])
+    print(f"Build cache: {hits} hit(s), {len(results) - hits} miss(es) of {len(results)} page(s)")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Apply transforms to the site's HTML pages")
+    parser.add_argument("pages", nargs="*", help="pages to rewrite (default: every *.html page)")
+    parser.add_argument("-t", "--transform", action="append", choices=list(TRANSFORMS), dest="transforms",
+                        help="transform to apply, repeat for several (default: footer)")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="worker processes (default: one per CPU)")
+    parser.add_argument("--dry-run", action="store_true",
+                        help="print a unified diff per page instead of writing")
+    parser.add_argument("--manifest", metavar="PATH", default=DEFAULT_MANIFEST,
+                        help="before/after hash manifest (default: .build-cache/rewrite-manifest.json)")
+    parser.add_argument("--no-manifest", action="store_true",
+                        help="process every page and do not record hashes")
+    add_cache_arguments(parser)
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    paths = [os.path.abspath(p) for p in args.pages] or default_pages()
+    manifest_path = None if args.no_manifest else args.manifest
+    results = rewrite_pages(paths, args.transforms or ["footer"], args.workers, args.dry_run, manifest_path,
+                            args.force)
+    print_results(results, args.dry_run)
+    return 1 if any(r["error"] for r in results) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
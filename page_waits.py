@@ -0,0 +1,205 @@
+"""
+Event-driven waits for the Selenium test suites.
+
+Instead of sleeping or polling on a fixed interval, a small script is
+injected into the page that watches the DOM with a MutationObserver and
+re-dispatches what it sees as page events:
+
+    va:dom-changed        any DOM, attribute or text change
+    va:modal-shown        a .modal became visible (detail: modal id)
+    va:modal-hidden       a .modal was hidden (detail: modal id)
+    va:message-appended   a .chat-message was added (detail: container id)
+
+Each wait checks its condition once and then only re-checks when one of
+these events fires, so it returns as soon as the page changes. Every wait
+records how long it actually took, and print_report() lists them.
+"""
+import time
+
+from selenium.common.exceptions import JavascriptException, TimeoutException
+
+DEFAULT_TIMEOUT = 10
+
+HOOK_SCRIPT = """
+if (!window.__vaWaitHooks) {
+    window.__vaWaitHooks = true;
+    const isShown = el => {
+        const style = window.getComputedStyle(el);
+        return style.display !== 'none' && style.visibility !== 'hidden' && el.getClientRects().length > 0;
+    };
+    const modalState = new WeakMap();
+    const emit = (name, detail) => document.dispatchEvent(new CustomEvent(name, {detail: detail}));
+    const inspect = records => {
+        document.querySelectorAll('.modal').forEach(modal => {
+            const shown = isShown(modal);
+            if (modalState.get(modal) !== shown) {
+                modalState.set(modal, shown);
+                emit(shown ? 'va:modal-shown' : 'va:modal-hidden', modal.id);
+            }
+        });
+        (records || []).forEach(record => record.addedNodes.forEach(node => {
+            if (node.nodeType === 1 && node.classList.contains('chat-message')) {
+                emit('va:message-appended', node.parentElement ? node.parentElement.id : null);
+            }
+        }));
+        emit('va:dom-changed');
+    };
+    inspect();
+    new MutationObserver(inspect).observe(document.documentElement, {
+        subtree: true, childList: true, attributes: true, characterData: true
+    });
+    document.addEventListener('transitionend', () => inspect(), true);
+}
+"""
+
+WAIT_SCRIPT = """
+const conditionSource = arguments[0];
+const conditionArgs = arguments[1];
+const eventNames = arguments[2];
+const timeoutMs = arguments[3];
+const done = arguments[arguments.length - 1];
+
+const condition = new Function('args', conditionSource);
+const check = () => {
+    try { return condition(conditionArgs); } catch (e) { return null; }
+};
+
+const initial = check();
+if (initial) { done(initial); return; }
+
+let timer = null;
+const onEvent = () => {
+    const result = check();
+    if (result) finish(result);
+};
+const finish = value => {
+    clearTimeout(timer);
+    eventNames.forEach(name => document.removeEventListener(name, onEvent));
+    done(value);
+};
+eventNames.forEach(name => document.addEventListener(name, onEvent));
+timer = setTimeout(() => finish(null), timeoutMs);
+"""
+
+IS_SHOWN = """
+const isShown = el => {
+    const style = window.getComputedStyle(el);
+    return style.display !== 'none' && style.visibility !== 'hidden' && el.getClientRects().length > 0;
+};
+"""
+
+
+class PageWaiter:
+    """Event-driven waits bound to one WebDriver, with timing records"""
+
+    def __init__(self, driver, timeout=DEFAULT_TIMEOUT):
+        self.driver = driver
+        self.timeout = timeout
+        self.timings = []
+
+    def until(self, label, condition, args=None, events=("va:dom-changed",), timeout=None):
+        """Wait until the JS condition (a function body using `args`) is truthy.
+
+        Returns the condition's value, which may be a DOM element.
+        Raises TimeoutException if it does not happen in time.
+        """
+        timeout = timeout or self.timeout
+        start = time.perf_counter()
+
+        self.driver.execute_script(HOOK_SCRIPT)
+        self.driver.set_script_timeout(timeout + 5)
+        result = self.driver.execute_async_script(
+            WAIT_SCRIPT, condition, args or {}, list(events), int(timeout * 1000)
+        )
+
+        elapsed = time.perf_counter() - start
+        self.timings.append((label, elapsed, bool(result)))
+        if not result:
+            raise TimeoutException(f"Timed out after {timeout}s waiting for: {label}")
+        return result
+
+    def modal_shown(self, modal_id, timeout=None):
+        """Wait for a modal to become visible and return it"""
+        return self.until(
+            f"#{modal_id} shown",
+            IS_SHOWN + "const el = document.getElementById(args.id); return el && isShown(el) ? el : null;",
+            {"id": modal_id},
+            events=("va:modal-shown", "va:dom-changed"),
+            timeout=timeout
+        )
+
+    def modal_hidden(self, modal_id, timeout=None):
+        """Wait for a modal to be hidden"""
+        return self.until(
+            f"#{modal_id} hidden",
+            IS_SHOWN + "const el = document.getElementById(args.id); return !el || !isShown(el);",
+            {"id": modal_id},
+            events=("va:modal-hidden", "va:dom-changed"),
+            timeout=timeout
+        )
+
+    def element_visible(self, element_id, timeout=None):
+        """Wait for any element to become visible and return it"""
+        return self.until(
+            f"#{element_id} visible",
+            IS_SHOWN + "const el = document.getElementById(args.id); return el && isShown(el) ? el : null;",
+            {"id": element_id},
+            timeout=timeout
+        )
+
+    def text_present(self, element_id, text, timeout=None):
+        """Wait for an element's text to contain the given text and return it"""
+        return self.until(
+            f"'{text}' in #{element_id}",
+            "const el = document.getElementById(args.id); return el && el.textContent.includes(args.text) ? el : null;",
+            {"id": element_id, "text": text},
+            timeout=timeout
+        )
+
+    def message_count(self, container_id, selector=".chat-message"):
+        """Return how many messages a chat container currently holds"""
+        return self.driver.execute_script(
+            "const el = document.getElementById(arguments[0]);"
+            "return el ? el.querySelectorAll(arguments[1]).length : 0;",
+            container_id, selector
+        )
+
+    def messages_appended(self, container_id, previous_count, selector=".chat-message", timeout=None):
+        """Wait until a chat container holds more than previous_count messages"""
+        return self.until(
+            f"{selector} appended to #{container_id}",
+            "const el = document.getElementById(args.id);"
+            "return el && el.querySelectorAll(args.selector).length > args.count;",
+            {"id": container_id, "selector": selector, "count": previous_count},
+            events=("va:message-appended", "va:dom-changed"),
+            timeout=timeout
+        )
+
+    def loaded_or_redirected(self, page, selector, timeout=None):
+        """Wait until page shows an element matching selector, or has navigated to another page"""
+        label = f"{selector} on {page} or redirect"
+        start = time.perf_counter()
+        try:
+            return self.until(
+                label,
+                "return document.querySelector(args.selector) || !location.pathname.endsWith(args.page);",
+                {"page": page, "selector": selector},
+                timeout=timeout
+            )
+        except JavascriptException:
+            # The page unloaded while the wait was running: a redirect
+            self.timings.append((label, time.perf_counter() - start, True))
+            return True
+
+    def total_time(self):
+        """Total seconds spent waiting"""
+        return sum(elapsed for _, elapsed, _ in self.timings)
+
+    def print_report(self, title="Wait timings"):
+        """Print how long each wait took, slowest first"""
+        if not self.timings:
+            return
+        print(f"\n{title} ({len(self.timings)} waits, {self.total_time():.2f}s total)")
+        for label, elapsed, ok in sorted(self.timings, key=lambda t: t[1], reverse=True):
+            status = "✓" if ok else "✗"
+            print(f"  {status} {elapsed:6.3f}s  {label}")
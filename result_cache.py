@@ -0,0 +1,267 @@
+"""
+Content-hash result cache for the static site checks.
+
+A check is identified by a test id and the files it reads. Its outcome
+and printed output are stored under a digest of those files' contents
+(plus the source of the check itself and of the repo modules it imports,
+such as site_index.py), so when nothing relevant changed the stored
+result is replayed instead of re-reading and re-scanning the files. File
+hashes are reused while a file's mtime and size are unchanged. New
+results are written to disk once, when the process exits.
+
+Script checks:
+
+    run_cached("check_va_files", ["virtual-assistant.html", "js"], main)
+
+unittest checks:
+
+    @cached_on("virtual-assistant.html")
+    def test_virtual_assistant_html_content(self): ...
+
+Pass --no-cache (or set VA_NO_CACHE=1) to always run the checks. The
+cache lives in .test-cache/results.json, or VA_RESULT_CACHE.
+"""
+import io
+import os
+import ast
+import sys
+import json
+import hashlib
+import inspect
+import unittest
+import functools
+import threading
+import contextlib
+from multiprocessing.util import Finalize
+
+SITE_ROOT = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_CACHE_FILE = os.path.join(SITE_ROOT, ".test-cache", "results.json")
+
+
+def cache_enabled():
+    return os.environ.get("VA_NO_CACHE", "0") != "1"
+
+
+def consume_no_cache_flag(argv=None):
+    """Remove --no-cache from argv (sys.argv by default) and disable the cache if present"""
+    argv = sys.argv if argv is None else argv
+    if "--no-cache" in argv:
+        argv.remove("--no-cache")
+        os.environ["VA_NO_CACHE"] = "1"
+        return True
+    return False
+
+
+class Tee(io.TextIOBase):
+    """Write to a stream while keeping a copy of everything written"""
+
+    def __init__(self, stream):
+        self.stream = stream
+        self.buffer = io.StringIO()
+
+    def write(self, text):
+        self.buffer.write(text)
+        return self.stream.write(text)
+
+    def flush(self):
+        self.stream.flush()
+
+    def getvalue(self):
+        return self.buffer.getvalue()
+
+
+class ResultCache:
+    """Stored check results keyed by test id and the hashes of the files read"""
+
+    def __init__(self, path=None):
+        self.path = path or os.environ.get("VA_RESULT_CACHE", DEFAULT_CACHE_FILE)
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._data = self._load()
+        self._stored = {}  # results stored by this process, merged into the file by save()
+
+    def _load(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return {"files": {}, "results": {}}
+        data.setdefault("files", {})
+        data.setdefault("results", {})
+        return data
+
+    def save(self):
+        """Write the results stored since the last save, keeping those other processes wrote meanwhile"""
+        with self._lock:
+            if not self._stored:
+                return
+            data = self._load()
+            data["files"].update(self._data["files"])
+            data["results"].update(self._stored)
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            tmp_path = f"{self.path}.{os.getpid()}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(data, f, indent=1)
+            os.replace(tmp_path, self.path)
+            self._stored = {}
+
+    def file_hash(self, path):
+        """Hash a file, or a directory's listing; reuse the hash while mtime and size match"""
+        full_path = path if os.path.isabs(path) else os.path.join(SITE_ROOT, path)
+        try:
+            stat = os.stat(full_path)
+        except OSError:
+            return "missing"
+
+        if os.path.isdir(full_path):
+            listing = "\n".join(sorted(os.listdir(full_path)))
+            return "dir:" + hashlib.sha256(listing.encode("utf-8")).hexdigest()
+
+        with self._lock:
+            known = self._data["files"].get(full_path)
+        if known and known[0] == stat.st_mtime_ns and known[1] == stat.st_size:
+            return known[2]
+
+        digest = hashlib.sha256()
+        with open(full_path, "rb") as f:
+            for chunk in iter(lambda: f.read(65536), b""):
+                digest.update(chunk)
+        with self._lock:
+            self._data["files"][full_path] = [stat.st_mtime_ns, stat.st_size, digest.hexdigest()]
+        return digest.hexdigest()
+
+    def digest(self, test_id, files):
+        combined = hashlib.sha256(test_id.encode("utf-8"))
+        for path in sorted(set(files)):
+            combined.update(f"\0{path}\0{self.file_hash(path)}".encode("utf-8"))
+        return combined.hexdigest()
+
+    def lookup(self, test_id, files):
+        """Return the stored result for the current file contents, or None"""
+        digest = self.digest(test_id, files)
+        with self._lock:
+            entry = self._data["results"].get(test_id)
+            if entry and entry["digest"] == digest:
+                self.hits += 1
+                return entry
+            self.misses += 1
+        return None
+
+    def store(self, test_id, files, outcome, output="", message=""):
+        entry = {
+            "digest": self.digest(test_id, files),
+            "outcome": outcome,
+            "output": output,
+            "message": message,
+        }
+        with self._lock:
+            self._data["results"][test_id] = entry
+            self._stored[test_id] = entry
+
+
+_cache = None
+
+
+def get_cache():
+    """Return the process-wide result cache, saved when the process exits"""
+    global _cache
+    if _cache is None:
+        _cache = ResultCache()
+        # A finalizer rather than atexit, so runner worker processes save too
+        Finalize(None, _cache.save, exitpriority=0)
+    return _cache
+
+
+@functools.lru_cache(maxsize=None)
+def module_dependencies(source_file):
+    """Return source_file and the source files of the repo modules it imports, recursively"""
+    found = {os.path.abspath(source_file)}
+    pending = [source_file]
+    while pending:
+        try:
+            with open(pending.pop(), "r", encoding="utf-8") as f:
+                tree = ast.parse(f.read())
+        except (OSError, SyntaxError, ValueError):
+            continue
+        for node in ast.walk(tree):
+            if isinstance(node, ast.Import):
+                names = [alias.name for alias in node.names]
+            elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+                names = [node.module]
+            else:
+                continue
+            for name in names:
+                path = os.path.join(SITE_ROOT, name.split(".")[0] + ".py")
+                if path not in found and os.path.isfile(path):
+                    found.add(path)
+                    pending.append(path)
+    return sorted(found)
+
+
+def run_cached(test_id, files, func, *args, **kwargs):
+    """Run a script check, or replay its output if none of its files changed.
+
+    func's printed output is stored; its return value is stored as the
+    outcome and returned (the cached outcome on a hit).
+    """
+    caller = inspect.stack()[1].filename
+    files = [*module_dependencies(caller), *files]
+
+    if cache_enabled():
+        entry = get_cache().lookup(test_id, files)
+        if entry:
+            sys.stdout.write(entry["output"])
+            print(f"(cached result for {test_id}, no relevant files changed)")
+            return entry["outcome"]
+
+    tee = Tee(sys.stdout)
+    with contextlib.redirect_stdout(tee):
+        outcome = func(*args, **kwargs)
+    if cache_enabled():
+        get_cache().store(test_id, files, outcome, tee.getvalue())
+    return outcome
+
+
+def cached_on(*files):
+    """Decorate a unittest test method whose result depends only on the given files.
+
+    Passes, failures and skips are replayed; unexpected errors are never cached.
+    """
+    def decorator(method):
+        source_file = inspect.getsourcefile(method)
+
+        @functools.wraps(method)
+        def wrapper(self):
+            test_id = self.id()
+            dependencies = [*module_dependencies(source_file), *files]
+
+            if cache_enabled():
+                entry = get_cache().lookup(test_id, dependencies)
+                if entry:
+                    sys.stdout.write(entry["output"])
+                    if entry["outcome"] == "failure":
+                        self.fail(f"(cached) {entry['message']}")
+                    if entry["outcome"] == "skipped":
+                        self.skipTest(f"(cached) {entry['message']}")
+                    return
+
+            tee = Tee(sys.stdout)
+            outcome, message = "passed", ""
+            try:
+                with contextlib.redirect_stdout(tee):
+                    method(self)
+            except self.failureException as e:
+                outcome, message = "failure", str(e)
+                raise
+            except unittest.SkipTest as e:
+                outcome, message = "skipped", str(e)
+                raise
+            except Exception:
+                outcome = None
+                raise
+            finally:
+                if cache_enabled() and outcome is not None:
+                    get_cache().store(test_id, dependencies, outcome, tee.getvalue(), message)
+        return wrapper
+    return decorator
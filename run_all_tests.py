@@ -1,7 +1,17 @@
 import unittest
+import argparse
+import io
 import time
 import sys
 import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing.util import Finalize
+
+from browser_profile import PROFILES
+from driver_pool import get_pool
+from driver_resolver import resolve_chromedriver
+from impact_map import changed_files_since, select_affected
+from timing_report import TimingTestResult, add_timing_arguments, finish_timing
 
 # Import all test classes
 from test_virtual_assistant_buttons import VirtualAssistantButtonTest
@@ -9,69 +19,251 @@ from test_chat_functionality import ChatFunctionalityTest
 from test_email_functionality import EmailFunctionalityTest
 from test_callback_functionality import CallbackFunctionalityTest
 
-def run_tests():
+TEST_CLASSES = [
+    VirtualAssistantButtonTest,
+    ChatFunctionalityTest,
+    EmailFunctionalityTest,
+    CallbackFunctionalityTest,
+]
+
+def print_summary(tests_run, failures, errors, skipped, over_budget=0):
+    """Print the TEST SUMMARY block and return the process exit code"""
+    print("\n" + "="*80)
+    print("TEST SUMMARY")
+    print("="*80)
+    print(f"Total tests run: {tests_run}")
+    print(f"Failures: {failures}")
+    print(f"Errors: {errors}")
+    print(f"Skipped: {skipped}")
+    print(f"Over time budget: {over_budget}")
+    print(f"Test completion time: {time.strftime('%Y-%m-%d %H:%M:%S')}")
+
+    if failures == 0 and errors == 0 and over_budget == 0:
+        print("\nALL TESTS PASSED SUCCESSFULLY!")
+        return 0
+    else:
+        print("\nTESTS FAILED - See details above")
+        return 1
+
+def run_tests(args, test_classes=TEST_CLASSES):
     """Run all test suites in sequence"""
-    
+
     # Print header
     print("\n" + "="*80)
     print("VIRTUAL ASSISTANT COMPLETE TEST SUITE")
     print("="*80)
     print(f"Starting tests at: {time.strftime('%Y-%m-%d %H:%M:%S')}")
-    print(f"Testing against server: http://localhost:8080")
+    print(f"Testing against server: {os.environ.get('VA_TEST_BASE_URL')}")
     print("="*80 + "\n")
-    
+
+    # Start a browser up front; every test class leases it in turn
+    get_pool().warm(1)
+
     # Create test suite
     test_suite = unittest.TestSuite()
     loader = unittest.TestLoader()
-    
+
     # Add all tests from each test class
-    test_suite.addTest(loader.loadTestsFromTestCase(VirtualAssistantButtonTest))
-    test_suite.addTest(loader.loadTestsFromTestCase(ChatFunctionalityTest))
-    test_suite.addTest(loader.loadTestsFromTestCase(EmailFunctionalityTest))
-    test_suite.addTest(loader.loadTestsFromTestCase(CallbackFunctionalityTest))
-    
+    for test_class in test_classes:
+        test_suite.addTest(loader.loadTestsFromTestCase(test_class))
+
     # Run the tests
-    runner = unittest.TextTestRunner(verbosity=2)
+    runner = unittest.TextTestRunner(verbosity=2, resultclass=TimingTestResult)
     result = runner.run(test_suite)
-    
-    # Print summary
+
+    over_budget = finish_timing(result.timings, args)
+
+    return print_summary(
+        result.testsRun,
+        len(result.failures),
+        len(result.errors),
+        len(result.skipped),
+        over_budget
+    )
+
+def build_shards(split_methods=False, test_classes=TEST_CLASSES):
+    """Return the dotted test names handed to the worker processes.
+
+    By default each test class is one shard so setUpClass runs once per
+    class. With split_methods every test method becomes its own shard.
+    """
+    loader = unittest.TestLoader()
+    shards = []
+    for test_class in test_classes:
+        class_name = f"{test_class.__module__}.{test_class.__name__}"
+        if split_methods:
+            for method_name in loader.getTestCaseNames(test_class):
+                shards.append(f"{class_name}.{method_name}")
+        else:
+            shards.append(class_name)
+    return shards
+
+def _init_worker():
+    """Give each worker process its own static server and browser"""
+    from dev_server import start_server, stop_server
+
+    server, base_url = start_server(port=0, preload=True)
+    # Keep a reference so the server lives as long as the worker
+    _init_worker.server = server
+    os.environ["VA_TEST_BASE_URL"] = base_url
+
+    # Shards run in this worker lease the same warm browser
+    pool = get_pool()
+    pool.warm(1)
+
+    # Workers leave through os._exit, so atexit never runs there;
+    # multiprocessing finalizers do. Quit the browsers before the server goes.
+    Finalize(None, stop_server, args=(server,), exitpriority=10)
+    Finalize(None, pool.close, exitpriority=20)
+
+def _run_shard(test_name):
+    """Run one shard inside a worker and return a picklable summary"""
+    stream = io.StringIO()
+    suite = unittest.TestLoader().loadTestsFromName(test_name)
+    runner = unittest.TextTestRunner(stream=stream, verbosity=2, resultclass=TimingTestResult)
+    result = runner.run(suite)
+
+    return {
+        "name": test_name,
+        "server": os.environ.get("VA_TEST_BASE_URL"),
+        "output": stream.getvalue(),
+        "tests_run": result.testsRun,
+        "failures": len(result.failures),
+        "errors": len(result.errors),
+        "skipped": len(result.skipped),
+        "timings": result.timings,
+    }
+
+def run_tests_parallel(args, test_classes=TEST_CLASSES):
+    """Spread the test shards over a process pool and merge the results"""
+    workers = args.workers
+    shards = build_shards(args.split_methods, test_classes)
+
+    # Print header
     print("\n" + "="*80)
-    print("TEST SUMMARY")
+    print("VIRTUAL ASSISTANT COMPLETE TEST SUITE (PARALLEL)")
     print("="*80)
-    print(f"Total tests run: {result.testsRun}")
-    print(f"Failures: {len(result.failures)}")
-    print(f"Errors: {len(result.errors)}")
-    print(f"Skipped: {len(result.skipped)}")
-    print(f"Test completion time: {time.strftime('%Y-%m-%d %H:%M:%S')}")
-    
-    if result.wasSuccessful():
-        print("\nALL TESTS PASSED SUCCESSFULLY!")
-        return 0
-    else:
-        print("\nTESTS FAILED - See details above")
-        return 1
+    print(f"Starting tests at: {time.strftime('%Y-%m-%d %H:%M:%S')}")
+    print(f"Workers: {workers} | Shards: {len(shards)}")
+    print("Each worker serves the site on its own port")
+    print("="*80 + "\n")
 
-if __name__ == "__main__":
-    # Check if server is running
+    # Resolve the driver once here so every worker hits the on-disk cache
+    resolve_chromedriver()
+
+    totals = {"tests_run": 0, "failures": 0, "errors": 0, "skipped": 0}
+    timings = []
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as executor:
+        futures = {executor.submit(_run_shard, shard): shard for shard in shards}
+
+        for future in as_completed(futures):
+            shard = futures[future]
+            print("-"*80)
+            try:
+                shard_result = future.result()
+            except Exception as e:
+                print(f"{shard}: worker crashed - {str(e)}")
+                totals["errors"] += 1
+                continue
+
+            print(f"{shard} (server: {shard_result['server']})")
+            print("-"*80)
+            print(shard_result["output"])
+            for key in totals:
+                totals[key] += shard_result[key]
+            timings.extend(shard_result["timings"])
+
+    over_budget = finish_timing(timings, args)
+
+    return print_summary(
+        totals["tests_run"],
+        totals["failures"],
+        totals["errors"],
+        totals["skipped"],
+        over_budget
+    )
+
+def parse_args(argv=None):
+    """Parse command line options"""
+    parser = argparse.ArgumentParser(description="Run the virtual assistant test suites")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="number of worker processes (default: 1, run serially)")
+    parser.add_argument("--split-methods", action="store_true",
+                        help="shard by test method instead of by test class")
+    parser.add_argument("--offline", action="store_true",
+                        help="never download chromedriver, use a cached or local one")
+    parser.add_argument("--profile", choices=PROFILES,
+                        help="browser profile, 'lean' for a reduced-resource headless browser")
+    parser.add_argument("--changed", nargs="+", metavar="FILE",
+                        help="only run test classes affected by these changed files")
+    parser.add_argument("--since", metavar="REF",
+                        help="only run test classes affected by changes since a git ref")
+    add_timing_arguments(parser)
+    return parser.parse_args(argv)
+
+def select_test_classes(args):
+    """Return the test classes to run, narrowed by --changed/--since"""
+    if not args.changed and not args.since:
+        return TEST_CLASSES
+
+    changed = list(args.changed or []) + (changed_files_since(args.since) if args.since else [])
+    selected = select_affected(TEST_CLASSES, changed)
+    print(f"{len(changed)} changed file(s), {len(selected)}/{len(TEST_CLASSES)} test classes affected")
+    for test_class in selected:
+        print(f"  - {test_class.__name__}")
+    return selected
+
+def check_server():
+    """Use the server in VA_TEST_BASE_URL, or start dev_server on a free port; exit early if it is not reachable"""
     import http.client
-    
+    from urllib.parse import urlsplit
+    from dev_server import ensure_server
+
+    external = "VA_TEST_BASE_URL" in os.environ
+    base_url = ensure_server()
+    if not external:
+        print(f"Started dev server at {base_url}")
+        return
+
+    url = urlsplit(base_url)
     try:
-        conn = http.client.HTTPConnection("localhost", 8080)
+        conn = http.client.HTTPConnection(url.hostname, url.port or 80)
         conn.request("HEAD", "/")
         response = conn.getresponse()
         conn.close()
-        
+
         if response.status >= 200 and response.status < 400:
-            print("Server is running on http://localhost:8080")
+            print(f"Server is running on {base_url}")
         else:
             print("WARNING: Server returned status code:", response.status)
             print("Tests may fail if the server is not properly running")
     except Exception as e:
-        print("ERROR: Could not connect to server at http://localhost:8080")
-        print("Please start the server before running tests with:")
-        print("python -m http.server 8080")
+        print(f"ERROR: Could not connect to server at {base_url}")
+        print("Start it with 'python dev_server.py', or unset VA_TEST_BASE_URL to start one automatically")
         print(f"Error details: {str(e)}")
         sys.exit(1)
-    
+
+if __name__ == "__main__":
+    args = parse_args()
+
+    if args.offline:
+        # Inherited by the worker processes as well
+        os.environ["VA_OFFLINE"] = "1"
+
+    if args.profile:
+        os.environ["VA_BROWSER_PROFILE"] = args.profile
+
+    test_classes = select_test_classes(args)
+    if not test_classes:
+        print("No test classes affected by the changes, nothing to run")
+        sys.exit(0)
+
+    if args.workers > 1:
+        # Workers start their own servers, no shared server needed
+        sys.exit(run_tests_parallel(args, test_classes))
+
+    check_server()
+
     # Run the tests
-    sys.exit(run_tests())
+    sys.exit(run_tests(args, test_classes))
@@ -1,12 +1,70 @@
 #!/usr/bin/env python3
 """
 Run all authentication and authorization tests.
+
+By default every test script runs in its own Python process. With
+--in-process the suites are imported once, the test users and Supabase
+clients are built once up front, and the independent suites run
+concurrently on threads while each one's output is still captured
+separately. The interactive suite runs afterwards with live output, which
+is captured as well and replayed if it fails.
+
+With --local-supabase the suites run against local_supabase.py on a
+free port instead of the real project (the SUPABASE_* variables are
+pointed at it before any suite is imported or started).
 """
+import argparse
+import importlib
+import io
 import subprocess
 import sys
 import os
+import threading
+import time
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from pathlib import Path
 
+from timing_report import add_timing_arguments, finish_timing, make_record
+
+# (script, description, can run concurrently with other suites)
+TESTS = [
+    # Prompts for input, so it runs on its own with live output
+    ("test_auth_flow.py", "Authentication Flow Test", False),
+    # Resets the password of its own user (RESET_TEST_EMAIL), not TEST_EMAIL
+    ("test_password_reset_flow.py", "Password Reset Flow Test", True),
+    ("test_auth_protection.py", "Authorization Protection Test", True)
+]
+
+class ThreadOutput:
+    """Stand-in for sys.stdout that gives each thread its own buffer."""
+
+    def __init__(self, stream):
+        self.stream = stream
+        self.local = threading.local()
+
+    def write(self, text):
+        buffer = getattr(self.local, "buffer", None)
+        if buffer is not None and getattr(self.local, "echo", False):
+            self.stream.write(text)
+        return (buffer or self.stream).write(text)
+
+    def flush(self):
+        buffer = getattr(self.local, "buffer", None)
+        (buffer or self.stream).flush()
+
+    @contextmanager
+    def capture(self, echo=False):
+        """Capture everything the current thread writes, also passing it through with echo."""
+        self.local.buffer = io.StringIO()
+        self.local.echo = echo
+        try:
+            yield self.local.buffer
+        finally:
+            self.local.buffer = None
+            self.local.echo = False
+
 def run_test(script_name, description):
     """Run a test script and print the result."""
     print(f"\n{'='*60}")
@@ -36,30 +94,180 @@ def run_test(script_name, description):
         print(f"❌ Error running test: {str(e)}")
         return False
 
+def build_shared_context(scripts):
+    """Import the suites and build the test users and clients once."""
+    from supabase import create_client
+
+    print("Preparing shared test users and clients...")
+    try:
+        from test_auth_flows import AuthTester
+        import test_password_reset_flow
+
+        tester = AuthTester()
+        users_ready = tester.ensure_test_user()
+        # The reset flow has a user of its own, starting from its original password
+        tester.test_email = test_password_reset_flow.TEST_EMAIL
+        tester.test_password = test_password_reset_flow.TEST_PASSWORD
+        users_ready = tester.ensure_test_user() and users_ready
+    except Exception as e:
+        print(f"Error preparing the test users: {str(e)}")
+        users_ready = False
+    if not users_ready:
+        print("⚠️ Could not ensure the test users exist, suites may fail")
+
+    modules = {}
+    clients = {}
+    for script in scripts:
+        module = importlib.import_module(Path(script).stem)
+        modules[script] = module
+        # Each suite signs in and out, so concurrent suites get their own client
+        try:
+            clients[script] = create_client(module.SUPABASE_URL, module.SUPABASE_KEY)
+        except Exception as e:
+            print(f"⚠️ Could not create client for {script}, it will build its own: {str(e)}")
+            clients[script] = None
+    return modules, clients
+
+def run_in_process(script, module, client, output, echo=False):
+    """Run one imported suite, capturing its output (and with echo, also showing it live)."""
+    start = time.perf_counter()
+    stdout = ""
+    error = None
+
+    try:
+        with output.capture(echo) as buffer:
+            try:
+                passed = bool(module.run_tests(client=client))
+            finally:
+                stdout = buffer.getvalue()
+    except BaseException as e:
+        if isinstance(e, KeyboardInterrupt):
+            raise
+        passed = False
+        error = traceback.format_exc()
+
+    return {
+        "script": script,
+        "passed": passed,
+        "stdout": stdout,
+        "error": error,
+        "duration": time.perf_counter() - start,
+    }
+
+def print_in_process_result(description, result, header=True, replay=True):
+    """Print a suite result in the same format as the subprocess mode."""
+    if header:
+        print(f"\n{'='*60}")
+        print(f"RUNNING: {description}")
+        print(f"{'='*60}")
+
+    if result["passed"]:
+        if replay:
+            print(result["stdout"])
+        print("✅ Test passed")
+    else:
+        print("❌ Test failed")
+        print("=== STDOUT ===")
+        print(result["stdout"])
+        print("=== STDERR ===")
+        print(result["error"] or "")
+
+def run_all_in_process(tests, jobs):
+    """Run the suites in this interpreter and return their results."""
+    modules, clients = build_shared_context([script for script, _, _ in tests])
+    descriptions = {script: description for script, description, _ in tests}
+    concurrent = [script for script, _, can_share in tests if can_share]
+    serial = [script for script, _, can_share in tests if not can_share]
+    results = []
+
+    original_stdout = sys.stdout
+    sys.stdout = ThreadOutput(original_stdout)
+    try:
+        with ThreadPoolExecutor(max_workers=max(1, jobs)) as executor:
+            futures = [
+                executor.submit(run_in_process, script, modules[script], clients[script], sys.stdout)
+                for script in concurrent
+            ]
+            for future in futures:
+                result = future.result()
+                print_in_process_result(descriptions[result["script"]], result)
+                results.append(result)
+
+        # Interactive suites run last, one at a time, with live output
+        for script in serial:
+            print(f"\n{'='*60}")
+            print(f"RUNNING: {descriptions[script]} (interactive)")
+            print(f"{'='*60}")
+            result = run_in_process(script, modules[script], clients[script], sys.stdout, echo=True)
+            print_in_process_result(descriptions[script], result, header=False, replay=False)
+            results.append(result)
+    finally:
+        sys.stdout = original_stdout
+
+    return results
+
+def parse_args(argv=None):
+    """Parse command line options."""
+    parser = argparse.ArgumentParser(description="Run the authentication tests")
+    parser.add_argument("--in-process", action="store_true",
+                        help="import the suites and share one test user and set of clients")
+    parser.add_argument("--jobs", type=int, default=len(TESTS), metavar="N",
+                        help="suites to run concurrently in --in-process mode")
+    parser.add_argument("--local-supabase", action="store_true",
+                        help="run against a local Supabase stand-in instead of the real project")
+    add_timing_arguments(parser)
+    return parser.parse_args(argv)
+
 def main():
     """Main function to run all auth tests."""
+    args = parse_args()
+
     # Ensure we're in the correct directory
     os.chdir(Path(__file__).parent)
     
     print("🚀 Starting Authentication & Authorization Tests")
     print("="*60)
-    
-    # Run tests in order
-    tests = [
-        ("test_auth_flow.py", "Authentication Flow Test"),
-        ("test_password_reset_flow.py", "Password Reset Flow Test"),
-        ("test_auth_protection.py", "Authorization Protection Test")
-    ]
+
+    if args.local_supabase:
+        from local_supabase import use_local_supabase
+        use_local_supabase()
+        print(f"Using local Supabase at {os.environ['SUPABASE_URL']}")
     
     all_passed = True
-    for script, description in tests:
+    timings = []
+    tests = []
+    for script, description, can_share in TESTS:
         if not os.path.exists(script):
             print(f"\n❌ Test script not found: {script}")
             all_passed = False
             continue
-            
-        if not run_test(script, description):
-            all_passed = False
+        tests.append((script, description, can_share))
+    
+    if args.in_process:
+        for result in run_all_in_process(tests, args.jobs):
+            timings.append(make_record(
+                result["script"],
+                result["duration"],
+                "passed" if result["passed"] else "failure",
+                message=result["error"] or ""
+            ))
+            if not result["passed"]:
+                all_passed = False
+    else:
+        # Run tests in order
+        for script, description, _ in tests:
+            start = time.perf_counter()
+            passed = run_test(script, description)
+            timings.append(make_record(
+                script,
+                time.perf_counter() - start,
+                "passed" if passed else "failure"
+            ))
+            if not passed:
+                all_passed = False
+    
+    if finish_timing(timings, args):
+        all_passed = False
     
     # Print final result
     print("\n" + "="*60)
@@ -7,8 +7,8 @@ echo Installing required packages...
 pip install -r test-requirements.txt
 
 echo.
-echo Starting local HTTP server on port 8000...
-start cmd /k "python -m http.server 8000"
+echo Starting local dev server on port 8000...
+start cmd /k "python dev_server.py 8000"
 
 echo.
 echo Waiting for server to start...
@@ -20,7 +20,11 @@ echo.
 echo Running basic virtual assistant test...
 python simple_va_test.py
 echo.
+echo Checking links and assets...
+python link_checker.py
+echo.
 echo Running comprehensive tests...
+set VA_TEST_BASE_URL=http://localhost:8000
 python run_all_tests.py
 
 echo.
@@ -29,7 +33,7 @@ pause > nul
 
 echo.
 echo Stopping server...
-taskkill /f /im python.exe /fi "WINDOWTITLE eq C:\Windows\system32\cmd.exe - python -m http.server 8000"
+taskkill /f /im python.exe /fi "WINDOWTITLE eq C:\Windows\system32\cmd.exe - python dev_server.py 8000"
 
 echo.
 echo Done!
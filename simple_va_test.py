@@ -1,71 +1,83 @@
 import os
 import sys
 
+from result_cache import consume_no_cache_flag, run_cached
+from site_index import get_index
+
 # Get the base path
 base_path = os.path.dirname(os.path.abspath(__file__))
-print(f"Testing files in: {base_path}")
 
-# Test 1: Check if required files exist
-print("\n===== TEST 1: FILE EXISTENCE =====")
-required_files = [
-    os.path.join(base_path, "virtual-assistant.html"),
-    os.path.join(base_path, "css", "virtual-assistant.css"),
-    os.path.join(base_path, "js", "chat-handler.js"),
-    os.path.join(base_path, "js", "virtual-assistant.js")
+REQUIRED_FILES = [
+    "virtual-assistant.html",
+    os.path.join("css", "virtual-assistant.css"),
+    os.path.join("js", "chat-handler.js"),
+    os.path.join("js", "virtual-assistant.js")
+]
+
+HTML_ELEMENTS = [
+    ("Chat button", "#chat-button"),
+    ("Chat modal", "#chat-modal"),
+    ("Chat messages container", "#chat-messages"),
+    ("Chat input", "#chat-input"),
+    ("Send button", "#send-chat"),
+    ("Email form", "#email-modal"),
+    ("Callback form", "#callback-modal")
+]
+
+# (container, elements it must contain)
+ELEMENT_STRUCTURE = [
+    (".communication-options", ["#chat-button", "#email-button", "#callback-button"]),
+    ("#chat-modal", ["#chat-messages", "#chat-input", "#send-chat"]),
+    ("#email-modal", ["#email-name", "#email-address", "#email-subject", "#email-message", "#send-email", "#email-status"]),
+    ("#callback-modal", ["#callback-name", "#callback-phone", "#callback-time", "#callback-reason", "#request-callback", "#callback-status"])
+]
+
+JS_FUNCTIONS = [
+    ("Send chat message function", "sendChatMessage"),
+    ("Close chat modal function", "closeChatModal"),
+    ("Open chat function", "openChat"),
+    ("Chat handler class", "ChatHandler"),
+    ("DOM content loaded event", "DOMContentLoaded")
 ]
 
-for file_path in required_files:
-    if os.path.exists(file_path):
-        print(f"✓ File exists: {os.path.basename(file_path)}")
+def check_results(index):
+    """Return every check's result as (section, label, passed)"""
+    page, script = "virtual-assistant.html", "js/chat-handler.js"
+    results = [("FILE EXISTENCE", f"File exists: {path.replace(os.sep, '/')}", index.exists(path.replace(os.sep, "/")))
+               for path in REQUIRED_FILES]
+
+    if index.page(page):
+        results += [("HTML ELEMENTS", f"{name} in {page}", index.has_selector(page, selector))
+                    for name, selector in HTML_ELEMENTS]
+    else:
+        results.append(("HTML ELEMENTS", f"Cannot check HTML elements: {page} does not exist", False))
+
+    if script in index.scripts:
+        results += [("JAVASCRIPT FUNCTIONS", f"{name} in chat-handler.js", index.js_defines(script, symbol))
+                    for name, symbol in JS_FUNCTIONS]
     else:
-        print(f"✗ File does not exist: {os.path.basename(file_path)}")
+        results.append(("JAVASCRIPT FUNCTIONS", "Cannot check JS functions: chat-handler.js does not exist", False))
+
+    if index.page(page):
+        results += [("ELEMENT STRUCTURE", f"{container} contains {child}", index.contains(page, container, child))
+                    for container, children in ELEMENT_STRUCTURE for child in children]
+    else:
+        results.append(("ELEMENT STRUCTURE", f"Cannot check element structure: {page} does not exist", False))
+    return results
+
+def main():
+    """Run the file, HTML element, JS function and element structure checks"""
+    print(f"Testing files in: {base_path}")
 
-# Test 2: Check HTML elements
-print("\n===== TEST 2: HTML ELEMENTS =====")
-html_file = os.path.join(base_path, "virtual-assistant.html")
-if os.path.exists(html_file):
-    with open(html_file, 'r', encoding='utf-8') as f:
-        content = f.read()
-    
-    html_elements = [
-        ("Chat button", 'id="chat-button"'),
-        ("Chat modal", 'id="chat-modal"'),
-        ("Chat messages container", 'id="chat-messages"'),
-        ("Chat input", 'id="chat-input"'),
-        ("Send button", 'id="send-chat"'),
-        ("Email form", 'id="email-modal"'),
-        ("Callback form", 'id="callback-modal"')
-    ]
-    
-    for name, pattern in html_elements:
-        if pattern in content:
-            print(f"✓ Found {name} in virtual-assistant.html")
-        else:
-            print(f"✗ Missing {name} in virtual-assistant.html")
-else:
-    print("✗ Cannot check HTML elements: virtual-assistant.html does not exist")
+    sections = []
+    for section, label, passed in check_results(get_index()):
+        if section not in sections:
+            sections.append(section)
+            print(f"\n===== TEST {len(sections)}: {section} =====")
+        print(f"{'✓' if passed else '✗'} {label}")
 
-# Test 3: Check JS functions
-print("\n===== TEST 3: JAVASCRIPT FUNCTIONS =====")
-js_file = os.path.join(base_path, "js", "chat-handler.js")
-if os.path.exists(js_file):
-    with open(js_file, 'r', encoding='utf-8') as f:
-        content = f.read()
-    
-    js_functions = [
-        ("Send chat message function", "sendChatMessage"),
-        ("Close chat modal function", "closeChatModal"),
-        ("Open chat function", "openChat"),
-        ("Chat handler class", "ChatHandler"),
-        ("DOM content loaded event", "DOMContentLoaded")
-    ]
-    
-    for name, pattern in js_functions:
-        if pattern in content:
-            print(f"✓ Found {name} in chat-handler.js")
-        else:
-            print(f"✗ Missing {name} in chat-handler.js")
-else:
-    print("✗ Cannot check JS functions: chat-handler.js does not exist")
+    print("\n===== TEST COMPLETE =====")
 
-print("\n===== TEST COMPLETE =====")
+if __name__ == "__main__":
+    consume_no_cache_flag()
+    run_cached("simple_va_test", REQUIRED_FILES, main)
@@ -0,0 +1,312 @@
+#!/usr/bin/env python3
+"""
+Single-pass index of the site's pages and scripts for the static checks.
+
+Every *.html page is streamed once through an HTML parser into its ids,
+classes, scripts, links and element nesting, and every js/*.js file into
+the functions, methods, classes and event listeners it defines. Markup
+inside comments and scripts is not counted as elements. The index is
+persisted to .test-cache/site-index.json (or VA_SITE_INDEX) and on later
+runs only files whose mtime or size changed are parsed again.
+
+    index = get_index()
+    index.has_selector("virtual-assistant.html", "#chat-modal")
+    index.contains("virtual-assistant.html", "#chat-modal", "#chat-input")
+    index.js_defines("js/chat-handler.js", "sendChatMessage")
+
+unittest suites can mix in DomAssertions for assertElement() and
+assertContains().
+
+Usage:
+    python site_index.py            # build or refresh the index, print a summary
+    python site_index.py PAGE       # print the index entry for one file
+"""
+import os
+import re
+import sys
+import json
+import glob
+import threading
+from html.parser import HTMLParser
+
+SITE_ROOT = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_INDEX_FILE = os.path.join(SITE_ROOT, ".test-cache", "site-index.json")
+INDEX_VERSION = 2
+READ_CHUNK = 65536
+
+FUNCTION_PATTERN = re.compile(r"\bfunction\s*\*?\s*([A-Za-z_$][\w$]*)\s*\(")
+ASSIGNED_FUNCTION_PATTERN = re.compile(
+    r"\b([A-Za-z_$][\w$]*)\s*[:=]\s*(?:async\s+)?(?:function\b|\([^()]*\)\s*=>|[A-Za-z_$][\w$]*\s*=>)"
+)
+METHOD_PATTERN = re.compile(r"^\s*(?:static\s+)?(?:async\s+)?\*?([A-Za-z_$][\w$]*)\s*\([^()]*\)\s*\{", re.M)
+CLASS_PATTERN = re.compile(r"\bclass\s+([A-Za-z_$][\w$]*)")
+LISTENER_PATTERN = re.compile(r"\.addEventListener\(\s*['\"]\s*([\w:-]+)\s*['\"]")
+NOT_METHODS = {"if", "for", "while", "switch", "catch", "function", "return", "with"}
+SELECTOR_PATTERN = re.compile(r"^([a-zA-Z][\w-]*)?(?:#([\w-]+))?((?:\.[\w-]+)*)$")
+VOID_TAGS = {
+    "area", "base", "br", "col", "embed", "hr", "img", "input",
+    "link", "meta", "param", "source", "track", "wbr",
+}
+
+
+class PageParser(HTMLParser):
+    """Collect ids, classes, scripts, links and element nesting of a page in one pass.
+
+    Only elements with an id or a class are recorded, as
+    [tag, id, classes, index of the nearest recorded ancestor or -1].
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.ids = {}
+        self.classes = {}
+        self.scripts = []
+        self.links = []
+        self.elements = []
+        self._stack = []  # (tag, index of the nearest recorded element)
+
+    def _parent(self):
+        return self._stack[-1][1] if self._stack else -1
+
+    def handle_starttag(self, tag, attrs, self_closing=False):
+        attrs = dict(attrs)
+        element_id = attrs.get("id")
+        class_names = (attrs.get("class") or "").split()
+        if element_id and element_id not in self.ids:
+            self.ids[element_id] = tag
+        for class_name in class_names:
+            self.classes[class_name] = self.classes.get(class_name, 0) + 1
+
+        recorded = self._parent()
+        if element_id or class_names:
+            self.elements.append([tag, element_id, class_names, recorded])
+            recorded = len(self.elements) - 1
+        if tag not in VOID_TAGS and not self_closing:
+            self._stack.append((tag, recorded))
+
+        if tag == "script":
+            self.scripts.append(attrs.get("src") or "inline")
+        elif tag == "link" and attrs.get("href"):
+            self.links.append(attrs["href"])
+        elif tag == "a" and attrs.get("href"):
+            self.links.append(attrs["href"])
+
+    def handle_startendtag(self, tag, attrs):
+        self.handle_starttag(tag, attrs, self_closing=True)
+
+    def handle_endtag(self, tag):
+        # Close up to the matching tag, which also closes implicitly ended elements
+        for position in range(len(self._stack) - 1, -1, -1):
+            if self._stack[position][0] == tag:
+                del self._stack[position:]
+                return
+
+
+def parse_page(stream):
+    """Parse a page from a text stream, chunk by chunk"""
+    parser = PageParser()
+    for chunk in iter(lambda: stream.read(READ_CHUNK), ""):
+        parser.feed(chunk)
+    parser.close()
+    return {
+        "ids": parser.ids,
+        "classes": parser.classes,
+        "scripts": parser.scripts,
+        "links": parser.links,
+        "elements": parser.elements,
+    }
+
+
+def parse_selector(selector):
+    """Split a simple 'tag#id.class' selector into (tag, id, classes)"""
+    match = SELECTOR_PATTERN.match(selector.strip())
+    if not match or not any(match.groups()):
+        raise ValueError(f"Unsupported selector '{selector}', expected tag, #id and/or .class parts")
+    tag, element_id, classes = match.groups()
+    return tag, element_id, [c for c in classes.split(".") if c]
+
+
+def _matches(element, selector):
+    tag, element_id, classes = selector
+    return ((not tag or element[0] == tag) and
+            (not element_id or element[1] == element_id) and
+            all(c in element[2] for c in classes))
+
+
+def parse_script(stream):
+    text = stream.read()
+    methods = {name for name in METHOD_PATTERN.findall(text) if name not in NOT_METHODS}
+    return {
+        "functions": sorted(set(FUNCTION_PATTERN.findall(text)) |
+                            set(ASSIGNED_FUNCTION_PATTERN.findall(text))),
+        "methods": sorted(methods),
+        "classes": sorted(set(CLASS_PATTERN.findall(text))),
+        "events": sorted(set(LISTENER_PATTERN.findall(text))),
+    }
+
+
+def _relpath(path):
+    return os.path.relpath(path, SITE_ROOT).replace(os.sep, "/")
+
+
+def site_files():
+    """Return the pages and scripts that belong in the index"""
+    pages = glob.glob(os.path.join(SITE_ROOT, "*.html"))
+    scripts = glob.glob(os.path.join(SITE_ROOT, "js", "**", "*.js"), recursive=True)
+    return sorted(_relpath(p) for p in pages), sorted(_relpath(s) for s in scripts)
+
+
+class SiteIndex:
+    """Parsed pages and scripts, refreshed incrementally from disk"""
+
+    def __init__(self, path=None):
+        self.path = path or os.environ.get("VA_SITE_INDEX", DEFAULT_INDEX_FILE)
+        self.pages = {}
+        self.scripts = {}
+        self.parsed = 0
+        self._lock = threading.Lock()
+
+    def load(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return self
+        if data.get("version") == INDEX_VERSION:
+            self.pages = data.get("pages", {})
+            self.scripts = data.get("scripts", {})
+        return self
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"version": INDEX_VERSION, "pages": self.pages, "scripts": self.scripts}, f)
+        os.replace(tmp_path, self.path)
+
+    def _update(self, table, path, parse):
+        full_path = os.path.join(SITE_ROOT, path)
+        try:
+            stat = os.stat(full_path)
+        except OSError:
+            return table.pop(path, None) is not None
+
+        entry = table.get(path)
+        if entry and entry["mtime"] == stat.st_mtime_ns and entry["size"] == stat.st_size:
+            return False
+        with open(full_path, "r", encoding="utf-8", errors="replace") as f:
+            entry = parse(f)
+        entry.update(mtime=stat.st_mtime_ns, size=stat.st_size)
+        table[path] = entry
+        self.parsed += 1
+        return True
+
+    def refresh(self, paths=None):
+        """Re-parse changed files (all files, or just the given paths); return True if any changed"""
+        with self._lock:
+            if paths is None:
+                pages, scripts = site_files()
+                changed = (self.pages.keys() - set(pages)) | (self.scripts.keys() - set(scripts))
+                for path in changed:
+                    self.pages.pop(path, None)
+                    self.scripts.pop(path, None)
+                changed = bool(changed)
+            else:
+                pages = [p for p in paths if p.endswith(".html") and "/" not in p]
+                scripts = [p for p in paths if p.endswith(".js") and p.startswith("js/")]
+                changed = False
+
+            for path in pages:
+                changed |= self._update(self.pages, path, parse_page)
+            for path in scripts:
+                changed |= self._update(self.scripts, path, parse_script)
+            return changed
+
+    def exists(self, path):
+        """True if the file is indexed, or exists on disk for anything else"""
+        return path in self.pages or path in self.scripts or os.path.exists(os.path.join(SITE_ROOT, path))
+
+    def page(self, path):
+        return self.pages.get(path)
+
+    def has_id(self, page, element_id):
+        entry = self.pages.get(page)
+        return bool(entry) and element_id in entry["ids"]
+
+    def has_class(self, page, class_name):
+        entry = self.pages.get(page)
+        return bool(entry) and class_name in entry["classes"]
+
+    def select(self, page, selector):
+        """Return the indexes of a page's elements matching a simple 'tag#id.class' selector"""
+        entry = self.pages.get(page)
+        if not entry:
+            return []
+        parsed = parse_selector(selector)
+        return [i for i, element in enumerate(entry["elements"]) if _matches(element, parsed)]
+
+    def has_selector(self, page, selector):
+        """True if a page has an element matching the selector"""
+        if selector.startswith("#") and "." not in selector:
+            return self.has_id(page, selector[1:])
+        return bool(self.select(page, selector))
+
+    def contains(self, page, outer, inner):
+        """True if an element matching `inner` is nested inside one matching `outer`"""
+        outer_matches = set(self.select(page, outer))
+        if not outer_matches:
+            return False
+        elements = self.pages[page]["elements"]
+        for position in self.select(page, inner):
+            parent = elements[position][3]
+            while parent != -1:
+                if parent in outer_matches:
+                    return True
+                parent = elements[parent][3]
+        return False
+
+    def js_has(self, script, kind, name):
+        """True if a script defines `name` as a function, method or class, or listens for event `name`"""
+        entry = self.scripts.get(script)
+        return bool(entry) and name in entry[kind]
+
+    def js_defines(self, script, name):
+        """True if a script defines `name` in any form or listens for it as an event"""
+        return any(self.js_has(script, kind, name) for kind in ("functions", "methods", "classes", "events"))
+
+
+class DomAssertions:
+    """unittest mixin with structure assertions against the site index"""
+
+    def assertElement(self, page, selector, msg=None):
+        if not get_index().has_selector(page, selector):
+            self.fail(msg or f"{page} has no element matching {selector}")
+
+    def assertContains(self, page, outer, inner, msg=None):
+        self.assertElement(page, outer, msg)
+        if not get_index().contains(page, outer, inner):
+            self.fail(msg or f"{outer} in {page} does not contain {inner}")
+
+
+_index = None
+
+
+def get_index():
+    """Return the process-wide index, loaded from disk and refreshed"""
+    global _index
+    if _index is None:
+        _index = SiteIndex().load()
+        if _index.refresh():
+            _index.save()
+    return _index
+
+
+if __name__ == "__main__":
+    index = get_index()
+    if len(sys.argv) > 1:
+        for path in sys.argv[1:]:
+            entry = index.pages.get(path) or index.scripts.get(path)
+            print(json.dumps(entry, indent=2) if entry else f"✗ {path} is not indexed")
+    else:
+        print(f"✓ Indexed {len(index.pages)} pages and {len(index.scripts)} scripts "
+              f"({index.parsed} parsed this run) in {index.path}")
@@ -0,0 +1,162 @@
+"""
+Shared HTTP session for the Supabase probe and env scripts.
+
+SupabaseSession is a requests.Session that keeps connections alive in a
+pool per host, so a script's second and later calls skip the TCP and
+TLS handshakes. Requests get a default (connect, read) timeout. 429 and
+5xx responses are retried with exponential backoff, honouring
+Retry-After. POSTs are retried on 429 only, because only then is the
+request known not to have run (send-email must not send twice).
+
+Every response carries a `timing` dict, and the session keeps them all
+in `session.timings`:
+
+    connect   DNS + TCP + TLS time (0 when a pooled connection was reused)
+    server    request sent until the response headers arrived: server time,
+              one round trip and any retry backoff
+    total     connect + server
+    retries   how many times the request was retried
+
+    with supabase_session() as session:        # SUPABASE_URL / SUPABASE_ANON_KEY
+        session.get("/rest/v1/")
+        session.get("/rest/v1/purchases", params={"select": "*", "limit": 1})
+        session.print_timings()
+"""
+import os
+import time
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.util.retry import Retry
+
+MANAGEMENT_API_URL = "https://api.supabase.com"
+DEFAULT_TIMEOUT = (5, 30)  # (connect, read) seconds
+DEFAULT_RETRIES = 3
+DEFAULT_BACKOFF = 0.5  # seconds; doubles on every retry
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+POOL_CONNECTIONS = 4  # hosts kept in the pool: the project, api.supabase.com, ...
+POOL_MAXSIZE = 10  # connections per host
+
+_connects = threading.local()
+
+
+class _TimedConnect:
+    """Adds the time connect() takes to the current thread's tally"""
+
+    def connect(self):
+        start = time.perf_counter()
+        try:
+            super().connect()
+        finally:
+            _connects.seconds = getattr(_connects, "seconds", 0.0) + time.perf_counter() - start
+
+
+class TimedHTTPConnection(_TimedConnect, HTTPConnection):
+    pass
+
+
+class TimedHTTPSConnection(_TimedConnect, HTTPSConnection):
+    pass
+
+
+class TimedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = TimedHTTPConnection
+
+
+class TimedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = TimedHTTPSConnection
+
+
+class ProbeRetry(Retry):
+    """Retry on RETRY_STATUSES for idempotent methods, and on 429 for any method"""
+
+    def is_retry(self, method, status_code, has_retry_after=False):
+        if status_code == 429 and self.total:
+            return True
+        return super().is_retry(method, status_code, has_retry_after)
+
+
+class TimedAdapter(HTTPAdapter):
+    """HTTPAdapter whose connections report how long they took to open"""
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {"http": TimedHTTPConnectionPool,
+                                                   "https": TimedHTTPSConnectionPool}
+
+    def send(self, request, *args, **kwargs):
+        _connects.seconds = 0.0
+        response = super().send(request, *args, **kwargs)
+        response.connect_seconds = _connects.seconds
+        return response
+
+
+class SupabaseSession(requests.Session):
+    """requests.Session with pooled keep-alive connections, retries, default timeouts and timings"""
+
+    def __init__(self, base_url=None, headers=None, timeout=DEFAULT_TIMEOUT, retries=DEFAULT_RETRIES,
+                 backoff=DEFAULT_BACKOFF, pool_connections=POOL_CONNECTIONS, pool_maxsize=POOL_MAXSIZE):
+        super().__init__()
+        self.base_url = base_url.rstrip("/") if base_url else None
+        self.timeout = timeout
+        self.timings = []
+        retry = ProbeRetry(total=retries, backoff_factor=backoff, status_forcelist=RETRY_STATUSES,
+                           respect_retry_after_header=True, raise_on_status=False)
+        adapter = TimedAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize, max_retries=retry)
+        self.mount("https://", adapter)
+        self.mount("http://", adapter)
+        self.headers.update(headers or {})
+        self.hooks["response"].append(self._record_timing)
+
+    def request(self, method, url, *args, **kwargs):
+        """Send a request; paths starting with / are relative to base_url"""
+        if self.base_url and url.startswith("/"):
+            url = self.base_url + url
+        kwargs.setdefault("timeout", self.timeout)
+        return super().request(method, url, *args, **kwargs)
+
+    def _record_timing(self, response, *args, **kwargs):
+        connect = getattr(response, "connect_seconds", 0.0)
+        total = response.elapsed.total_seconds()
+        history = getattr(getattr(response.raw, "retries", None), "history", ())
+        response.timing = {
+            "method": response.request.method,
+            "url": response.request.url,
+            "status": response.status_code,
+            "connect": connect,
+            "server": max(0.0, total - connect),
+            "total": total,
+            "retries": len(history),
+        }
+        self.timings.append(response.timing)
+
+    def print_timings(self):
+        """Print connect and server time for every request sent so far"""
+        if not self.timings:
+            return
+        print("\nRequest timings:")
+        for timing in self.timings:
+            path = timing["url"][len(self.base_url):] if self.base_url and timing["url"].startswith(self.base_url) \
+                else timing["url"]
+            connection = f"connect {timing['connect'] * 1000:6.1f}ms" if timing["connect"] else "reused connection "
+            retries = f", {timing['retries']} retr{'y' if timing['retries'] == 1 else 'ies'}" if timing["retries"] else ""
+            print(f"  {timing['method']:6} {timing['status']}  {connection}  server {timing['server'] * 1000:6.1f}ms  "
+                  f"total {timing['total'] * 1000:6.1f}ms  {path.split('?')[0]}{retries}")
+
+
+def supabase_session(url=None, key=None, **kwargs):
+    """Session for the project's REST, auth and function APIs with the API key headers set"""
+    url = url or os.getenv("SUPABASE_URL")
+    key = key or os.getenv("SUPABASE_ANON_KEY")
+    headers = {"apikey": key, "Authorization": f"Bearer {key}"} if key else {}
+    return SupabaseSession(url, headers, **kwargs)
+
+
+def management_session(access_token=None, **kwargs):
+    """Session for the Management API (api.supabase.com) with SUPABASE_ACCESS_TOKEN set"""
+    access_token = access_token or os.getenv("SUPABASE_ACCESS_TOKEN")
+    headers = {"Authorization": f"Bearer {access_token}", "Content-Type": "application/json"}
+    return SupabaseSession(MANAGEMENT_API_URL, headers, **kwargs)
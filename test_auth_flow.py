@@ -22,11 +22,11 @@ def print_step(step_num, description):
     print(f"STEP {step_num}: {description}")
     print(f"{'='*50}")
 
-def test_signup():
+def test_signup(client=None):
     print_step(1, "Testing Sign Up")
     
-    # Create a new client for signup
-    supabase = create_client(SUPABASE_URL, SUPABASE_KEY)
+    # Use the given client (run_auth_tests.py builds one up front) or create a new one
+    supabase = client or create_client(SUPABASE_URL, SUPABASE_KEY)
     
     try:
         # First, try to delete the test user if it exists
@@ -75,6 +75,7 @@ def test_signup():
 def test_login():
     print_step(2, "Testing Login")
     
+    # A new client, so the login starts signed out
     supabase = create_client(SUPABASE_URL, SUPABASE_KEY)
     
     try:
@@ -103,8 +104,10 @@ def test_login():
         return False
 
 def test_password_reset():
+    global TEST_PASSWORD
     print_step(3, "Testing Password Reset")
     
+    # A new client, so the reset does not reuse the login's session
     supabase = create_client(SUPABASE_URL, SUPABASE_KEY)
     
     try:
@@ -148,7 +151,6 @@ def test_password_reset():
         if result.user:
             print("✅ Successfully logged in with new password!")
             # Update the test password for subsequent tests
-            global TEST_PASSWORD
             TEST_PASSWORD = new_password
             return True
         else:
@@ -159,7 +161,7 @@ def test_password_reset():
         print(f"❌ Password reset test failed: {str(e)}")
         return False
 
-def run_tests():
+def run_tests(client=None):
     print("Starting authentication flow tests...")
     tests_passed = 0
     total_tests = 3
@@ -168,7 +170,7 @@ def run_tests():
     print("\n" + "="*60)
     print("RUNNING SIGNUP TEST")
     print("="*60)
-    if test_signup():
+    if test_signup(client):
         tests_passed += 1
     
     # Test login
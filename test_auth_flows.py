@@ -2,7 +2,10 @@ import os
 import time
 import requests
 from supabase import create_client, Client
-from supabase.lib.client_options import ClientOptions
+try:
+    from supabase.lib.client_options import SyncClientOptions as ClientOptions
+except ImportError:  # supabase < 2.8
+    from supabase.lib.client_options import ClientOptions
 from dotenv import load_dotenv
 
 # Load environment variables
@@ -22,8 +25,7 @@ class AuthTester:
         client_options = ClientOptions(
             postgrest_client_timeout=10,
             storage_client_timeout=10,
-            auth_auto_refresh_interval=60,
-            auth_persist_session=False
+            persist_session=False
         )
         
         self.supabase = create_client(
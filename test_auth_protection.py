@@ -14,9 +14,9 @@ SUPABASE_KEY = os.getenv('SUPABASE_KEY', 'your-supabase-key')
 
 class TestAuthProtection:
     @classmethod
-    def setup_class(cls):
+    def setup_class(cls, client=None):
         """Set up test environment"""
-        cls.supabase = create_client(SUPABASE_URL, SUPABASE_KEY)
+        cls.supabase = client or create_client(SUPABASE_URL, SUPABASE_KEY)
         
         # Ensure we're signed out before tests
         try:
@@ -98,10 +98,11 @@ class TestAuthProtection:
             # Clean up - sign out
             self.supabase.auth.sign_out()
 
-if __name__ == "__main__":
+def run_tests(client=None):
+    """Run the protection tests without pytest; raises on the first failure"""
     # Create a test instance and run tests
     test = TestAuthProtection()
-    test.setup_class()
+    test.setup_class(client)
     
     print("Running unauthenticated access test...")
     test.test_unauthenticated_access_to_paid_content()
@@ -113,3 +114,7 @@ if __name__ == "__main__":
     test.test_download_protection()
     
     print("\n✅ All authentication protection tests passed!")
+    return True
+
+if __name__ == "__main__":
+    run_tests()
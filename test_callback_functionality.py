@@ -1,13 +1,12 @@
 import time
 import unittest
-from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.support.ui import Select
 from selenium.common.exceptions import TimeoutException
-from webdriver_manager.chrome import ChromeDriverManager
-from selenium.webdriver.chrome.service import Service
+from driver_pool import acquire_driver, release_driver
+from dev_server import ensure_server
 
 class CallbackFunctionalityTest(unittest.TestCase):
     """Test class for testing callback request functionality"""
@@ -15,15 +14,13 @@ class CallbackFunctionalityTest(unittest.TestCase):
     @classmethod
     def setUpClass(cls):
         """Set up the test environment once before all tests"""
-        service = Service(ChromeDriverManager().install())
-        cls.driver = webdriver.Chrome(service=service)
-        cls.base_url = "http://localhost:8080"  # Update with your server URL
-        cls.driver.maximize_window()
+        cls.driver = acquire_driver()
+        cls.base_url = ensure_server()
         
     @classmethod
     def tearDownClass(cls):
         """Clean up after all tests are done"""
-        cls.driver.quit()
+        release_driver(cls.driver)
         
     def setUp(self):
         """Set up before each test method"""
@@ -1,13 +1,12 @@
-import time
 import unittest
-from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException
-from webdriver_manager.chrome import ChromeDriverManager
-from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.common.keys import Keys
+from driver_pool import acquire_driver, release_driver
+from page_waits import PageWaiter
+from dev_server import ensure_server
 
 class ChatFunctionalityTest(unittest.TestCase):
     """Test class for testing chat functionality"""
@@ -15,15 +14,15 @@ class ChatFunctionalityTest(unittest.TestCase):
     @classmethod
     def setUpClass(cls):
         """Set up the test environment once before all tests"""
-        service = Service(ChromeDriverManager().install())
-        cls.driver = webdriver.Chrome(service=service)
-        cls.base_url = "http://localhost:8080"  # Update with your server URL
-        cls.driver.maximize_window()
+        cls.driver = acquire_driver()
+        cls.base_url = ensure_server()
+        cls.waits = PageWaiter(cls.driver)
         
     @classmethod
     def tearDownClass(cls):
         """Clean up after all tests are done"""
-        cls.driver.quit()
+        cls.waits.print_report("Chat functionality wait timings")
+        release_driver(cls.driver)
         
     def setUp(self):
         """Set up before each test method"""
@@ -44,18 +43,14 @@ class ChatFunctionalityTest(unittest.TestCase):
         chat_button.click()
         
         # Verify chat modal is displayed
-        chat_modal = WebDriverWait(self.driver, 10).until(
-            EC.visibility_of_element_located((By.ID, "chat-modal"))
-        )
+        chat_modal = self.waits.modal_shown("chat-modal")
         self.assertTrue(chat_modal.is_displayed(), "Chat modal did not open with primary button")
         
         # Close modal by clicking outside
         self.driver.execute_script("arguments[0].click();", chat_modal)
         
         # Verify modal is closed
-        WebDriverWait(self.driver, 10).until(
-            EC.invisibility_of_element_located((By.ID, "chat-modal"))
-        )
+        self.waits.modal_hidden("chat-modal")
         
         # Test secondary button opens modal
         chat_button_secondary = WebDriverWait(self.driver, 10).until(
@@ -64,9 +59,7 @@ class ChatFunctionalityTest(unittest.TestCase):
         chat_button_secondary.click()
         
         # Verify chat modal is displayed
-        chat_modal = WebDriverWait(self.driver, 10).until(
-            EC.visibility_of_element_located((By.ID, "chat-modal"))
-        )
+        chat_modal = self.waits.modal_shown("chat-modal")
         self.assertTrue(chat_modal.is_displayed(), "Chat modal did not open with secondary button")
         
         # Close modal using X button if available
@@ -75,17 +68,13 @@ class ChatFunctionalityTest(unittest.TestCase):
             close_button.click()
             
             # Verify modal is closed
-            WebDriverWait(self.driver, 10).until(
-                EC.invisibility_of_element_located((By.ID, "chat-modal"))
-            )
+            self.waits.modal_hidden("chat-modal")
         except:
             # If no close button, close by clicking outside again
             self.driver.execute_script("arguments[0].click();", chat_modal)
             
             # Verify modal is closed
-            WebDriverWait(self.driver, 10).until(
-                EC.invisibility_of_element_located((By.ID, "chat-modal"))
-            )
+            self.waits.modal_hidden("chat-modal")
         
         print("Chat modal open/close test passed!")
     
@@ -100,9 +89,7 @@ class ChatFunctionalityTest(unittest.TestCase):
         chat_button.click()
         
         # Verify chat modal is displayed
-        chat_modal = WebDriverWait(self.driver, 10).until(
-            EC.visibility_of_element_located((By.ID, "chat-modal"))
-        )
+        chat_modal = self.waits.modal_shown("chat-modal")
         
         # Get chat messages container to check if it's empty
         chat_messages = self.driver.find_element(By.ID, "chat-messages")
@@ -118,7 +105,7 @@ class ChatFunctionalityTest(unittest.TestCase):
         send_button.click()
         
         # Wait for message to appear in chat
-        time.sleep(2)  # Allow time for message to be processed
+        self.waits.text_present("chat-messages", test_message)
         
         # Verify message appears in chat window
         updated_messages = self.driver.find_element(By.ID, "chat-messages").text
@@ -141,6 +128,9 @@ class ChatFunctionalityTest(unittest.TestCase):
         )
         chat_button.click()
         
+        # Count assistant messages already shown (e.g. the greeting)
+        assistant_count = self.waits.message_count("chat-messages", ".chat-message.assistant")
+        
         # Send a test message
         chat_input = self.driver.find_element(By.ID, "chat-input")
         test_message = "Can you help me with a question?"
@@ -149,7 +139,7 @@ class ChatFunctionalityTest(unittest.TestCase):
         send_button.click()
         
         # Wait for assistant response
-        time.sleep(3)  # Allow time for assistant to respond
+        self.waits.messages_appended("chat-messages", assistant_count, ".chat-message.assistant")
         
         # Verify assistant responded
         chat_messages = self.driver.find_element(By.ID, "chat-messages").text
@@ -185,7 +175,7 @@ class ChatFunctionalityTest(unittest.TestCase):
         chat_input.send_keys(Keys.ENTER)
         
         # Wait for message to appear
-        time.sleep(2)
+        self.waits.text_present("chat-messages", test_message)
         
         # Verify message appears in chat window
         chat_messages = self.driver.find_element(By.ID, "chat-messages").text
@@ -212,15 +202,18 @@ class ChatFunctionalityTest(unittest.TestCase):
         ]
         
         chat_input = self.driver.find_element(By.ID, "chat-input")
+        assistant_count = self.waits.message_count("chat-messages", ".chat-message.assistant")
         
         for msg in messages:
             chat_input.send_keys(msg)
             send_button = self.driver.find_element(By.ID, "send-chat")
             send_button.click()
-            time.sleep(1)  # Brief pause between messages
+            self.waits.text_present("chat-messages", msg)
         
-        # Wait for all messages and responses
-        time.sleep(5)
+        # Wait for an assistant response to every message
+        self.waits.messages_appended(
+            "chat-messages", assistant_count + len(messages) - 1, ".chat-message.assistant"
+        )
         
         # Verify all user messages appear in chat window
         chat_messages = self.driver.find_element(By.ID, "chat-messages").text
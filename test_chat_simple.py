@@ -8,6 +8,7 @@ from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.common.keys import Keys
 from selenium.common.exceptions import TimeoutException, WebDriverException
+from dev_server import ensure_server
 
 class SimpleChatTest(unittest.TestCase):
     """Simplified test class for testing chat functionality without ChromeDriverManager"""
@@ -26,7 +27,7 @@ class SimpleChatTest(unittest.TestCase):
             # Try to initialize Chrome driver directly
             cls.driver = webdriver.Chrome(options=options)
             cls.driver.maximize_window()
-            cls.base_url = "http://localhost:8000"  # Using port 8000
+            cls.base_url = ensure_server()
             print("WebDriver initialized successfully.")
         except WebDriverException as e:
             print(f"Failed to initialize WebDriver: {e}")
@@ -10,11 +10,12 @@ import time
 import sys
 import os
 import uuid
-from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException
+from driver_pool import acquire_driver, release_driver
+from dev_server import ensure_server
 
 class CommunicationFlowTester:
     def __init__(self, base_url="http://localhost:8000"):
@@ -35,28 +36,24 @@ class CommunicationFlowTester:
         """Initialize the WebDrivers for browser automation"""
         print("Setting up WebDrivers...")
         try:
-            # Use Chrome WebDriver
-            from selenium.webdriver.chrome.service import Service
-            from webdriver_manager.chrome import ChromeDriverManager
+            # Lease warm browsers from the shared pool
+            self.driver = acquire_driver()
             
-            service = Service(ChromeDriverManager().install())
-            self.driver = webdriver.Chrome(service=service)
-            self.driver.maximize_window()
-            
-            # Create a second driver for admin view
-            self.admin_driver = webdriver.Chrome(service=service)
-            self.admin_driver.maximize_window()
+            # Lease a second driver for admin view
+            self.admin_driver = acquire_driver()
             return True
         except Exception as e:
             print(f"Failed to initialize WebDrivers: {e}")
             return False
             
     def close_drivers(self):
-        """Close the WebDrivers"""
+        """Return the WebDrivers to the shared pool"""
         if self.driver:
-            self.driver.quit()
+            release_driver(self.driver)
+            self.driver = None
         if self.admin_driver:
-            self.admin_driver.quit()
+            release_driver(self.admin_driver)
+            self.admin_driver = None
             
     def admin_login(self):
         """Login to admin panel"""
@@ -440,8 +437,8 @@ class CommunicationFlowTester:
             self.close_drivers()
             
 if __name__ == "__main__":
-    # Default to localhost:8000 if no argument provided
-    base_url = sys.argv[1] if len(sys.argv) > 1 else "http://localhost:8000"
+    # Default to a local server on a free port if no argument provided
+    base_url = sys.argv[1] if len(sys.argv) > 1 else ensure_server()
     
     tester = CommunicationFlowTester(base_url)
     success = tester.run_all_tests()
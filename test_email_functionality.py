@@ -1,15 +1,14 @@
 import time
 import unittest
-from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException
-from webdriver_manager.chrome import ChromeDriverManager
-from selenium.webdriver.chrome.service import Service
+from driver_pool import acquire_driver, release_driver
 import requests
 import json
 import os
+from dev_server import ensure_server
 
 class EmailFunctionalityTest(unittest.TestCase):
     """Test class for testing email functionality with Resend API integration"""
@@ -17,11 +16,9 @@ class EmailFunctionalityTest(unittest.TestCase):
     @classmethod
     def setUpClass(cls):
         """Set up the test environment once before all tests"""
-        # Set up WebDriver
-        service = Service(ChromeDriverManager().install())
-        cls.driver = webdriver.Chrome(service=service)
-        cls.base_url = "http://localhost:8080"  # Update with your server URL
-        cls.driver.maximize_window()
+        # Lease a browser from the shared pool
+        cls.driver = acquire_driver()
+        cls.base_url = ensure_server()
         
         # Load email configuration
         try:
@@ -42,7 +39,7 @@ class EmailFunctionalityTest(unittest.TestCase):
     @classmethod
     def tearDownClass(cls):
         """Clean up after all tests are done"""
-        cls.driver.quit()
+        release_driver(cls.driver)
         
     def setUp(self):
         """Set up before each test method"""
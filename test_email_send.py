@@ -4,7 +4,8 @@ import requests
 import json
 import time
 from dotenv import load_dotenv
-from urllib.parse import urljoin
+
+from supabase_http import supabase_session
 
 # Configure logging
 import logging
@@ -51,30 +52,20 @@ def test_email_send():
     }
     
     # Prepare request
-    function_url = urljoin(config['supabase_url'], '/functions/v1/send-email')
-    headers = {
-        'Authorization': f'Bearer {config["supabase_key"]}',
-        'Content-Type': 'application/json'
-    }
+    session = supabase_session(config['supabase_url'], config['supabase_key'])
     
     logger.info("Sending test email...")
-    logger.debug(f"URL: {function_url}")
-    logger.debug(f"Headers: {headers}")
+    logger.debug(f"URL: {session.base_url}/functions/v1/send-email")
     logger.debug(f"Payload: {json.dumps(test_data, indent=2)}")
     
     try:
-        # Make the request with timeout
-        start_time = time.time()
-        response = requests.post(
-            function_url,
-            headers=headers,
-            json=test_data,
-            timeout=30
-        )
-        elapsed = (time.time() - start_time) * 1000
+        # POSTs are only retried on 429, so a slow send is never sent twice
+        response = session.post('/functions/v1/send-email', json=test_data)
+        timing = response.timing
         
         # Log response details
-        logger.info(f"Response Time: {elapsed:.2f}ms")
+        logger.info(f"Response Time: {timing['total'] * 1000:.2f}ms "
+                    f"(connect {timing['connect'] * 1000:.2f}ms, server {timing['server'] * 1000:.2f}ms)")
         logger.info(f"Status Code: {response.status_code}")
         
         try:
@@ -98,6 +89,8 @@ def test_email_send():
     except Exception as e:
         logger.error(f"❌ An unexpected error occurred: {str(e)}", exc_info=True)
         return False
+    finally:
+        session.close()
 
 if __name__ == "__main__":
     test_email_send()
@@ -1,53 +1,64 @@
 import unittest
 import os
-import re
 import json
 import requests
 from urllib.parse import urljoin
 
-class HTMLStructureTest(unittest.TestCase):
+from result_cache import cached_on, consume_no_cache_flag
+from dev_server import ensure_server
+from site_index import DomAssertions, get_index
+from simple_va_test import ELEMENT_STRUCTURE
+
+REQUIRED_ELEMENTS = [
+    ("Chat button", "#chat-button"),
+    ("Chat modal", "#chat-modal"),
+    ("Chat messages container", "#chat-messages"),
+    ("Chat input", "#chat-input"),
+    ("Send button", "#send-chat")
+]
+
+# (index kind, any of these names)
+CHAT_HANDLER_SYMBOLS = [
+    ("functions", ("sendMessage", "sendChatMessage")),
+    ("functions", ("displayMessage", "addMessage")),
+    ("events", ("click",))
+]
+
+class HTMLStructureTest(DomAssertions, unittest.TestCase):
     """Test class for verifying HTML structure and content without browser automation"""
     
     def setUp(self):
         """Set up test environment"""
-        self.base_url = "http://localhost:8000"
         self.base_dir = os.path.dirname(os.path.abspath(__file__))
         
+    @cached_on("virtual-assistant.html")
     def test_virtual_assistant_html_exists(self):
         """Test if virtual-assistant.html file exists"""
         file_path = os.path.join(self.base_dir, "virtual-assistant.html")
         self.assertTrue(os.path.exists(file_path), f"File {file_path} should exist")
         print(f"✓ virtual-assistant.html exists")
         
+    @cached_on("virtual-assistant.html")
     def test_virtual_assistant_html_content(self):
         """Test if virtual-assistant.html contains required elements"""
         file_path = os.path.join(self.base_dir, "virtual-assistant.html")
-        if not os.path.exists(file_path):
+        index = get_index()
+        if not index.page("virtual-assistant.html"):
             self.skipTest(f"File {file_path} does not exist")
             
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-            
-        # Check for chat button
-        self.assertIn('id="chat-button"', content, "Chat button should exist")
-        print(f"✓ Chat button exists in HTML")
-        
-        # Check for chat modal
-        self.assertIn('id="chat-modal"', content, "Chat modal should exist")
-        print(f"✓ Chat modal exists in HTML")
-        
-        # Check for chat messages container
-        self.assertIn('id="chat-messages"', content, "Chat messages container should exist")
-        print(f"✓ Chat messages container exists in HTML")
-        
-        # Check for chat input
-        self.assertIn('id="chat-input"', content, "Chat input should exist")
-        print(f"✓ Chat input exists in HTML")
+        for name, selector in REQUIRED_ELEMENTS:
+            self.assertTrue(index.has_selector("virtual-assistant.html", selector), f"{name} should exist")
+            print(f"✓ {name} exists in HTML")
         
-        # Check for send button
-        self.assertIn('id="send-chat"', content, "Send button should exist")
-        print(f"✓ Send button exists in HTML")
+    @cached_on("virtual-assistant.html")
+    def test_virtual_assistant_element_structure(self):
+        """Test that the buttons and form fields sit inside their containers"""
+        for container, children in ELEMENT_STRUCTURE:
+            for child in children:
+                self.assertContains("virtual-assistant.html", container, child)
+            print(f"✓ {container} contains {len(children)} expected elements")
         
+    @cached_on(os.path.join("css", "virtual-assistant.css"))
     def test_css_files_exist(self):
         """Test if required CSS files exist"""
         css_files = [
@@ -58,6 +69,7 @@ class HTMLStructureTest(unittest.TestCase):
             self.assertTrue(os.path.exists(css_file), f"CSS file {css_file} should exist")
             print(f"✓ {os.path.basename(css_file)} exists")
             
+    @cached_on(os.path.join("js", "chat-handler.js"), os.path.join("js", "virtual-assistant.js"))
     def test_js_files_exist(self):
         """Test if required JS files exist"""
         js_files = [
@@ -71,6 +83,29 @@ class HTMLStructureTest(unittest.TestCase):
             else:
                 print(f"✗ {os.path.basename(js_file)} does not exist (not critical)")
                 
+    @cached_on(os.path.join("js", "chat-handler.js"))
+    def test_chat_handler_js_content(self):
+        """Test if chat-handler.js contains required functions"""
+        index = get_index()
+        if "js/chat-handler.js" not in index.scripts:
+            print(f"✗ chat-handler.js does not exist, skipping content check")
+            return
+            
+        # Check for essential functions
+        for kind, names in CHAT_HANDLER_SYMBOLS:
+            found = [name for name in names if index.js_has("js/chat-handler.js", kind, name)]
+            if found:
+                print(f"✓ Found chat handler {kind[:-1]}: {found[0]}")
+            else:
+                print(f"✗ Missing expected chat handler {kind[:-1]}: {' or '.join(names)}")
+
+class HTMLServerTest(unittest.TestCase):
+    """Test class for verifying the pages are served, against a server started once for the class"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.base_url = ensure_server()
+
     def test_server_connectivity(self):
         """Test if server is running and accessible"""
         try:
@@ -95,31 +130,8 @@ class HTMLStructureTest(unittest.TestCase):
             
         except requests.exceptions.RequestException as e:
             self.fail(f"Virtual assistant page is not accessible at {url}: {str(e)}")
-            
-    def test_chat_handler_js_content(self):
-        """Test if chat-handler.js contains required functions"""
-        js_file = os.path.join(self.base_dir, "js", "chat-handler.js")
-        if not os.path.exists(js_file):
-            print(f"✗ chat-handler.js does not exist, skipping content check")
-            return
-            
-        with open(js_file, 'r', encoding='utf-8') as f:
-            content = f.read()
-            
-        # Check for essential functions
-        function_patterns = [
-            r'function\s+(?:sendMessage|sendChatMessage)',
-            r'function\s+(?:displayMessage|addMessage)',
-            r'\.addEventListener\(\s*[\'"]click[\'"]'
-        ]
-        
-        for pattern in function_patterns:
-            match = re.search(pattern, content)
-            if match:
-                print(f"✓ Found chat handler function: {match.group(0)[:30]}...")
-            else:
-                print(f"✗ Missing expected chat handler function pattern: {pattern}")
 
 if __name__ == "__main__":
+    consume_no_cache_flag()
     print("Starting HTML Structure Tests...")
     unittest.main(verbosity=2)
@@ -12,8 +12,9 @@ load_dotenv()
 SUPABASE_URL = os.getenv('SUPABASE_URL', 'https://glplnybcdgbyajdgzjrr.supabase.co')
 SUPABASE_KEY = os.getenv('SUPABASE_KEY', 'eyJhbGciOiJIUzI1NiIsInR5cCI6IkpXVCJ9.eyJpc3MiOiJzdXBhYmFzZSIsInJlZiI6ImdscGxueWJjZGdi...')
 
-# Test user credentials
-TEST_EMAIL = 'test@example.com'
+# Test user credentials (its own user, so the suite can run alongside
+# test_auth_protection.py, which signs in as TEST_EMAIL)
+TEST_EMAIL = os.getenv('RESET_TEST_EMAIL', 'reset-test@example.com')
 TEST_PASSWORD = 'OldPassword123!'
 NEW_PASSWORD = 'NewPassword123!'
 
@@ -22,8 +23,8 @@ MAILTRAP_TOKEN = os.getenv('MAILTRAP_TOKEN')
 MAILTRAP_INBOX_ID = os.getenv('MAILTRAP_INBOX_ID')
 
 class TestPasswordReset:
-    def __init__(self):
-        self.supabase = create_client(SUPABASE_URL, SUPABASE_KEY)
+    def __init__(self, client=None):
+        self.supabase = client or create_client(SUPABASE_URL, SUPABASE_KEY)
         self.reset_link = None
         self.session = None
 
@@ -163,6 +164,11 @@ class TestPasswordReset:
             print(f"❌ Test failed: {str(e)}")
             return False
 
+def run_tests(client=None):
+    """Run the password reset flow, optionally with an existing client"""
+    print("Starting password reset flow test...")
+    return TestPasswordReset(client).test_reset_flow()
+
 if __name__ == "__main__":
     print("Starting password reset flow test...")
     tester = TestPasswordReset()
@@ -1,7 +1,8 @@
 import os
 import sys
 import json
-import re
+
+from site_index import get_index
 
 def print_header(text):
     """Print a formatted header"""
@@ -30,51 +31,45 @@ def check_file_exists(file_path):
         print_error(f"File does not exist: {os.path.basename(file_path)}")
         return False
 
+def site_path(file_path):
+    """Return a path relative to the site root, as used by the site index"""
+    return os.path.relpath(file_path, os.path.dirname(os.path.abspath(__file__))).replace(os.sep, "/")
+
 def check_html_elements(file_path, elements):
-    """Check if HTML file contains required elements"""
-    if not os.path.exists(file_path):
+    """Check if HTML file contains required elements (#id or .class selectors)"""
+    index = get_index()
+    page = site_path(file_path)
+    if not index.page(page):
         print_error(f"Cannot check elements: {os.path.basename(file_path)} does not exist")
         return False
     
-    try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-        
-        all_found = True
-        for name, pattern in elements:
-            if pattern in content:
-                print_success(f"Found {name} in {os.path.basename(file_path)}")
-            else:
-                print_error(f"Missing {name} in {os.path.basename(file_path)}")
-                all_found = False
-        
-        return all_found
-    except Exception as e:
-        print_error(f"Error reading {os.path.basename(file_path)}: {str(e)}")
-        return False
+    all_found = True
+    for name, selector in elements:
+        if index.has_selector(page, selector):
+            print_success(f"Found {name} in {os.path.basename(file_path)}")
+        else:
+            print_error(f"Missing {name} in {os.path.basename(file_path)}")
+            all_found = False
+    
+    return all_found
 
 def check_js_functions(file_path, functions):
-    """Check if JS file contains required functions"""
-    if not os.path.exists(file_path):
+    """Check if JS file defines required functions, classes and event listeners"""
+    index = get_index()
+    script = site_path(file_path)
+    if script not in index.scripts:
         print_error(f"Cannot check functions: {os.path.basename(file_path)} does not exist")
         return False
     
-    try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-        
-        all_found = True
-        for name, pattern in functions:
-            if re.search(pattern, content):
-                print_success(f"Found {name} in {os.path.basename(file_path)}")
-            else:
-                print_error(f"Missing {name} in {os.path.basename(file_path)}")
-                all_found = False
-        
-        return all_found
-    except Exception as e:
-        print_error(f"Error reading {os.path.basename(file_path)}: {str(e)}")
-        return False
+    all_found = True
+    for name, kind, symbol in functions:
+        if index.js_has(script, kind, symbol):
+            print_success(f"Found {name} in {os.path.basename(file_path)}")
+        else:
+            print_error(f"Missing {name} in {os.path.basename(file_path)}")
+            all_found = False
+    
+    return all_found
 
 def main():
     """Main function to test virtual assistant files"""
@@ -105,13 +100,13 @@ def main():
     print_header("TEST 2: HTML ELEMENTS")
     html_file = os.path.join(base_path, "virtual-assistant.html")
     html_elements = [
-        ("Chat button", 'id="chat-button"'),
-        ("Chat modal", 'id="chat-modal"'),
-        ("Chat messages container", 'id="chat-messages"'),
-        ("Chat input", 'id="chat-input"'),
-        ("Send button", 'id="send-chat"'),
-        ("Email form", 'id="email-modal"'),
-        ("Callback form", 'id="callback-modal"')
+        ("Chat button", "#chat-button"),
+        ("Chat modal", "#chat-modal"),
+        ("Chat messages container", "#chat-messages"),
+        ("Chat input", "#chat-input"),
+        ("Send button", "#send-chat"),
+        ("Email form", "#email-modal"),
+        ("Callback form", "#callback-modal")
     ]
     
     if check_html_elements(html_file, html_elements):
@@ -123,11 +118,11 @@ def main():
     print_header("TEST 3: JAVASCRIPT FUNCTIONS")
     js_file = os.path.join(base_path, "js", "chat-handler.js")
     js_functions = [
-        ("Send chat message function", r"function\s+sendChatMessage"),
-        ("Close chat modal function", r"function\s+closeChatModal"),
-        ("Open chat function", r"function\s+openChat"),
-        ("Chat handler class", r"class\s+ChatHandler"),
-        ("DOM content loaded event", r"document\.addEventListener\(\s*['\"]\s*DOMContentLoaded\s*['\"]")
+        ("Send chat message function", "functions", "sendChatMessage"),
+        ("Close chat modal function", "functions", "closeChatModal"),
+        ("Open chat function", "functions", "openChat"),
+        ("Chat handler class", "classes", "ChatHandler"),
+        ("DOM content loaded event", "events", "DOMContentLoaded")
     ]
     
     if check_js_functions(js_file, js_functions):
@@ -6,14 +6,15 @@ This script tests the functionality of the SoftAIDev virtual assistant platform.
 
 import requests
 import json
-import time
 import sys
 import os
-from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException
+from driver_pool import acquire_driver, release_driver
+from page_waits import PageWaiter
+from dev_server import ensure_server
 
 class VirtualAssistantTester:
     def __init__(self, base_url="http://localhost:8000"):
@@ -21,6 +22,7 @@ class VirtualAssistantTester:
         self.admin_email = "customersupport@softaidev.com"
         self.admin_password = "admin123"  # For testing only
         self.driver = None
+        self.waits = None
         self.test_results = {
             "admin_auth": False,
             "public_interface": False,
@@ -34,22 +36,20 @@ class VirtualAssistantTester:
         """Initialize the WebDriver for browser automation"""
         print("Setting up WebDriver...")
         try:
-            # Use Chrome WebDriver
-            from selenium.webdriver.chrome.service import Service
-            from webdriver_manager.chrome import ChromeDriverManager
-            
-            service = Service(ChromeDriverManager().install())
-            self.driver = webdriver.Chrome(service=service)
-            self.driver.maximize_window()
+            # Lease a warm browser from the shared pool
+            self.driver = acquire_driver()
+            self.waits = PageWaiter(self.driver)
             return True
         except Exception as e:
             print(f"Failed to initialize WebDriver: {e}")
             return False
             
     def close_driver(self):
-        """Close the WebDriver"""
+        """Return the WebDriver to the shared pool"""
         if self.driver:
-            self.driver.quit()
+            self.waits.print_report()
+            release_driver(self.driver)
+            self.driver = None
             
     def test_admin_authentication(self):
         """Test admin authentication functionality"""
@@ -133,7 +133,10 @@ class VirtualAssistantTester:
             self.driver.get(f"{self.base_url}/virtual-assistant-admin.html")
             
             # Wait for the page to load or redirect
-            time.sleep(3)
+            try:
+                self.waits.loaded_or_redirected("virtual-assistant-admin.html", ".admin-controls")
+            except TimeoutException:
+                pass
             
             # Check if redirected to login (expected behavior if not authenticated)
             if "login.html" in self.driver.current_url:
@@ -342,8 +345,8 @@ class VirtualAssistantTester:
             self.close_driver()
             
 if __name__ == "__main__":
-    # Default to localhost:8000 if no argument provided
-    base_url = sys.argv[1] if len(sys.argv) > 1 else "http://localhost:8000"
+    # Default to a local server on a free port if no argument provided
+    base_url = sys.argv[1] if len(sys.argv) > 1 else ensure_server()
     
     tester = VirtualAssistantTester(base_url)
     success = tester.run_all_tests()
@@ -5,13 +5,16 @@ import time
 import http.client
 import urllib.parse
 
+from dev_server import ensure_server
+
 class VirtualAssistantBasicTest(unittest.TestCase):
     """Basic test class for testing virtual assistant without browser automation"""
     
     def setUp(self):
         """Set up before each test method"""
-        self.host = "localhost"
-        self.port = 8000
+        base_url = urllib.parse.urlsplit(ensure_server())
+        self.host = base_url.hostname
+        self.port = base_url.port or 80
         self.base_path = os.path.dirname(os.path.abspath(__file__))
         
         # Check if server is running
@@ -1,12 +1,11 @@
-import time
 import unittest
-from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException
-from webdriver_manager.chrome import ChromeDriverManager
-from selenium.webdriver.chrome.service import Service
+from driver_pool import acquire_driver, release_driver
+from page_waits import PageWaiter
+from dev_server import ensure_server
 
 class VirtualAssistantButtonTest(unittest.TestCase):
     """Test class for testing all buttons on the virtual assistant page"""
@@ -14,15 +13,15 @@ class VirtualAssistantButtonTest(unittest.TestCase):
     @classmethod
     def setUpClass(cls):
         """Set up the test environment once before all tests"""
-        service = Service(ChromeDriverManager().install())
-        cls.driver = webdriver.Chrome(service=service)
-        cls.base_url = "http://localhost:8080"  # Update this with your actual server URL
-        cls.driver.maximize_window()
+        cls.driver = acquire_driver()
+        cls.base_url = ensure_server()
+        cls.waits = PageWaiter(cls.driver)
         
     @classmethod
     def tearDownClass(cls):
         """Clean up after all tests are done"""
-        cls.driver.quit()
+        cls.waits.print_report("Button test wait timings")
+        release_driver(cls.driver)
         
     def setUp(self):
         """Set up before each test method"""
@@ -43,11 +42,12 @@ class VirtualAssistantButtonTest(unittest.TestCase):
         chat_button.click()
         
         # Verify chat modal is displayed
-        chat_modal = WebDriverWait(self.driver, 10).until(
-            EC.visibility_of_element_located((By.ID, "chat-modal"))
-        )
+        chat_modal = self.waits.modal_shown("chat-modal")
         self.assertTrue(chat_modal.is_displayed(), "Chat modal did not open")
         
+        # Count assistant messages already shown (e.g. the greeting)
+        assistant_count = self.waits.message_count("chat-messages", ".chat-message.assistant")
+        
         # Enter a test message
         chat_input = self.driver.find_element(By.ID, "chat-input")
         test_message = "Hello, this is a test message"
@@ -58,7 +58,7 @@ class VirtualAssistantButtonTest(unittest.TestCase):
         send_button.click()
         
         # Wait for message to appear in chat
-        time.sleep(2)  # Allow time for message to be processed
+        self.waits.text_present("chat-messages", test_message)
         
         # Verify message appears in chat window
         chat_messages = self.driver.find_element(By.ID, "chat-messages")
@@ -66,7 +66,7 @@ class VirtualAssistantButtonTest(unittest.TestCase):
                      f"Test message '{test_message}' not found in chat window")
         
         # Wait for assistant response
-        time.sleep(2)
+        self.waits.messages_appended("chat-messages", assistant_count, ".chat-message.assistant")
         
         # Verify assistant responded
         self.assertIn("Assistant", chat_messages.text, 
@@ -85,9 +85,7 @@ class VirtualAssistantButtonTest(unittest.TestCase):
         chat_button.click()
         
         # Verify chat modal is displayed
-        chat_modal = WebDriverWait(self.driver, 10).until(
-            EC.visibility_of_element_located((By.ID, "chat-modal"))
-        )
+        chat_modal = self.waits.modal_shown("chat-modal")
         self.assertTrue(chat_modal.is_displayed(), "Chat modal did not open")
         
         # Enter a test message
@@ -100,7 +98,7 @@ class VirtualAssistantButtonTest(unittest.TestCase):
         send_button.click()
         
         # Wait for message to appear in chat
-        time.sleep(2)  # Allow time for message to be processed
+        self.waits.text_present("chat-messages", test_message)
         
         # Verify message appears in chat window
         chat_messages = self.driver.find_element(By.ID, "chat-messages")
@@ -120,9 +118,7 @@ class VirtualAssistantButtonTest(unittest.TestCase):
         email_button.click()
         
         # Verify email modal is displayed
-        email_modal = WebDriverWait(self.driver, 10).until(
-            EC.visibility_of_element_located((By.ID, "email-modal"))
-        )
+        email_modal = self.waits.modal_shown("email-modal")
         self.assertTrue(email_modal.is_displayed(), "Email modal did not open")
         
         # Fill out the email form
@@ -137,9 +133,7 @@ class VirtualAssistantButtonTest(unittest.TestCase):
         
         # Wait for success message
         try:
-            success_message = WebDriverWait(self.driver, 5).until(
-                EC.visibility_of_element_located((By.ID, "email-status"))
-            )
+            success_message = self.waits.element_visible("email-status", timeout=5)
             self.assertIn("success", success_message.get_attribute("class"), 
                          "Email was not sent successfully")
             self.assertIn("sent successfully", success_message.text, 
@@ -160,9 +154,7 @@ class VirtualAssistantButtonTest(unittest.TestCase):
         email_button.click()
         
         # Verify email modal is displayed
-        email_modal = WebDriverWait(self.driver, 10).until(
-            EC.visibility_of_element_located((By.ID, "email-modal"))
-        )
+        email_modal = self.waits.modal_shown("email-modal")
         self.assertTrue(email_modal.is_displayed(), "Email modal did not open")
         
         # Fill out the email form
@@ -177,9 +169,7 @@ class VirtualAssistantButtonTest(unittest.TestCase):
         
         # Wait for success message
         try:
-            success_message = WebDriverWait(self.driver, 5).until(
-                EC.visibility_of_element_located((By.ID, "email-status"))
-            )
+            success_message = self.waits.element_visible("email-status", timeout=5)
             self.assertIn("success", success_message.get_attribute("class"), 
                          "Email was not sent successfully")
         except TimeoutException:
@@ -198,9 +188,7 @@ class VirtualAssistantButtonTest(unittest.TestCase):
         callback_button.click()
         
         # Verify callback modal is displayed
-        callback_modal = WebDriverWait(self.driver, 10).until(
-            EC.visibility_of_element_located((By.ID, "callback-modal"))
-        )
+        callback_modal = self.waits.modal_shown("callback-modal")
         self.assertTrue(callback_modal.is_displayed(), "Callback modal did not open")
         
         # Fill out the callback form
@@ -214,9 +202,7 @@ class VirtualAssistantButtonTest(unittest.TestCase):
         
         # Wait for success message
         try:
-            success_message = WebDriverWait(self.driver, 5).until(
-                EC.visibility_of_element_located((By.ID, "callback-status"))
-            )
+            success_message = self.waits.element_visible("callback-status", timeout=5)
             self.assertIn("success", success_message.get_attribute("class"), 
                          "Callback was not requested successfully")
             self.assertIn("submitted successfully", success_message.text, 
@@ -237,9 +223,7 @@ class VirtualAssistantButtonTest(unittest.TestCase):
         callback_button.click()
         
         # Verify callback modal is displayed
-        callback_modal = WebDriverWait(self.driver, 10).until(
-            EC.visibility_of_element_located((By.ID, "callback-modal"))
-        )
+        callback_modal = self.waits.modal_shown("callback-modal")
         self.assertTrue(callback_modal.is_displayed(), "Callback modal did not open")
         
         # Fill out the callback form
@@ -253,9 +237,7 @@ class VirtualAssistantButtonTest(unittest.TestCase):
         
         # Wait for success message
         try:
-            success_message = WebDriverWait(self.driver, 5).until(
-                EC.visibility_of_element_located((By.ID, "callback-status"))
-            )
+            success_message = self.waits.element_visible("callback-status", timeout=5)
             self.assertIn("success", success_message.get_attribute("class"), 
                          "Callback was not requested successfully")
         except TimeoutException:
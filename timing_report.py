@@ -0,0 +1,217 @@
+"""
+Per-test timing for the test runners.
+
+TimingTestResult records how long setUp, the test body and tearDown take
+for every test. The records can be written to a JSON or JUnit XML file,
+the slowest tests printed, and each test checked against a time budget
+declared in test-budgets.json:
+
+    {
+        "default": 30,
+        "tests": {
+            "test_chat_functionality.*": 20,
+            "test_auth_flow.py": null
+        }
+    }
+
+Budget keys are fnmatch patterns matched against the test id; the first
+match wins and null means no budget.
+"""
+import os
+import json
+import time
+import fnmatch
+import unittest
+import functools
+import xml.etree.ElementTree as ET
+
+DEFAULT_BUDGET_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "test-budgets.json")
+
+
+def make_record(test_id, body, outcome, setup=0.0, teardown=0.0, message=""):
+    """Build one timing record (a plain dict so it can cross processes)"""
+    return {
+        "id": test_id,
+        "setup": round(setup, 4),
+        "body": round(body, 4),
+        "teardown": round(teardown, 4),
+        "total": round(setup + body + teardown, 4),
+        "outcome": outcome,
+        "message": message,
+    }
+
+
+class TimingTestResult(unittest.TextTestResult):
+    """TextTestResult that times setUp, the test body and tearDown"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.timings = []
+        self._phases = {}
+        self._outcome = None
+        self._message = ""
+
+    def _timed(self, phase, func):
+        # wraps() keeps __unittest_skip__ and __unittest_expecting_failure__ visible to TestCase.run
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                self._phases[phase] = time.perf_counter() - start
+        return wrapper
+
+    def startTest(self, test):
+        self._phases = {"setup": 0.0, "body": 0.0, "teardown": 0.0}
+        self._outcome = "passed"
+        self._message = ""
+
+        # Instance attributes shadow the class methods unittest looks up
+        method_name = getattr(test, "_testMethodName", None)
+        if method_name and hasattr(test, method_name):
+            test.setUp = self._timed("setup", test.setUp)
+            test.tearDown = self._timed("teardown", test.tearDown)
+            setattr(test, method_name, self._timed("body", getattr(test, method_name)))
+        super().startTest(test)
+
+    def stopTest(self, test):
+        super().stopTest(test)
+        for name in ("setUp", "tearDown", getattr(test, "_testMethodName", None)):
+            if name and name in test.__dict__:
+                del test.__dict__[name]
+
+        self.timings.append(make_record(
+            test.id(),
+            self._phases["body"],
+            self._outcome,
+            setup=self._phases["setup"],
+            teardown=self._phases["teardown"],
+            message=self._message
+        ))
+
+    def addFailure(self, test, err):
+        super().addFailure(test, err)
+        self._outcome = "failure"
+        self._message = self.failures[-1][1]
+
+    def addError(self, test, err):
+        super().addError(test, err)
+        self._outcome = "error"
+        self._message = self.errors[-1][1]
+
+    def addSkip(self, test, reason):
+        super().addSkip(test, reason)
+        self._outcome = "skipped"
+        self._message = reason
+
+    def addExpectedFailure(self, test, err):
+        super().addExpectedFailure(test, err)
+        self._outcome = "expected failure"
+
+    def addUnexpectedSuccess(self, test):
+        super().addUnexpectedSuccess(test)
+        self._outcome = "unexpected success"
+
+
+def load_budgets(path=None):
+    """Load the budget config, returning an empty config if there is none"""
+    path = path or DEFAULT_BUDGET_FILE
+    if not os.path.exists(path):
+        return {"default": None, "tests": {}}
+    with open(path, "r", encoding="utf-8") as f:
+        config = json.load(f)
+    config.setdefault("default", None)
+    config.setdefault("tests", {})
+    return config
+
+
+def budget_for(test_id, budgets):
+    """Return the budget in seconds for a test id, or None"""
+    for pattern, seconds in budgets["tests"].items():
+        if fnmatch.fnmatch(test_id, pattern):
+            return seconds
+    return budgets["default"]
+
+
+def check_budgets(records, budgets):
+    """Return (record, budget) pairs for every test over its budget"""
+    violations = []
+    for record in records:
+        budget = budget_for(record["id"], budgets)
+        if budget is not None and record["total"] > budget:
+            violations.append((record, budget))
+    return violations
+
+
+def print_slowest(records, count=10):
+    """Print the slowest tests with their phase breakdown"""
+    if not records or count <= 0:
+        return
+    slowest = sorted(records, key=lambda r: r["total"], reverse=True)[:count]
+    print(f"\nSlowest {len(slowest)} tests:")
+    print(f"  {'total':>8} {'setup':>8} {'body':>8} {'teardown':>8}  test")
+    for r in slowest:
+        print(f"  {r['total']:8.2f} {r['setup']:8.2f} {r['body']:8.2f} {r['teardown']:8.2f}  {r['id']}")
+
+
+def write_report(records, path):
+    """Write the records as JUnit XML (.xml) or JSON (anything else)"""
+    if path.endswith(".xml"):
+        _write_junit(records, path)
+    else:
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({
+                "generated_at": time.strftime("%Y-%m-%d %H:%M:%S"),
+                "tests": records,
+            }, f, indent=2)
+    print(f"Timing report written to {path}")
+
+
+def _write_junit(records, path):
+    suite = ET.Element("testsuite", {
+        "name": "softaidev",
+        "tests": str(len(records)),
+        "failures": str(sum(1 for r in records if r["outcome"] == "failure")),
+        "errors": str(sum(1 for r in records if r["outcome"] == "error")),
+        "skipped": str(sum(1 for r in records if r["outcome"] == "skipped")),
+        "time": f"{sum(r['total'] for r in records):.3f}",
+    })
+    for r in records:
+        classname, _, name = r["id"].rpartition(".")
+        case = ET.SubElement(suite, "testcase", {
+            "classname": classname or r["id"],
+            "name": name,
+            "time": f"{r['total']:.3f}",
+        })
+        phases = ET.SubElement(case, "properties")
+        for phase in ("setup", "body", "teardown"):
+            ET.SubElement(phases, "property", {"name": phase, "value": f"{r[phase]:.3f}"})
+        if r["outcome"] in ("failure", "error", "skipped"):
+            element = ET.SubElement(case, r["outcome"], {"message": r["message"].strip().split("\n")[-1][:200]})
+            element.text = r["message"]
+    ET.ElementTree(suite).write(path, encoding="utf-8", xml_declaration=True)
+
+
+def add_timing_arguments(parser):
+    """Add the shared --report/--slowest/--budgets options to a parser"""
+    parser.add_argument("--report", metavar="PATH",
+                        help="write per-test timings to a .json or JUnit .xml file")
+    parser.add_argument("--slowest", type=int, default=10, metavar="N",
+                        help="print the N slowest tests (default: 10, 0 to disable)")
+    parser.add_argument("--budgets", metavar="PATH", default=DEFAULT_BUDGET_FILE,
+                        help="per-test time budget config (default: test-budgets.json)")
+
+
+def finish_timing(records, args):
+    """Print, write and budget-check the records; return the violation count"""
+    print_slowest(records, args.slowest)
+    if args.report:
+        write_report(records, args.report)
+
+    violations = check_budgets(records, load_budgets(args.budgets))
+    if violations:
+        print(f"\n{len(violations)} test(s) over their time budget:")
+        for record, budget in violations:
+            print(f"  {record['total']:.2f}s > {budget}s  {record['id']}")
+    return len(violations)
@@ -3,6 +3,8 @@ import json
 import requests
 from dotenv import load_dotenv
 
+from supabase_http import management_session
+
 # Load environment variables
 load_dotenv()
 
@@ -24,12 +26,9 @@ def update_function_env():
         'BCC_EMAIL': os.getenv('BCC_EMAIL')
     }
     
-    # Prepare the request
-    url = f"https://api.supabase.com/v1/projects/{project_ref}/functions/send-email/env"
-    headers = {
-        'Authorization': f'Bearer {access_token}',
-        'Content-Type': 'application/json'
-    }
+    # Prepare the request; the GET and the PUT share one pooled connection
+    url = f"/v1/projects/{project_ref}/functions/send-email/env"
+    session = management_session(access_token)
     
     # Prepare the payload
     payload = []
@@ -43,7 +42,7 @@ def update_function_env():
     
     try:
         # First, get existing variables to avoid duplicates
-        response = requests.get(url, headers=headers)
+        response = session.get(url)
         existing_vars = {v['name']: v for v in response.json()}
         
         # Update existing variables and add new ones
@@ -54,10 +53,11 @@ def update_function_env():
         payload = list(existing_vars.values())
         
         # Update the environment variables
-        response = requests.put(url, headers=headers, json=payload)
+        response = session.put(url, json=payload)
         response.raise_for_status()
         
         print("✅ Environment variables updated successfully")
+        session.print_timings()
         return True
         
     except requests.exceptions.RequestException as e:
@@ -66,6 +66,8 @@ def update_function_env():
             print(f"Status Code: {e.response.status_code}")
             print(f"Response: {e.response.text}")
         return False
+    finally:
+        session.close()
 
 if __name__ == "__main__":
     update_function_env()
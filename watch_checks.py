@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""
+Watch mode for the static site checks.
+
+Keeps the site index (site_index.py) in memory, watches the tree with
+inotify (Linux) or by polling, and on every save re-parses only the
+changed file and re-runs only the checks that depend on it. Instead of the full check output
+it prints which results changed since the previous run.
+
+The checks are the scripts' own: check_results() of simple_va_test.py
+and check_va_files.py, and the HTMLStructureTest tests of
+test_html_structure.py. The HTMLServerTest tests need a running server
+and are not re-run here, and check_va_files' JS file listing is printed
+by the script only. css/ and js/ are watched with their subdirectories,
+including ones created while watching.
+
+Usage:
+    python watch_checks.py               # inotify if available, else polling
+    python watch_checks.py --poll 0.5    # force polling every 0.5s
+    python watch_checks.py --once        # run every check once and exit
+"""
+import io
+import sys
+import time
+import argparse
+import importlib
+import unittest
+import contextlib
+
+from file_watch import InotifyWatcher, PollingWatcher
+from site_index import get_index
+
+WATCHED_DIRS = ["", "css", "js"]
+RECURSIVE_DIRS = ["css", "js"]  # also watch their subdirectories
+WATCHED_EXTENSIONS = (".html", ".css", ".js", ".py")
+
+
+def simple_va_results(index):
+    import simple_va_test as module
+    return [(label, passed) for _, label, passed in module.check_results(index)]
+
+
+def check_va_files_results(index):
+    import check_va_files as module
+    return module.check_results(index)
+
+
+def html_structure_results(index):
+    """Run the file-based HTMLStructureTest tests; a test passes unless it fails or errors"""
+    import test_html_structure as module
+    suite = unittest.defaultTestLoader.loadTestsFromTestCase(module.HTMLStructureTest)
+    test_ids = [test.id() for test in suite]  # the suite drops its tests as they run
+    result = unittest.TestResult()
+    with contextlib.redirect_stdout(io.StringIO()):
+        suite.run(result)
+    failed = {test.id() for test, _ in result.failures + result.errors}
+    return [(test_id.rsplit(".", 1)[-1], test_id not in failed) for test_id in test_ids]
+
+
+# name: (files the check reads, function returning [(label, ok)])
+CHECKS = {
+    "simple_va_test": (
+        ["simple_va_test.py", "virtual-assistant.html", "css/virtual-assistant.css",
+         "js/chat-handler.js", "js/virtual-assistant.js"],
+        simple_va_results,
+    ),
+    "check_va_files": (
+        ["check_va_files.py", "virtual-assistant.html", "css/virtual-assistant.css", "js/"],
+        check_va_files_results,
+    ),
+    "test_html_structure": (
+        ["test_html_structure.py", "simple_va_test.py", "virtual-assistant.html", "css/virtual-assistant.css",
+         "js/chat-handler.js", "js/virtual-assistant.js"],
+        html_structure_results,
+    ),
+}
+
+
+def affected_checks(changed):
+    """Return the names of the checks that read any of the changed files"""
+    names = []
+    for name, (files, _) in CHECKS.items():
+        for path in changed:
+            if path in files or any(f.endswith("/") and path.startswith(f) for f in files):
+                names.append(name)
+                break
+    return names
+
+
+def make_watcher(poll_interval=None):
+    if poll_interval is None:
+        try:
+            return InotifyWatcher(WATCHED_DIRS, WATCHED_EXTENSIONS, RECURSIVE_DIRS)
+        except OSError as e:
+            print(f"⚠ inotify unavailable ({e}), falling back to polling")
+            poll_interval = 1.0
+    return PollingWatcher(WATCHED_DIRS, poll_interval, WATCHED_EXTENSIONS, RECURSIVE_DIRS)
+
+
+_unavailable = set()
+
+
+def run_checks(index, names):
+    """Run the named checks; return {name: {label: ok}}"""
+    results = {}
+    for name in names:
+        if name in _unavailable:
+            continue
+        _, func = CHECKS[name]
+        try:
+            results[name] = dict(func(index))
+        except ImportError as e:
+            _unavailable.add(name)
+            print(f"⚠ Skipping {name}: {e}")
+    return results
+
+
+def print_diff(previous, current):
+    """Print only the results that appeared, disappeared or flipped"""
+    lines = []
+    for name, results in current.items():
+        before = previous.get(name, {})
+        for label, ok in results.items():
+            if label not in before:
+                lines.append(f"  + {'✓' if ok else '✗'} {label} ({name})")
+            elif before[label] != ok:
+                lines.append(f"  {'✗ → ✓' if ok else '✓ → ✗'} {label} ({name})")
+        for label in before.keys() - results.keys():
+            lines.append(f"  - {label} ({name})")
+    if lines:
+        print("\n".join(lines))
+    else:
+        print("  no result changes")
+
+
+def print_totals(results):
+    total = sum(len(r) for r in results.values())
+    failed = sum(1 for r in results.values() for ok in r.values() if not ok)
+    status = "✅" if failed == 0 else "❌"
+    print(f"{status} {total - failed}/{total} checks passing")
+
+
+def reload_check_modules(changed):
+    for path in changed:
+        module_name = path[:-3]
+        if path.endswith(".py") and module_name in sys.modules:
+            importlib.reload(sys.modules[module_name])
+
+
+def watch(poll_interval=None, once=False):
+    start = time.perf_counter()
+    index = get_index()
+    results = run_checks(index, list(CHECKS))
+    print(f"Initial run of {len(results)} checks in {(time.perf_counter() - start) * 1000:.1f}ms")
+    for name, checks in results.items():
+        for label, ok in checks.items():
+            if not ok:
+                print(f"  ✗ {label} ({name})")
+    print_totals(results)
+    if once:
+        return 0 if all(all(r.values()) for r in results.values()) else 1
+
+    watcher = make_watcher(poll_interval)
+    print(f"Watching {', '.join((d or '.') + ('/**' if d in RECURSIVE_DIRS else '') for d in WATCHED_DIRS)} with {type(watcher).__name__}, Ctrl+C to stop")
+    try:
+        while True:
+            changed = watcher.wait()
+            names = [name for name in affected_checks(changed) if name not in _unavailable]
+            if not names:
+                continue
+
+            start = time.perf_counter()
+            index.refresh(changed)
+            reload_check_modules(changed)
+            current = run_checks(index, names)
+            elapsed = (time.perf_counter() - start) * 1000
+
+            print(f"\n[{time.strftime('%H:%M:%S')}] {', '.join(sorted(changed))} → "
+                  f"{', '.join(names)} ({elapsed:.1f}ms)")
+            print_diff(results, current)
+            results.update(current)
+            print_totals(results)
+    except KeyboardInterrupt:
+        print("\nStopped watching")
+    finally:
+        watcher.close()
+        index.save()
+    return 0
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Re-run the static site checks when files change")
+    parser.add_argument("--poll", type=float, metavar="SECONDS",
+                        help="poll for changes on this interval instead of using inotify")
+    parser.add_argument("--once", action="store_true",
+                        help="run every check once and exit")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    sys.exit(watch(args.poll, args.once))